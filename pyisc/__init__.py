@@ -17,12 +17,14 @@
 The library is divided into submodules where each submodule is
 responsible for the parsing and editing of that specific type of file.
 So for ISC DHCPds configuration file the submodule dhcpd is used and
-for Bind9s named.conf file the bind subpackage is used.
+for Bind9s named.conf file the bind subpackage is used. The lease
+database of ISC dhcpd is read with the leases subpackage.
 
 """
 
-__all__ = ['dhcpd']
+__all__ = ['dhcpd', 'leases']
 __version__ = '0.3.1'
 __author__ = 'Jonas Hallqvist'
 
 from pyisc import dhcpd
+from pyisc import leases
@@ -84,24 +84,69 @@ Example:
 
 
 Attributes:
+    dump (object_tree, file object): Writes a PyISC DHCPd object tree to a
+        text stream without building the whole string in memory.
     dumps (object_tree): Returns a string created from a PyISC DHCPd object
         tree.
-    loads (str): Returns a PyISC DHCPd object tree from a supplied string.
+    load (file object or path, cache_dir): Returns a PyISC DHCPd object tree
+        from a supplied text stream, read in chunks, or from the path of a
+        UTF-8 encoded file, read through mmap. With a cache_dir the tree of
+        a file is kept in a ParseCache and loaded from there while the file
+        is unchanged.
+    loads (str, lazy, include_types, exclude_types): Returns a PyISC DHCPd
+        object tree from a supplied string. With lazy the blocks of top
+        level declarations are parsed when they are first used. The node
+        classes in include_types or exclude_types select the declarations
+        that are built.
+    dump_binary (object_tree, file object): Writes a PyISC DHCPd object
+        tree to a binary stream in a compact versioned format.
+    load_binary (file object): Returns a PyISC DHCPd object tree from a
+        binary stream written by dump_binary.
+    diff (Global, Global): Returns the added, removed and modified nodes
+        between two object trees.
 
 """
 
-__all__ = ['dumps', 'loads', 'DhcpdParser']
+__all__ = ['diff', 'dump', 'dump_binary', 'dumps', 'load', 'load_binary',
+           'loads', 'Change', 'DhcpdParser', 'ParseCache']
 __version__ = '0.6.0'
 __author__ = 'Jonas Hallqvist'
 
+import os
 from pyisc.dhcpd.parsing import DhcpdParser
 from pyisc.dhcpd.nodes import *
+from pyisc.dhcpd.diff import diff, Change
+from pyisc.dhcpd.cache import ParseCache
+from pyisc.dhcpd.binary import decode_tree, encode_tree
 
 
-def loads(content):
+def load(fp, cache_dir=None):
+    if not isinstance(fp, (str, os.PathLike)):
+        # Streams have no path to fingerprint and are always parsed.
+        return DhcpdParser().construct_tree_from_stream(fp)
+    if cache_dir is not None:
+        return ParseCache(cache_dir).load(fp)
+    return DhcpdParser().construct_tree_from_file(fp)
+
+
+def loads(content, lazy=False, include_types=None, exclude_types=None):
     parser = DhcpdParser()
-    return parser.construct_tree(content)
+    return parser.construct_tree(content, lazy=lazy,
+                                 include_types=include_types,
+                                 exclude_types=exclude_types)
+
+
+def dump(object_tree, fp):
+    object_tree.write_isc(fp)
 
 
 def dumps(object_tree):
     return object_tree.to_isc()
+
+
+def dump_binary(object_tree, fp):
+    fp.write(encode_tree(object_tree))
+
+
+def load_binary(fp):
+    return decode_tree(fp.read())
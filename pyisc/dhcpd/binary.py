@@ -0,0 +1,645 @@
+# Copyright 2021 Jonas Hallqvist
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import sys
+from array import array
+from collections import deque
+from itertools import accumulate, repeat
+from socket import AF_INET6, inet_aton, inet_ntoa, inet_ntop, inet_pton
+from struct import Struct
+from types import MemberDescriptorType
+from typing import Dict, List, Tuple
+from pyisc.dhcpd import nodes
+from pyisc.dhcpd.mixin import (SparseAttribute, StatementMixin,
+                               TRANSIENT_ATTRIBUTES, link_children, paused_gc,
+                               slot_names)
+
+# Starts every encoded tree, followed by the format version as a little
+# endian 16 bit integer.
+MAGIC = b'pyisc.dhcpd\0'
+FORMAT_VERSION = 2
+HEADER_SIZE = len(MAGIC) + 2
+
+# How the values of an attribute column are stored.
+STRING = 0  # uint32 indexes into the string table
+IPV4 = 1  # 4 byte addresses in network byte order
+IPV6 = 2  # 16 byte addresses in network byte order
+INTEGER = 3  # int64 values
+TRUE = 4  # no column, every value is True
+FALSE = 5  # no column, every value is False
+NODE = 6  # uint32 node numbers
+NODES = 7  # uint32 list lengths followed by the node numbers of all lists
+EMPTY = 8  # no column, every value is a new empty list
+VALUE = 9  # uint32 byte length followed by tagged plain values
+COLUMN_KINDS = range(10)
+
+# The tag in front of every plain value of a VALUE column.
+VALUE_NONE = 0  # no data
+VALUE_FALSE = 1  # no data
+VALUE_TRUE = 2  # no data
+VALUE_INTEGER = 3  # uint8 byte length and a little endian signed integer
+VALUE_STRING = 4  # uint32 index into the string table
+VALUE_LIST = 5  # uint32 item count followed by the items
+VALUE_TUPLE = 6  # uint32 item count followed by the items
+# Plain values nest no deeper than this, deeper data is rejected.
+MAX_VALUE_DEPTH = 16
+
+INT64_MIN = -1 << 63
+INT64_MAX = (1 << 63) - 1
+UINT32 = Struct('<I')
+COLUMN_HEADER = Struct('<IBB')
+
+# Maps every class name in an encoded tree to its node class.
+NODE_CLASSES = {name: value for name, value in vars(nodes).items()
+                if isinstance(value, type) and
+                issubclass(value, StatementMixin)}
+
+
+def uint32_bytes(numbers: List[int]) -> bytes:
+    """Returns integers as little endian unsigned 32 bit integers."""
+    packed = array('I', numbers)
+    if sys.byteorder == 'big':
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def int64_bytes(numbers: List[int]) -> bytes:
+    """Returns integers as little endian signed 64 bit integers."""
+    packed = array('q', numbers)
+    if sys.byteorder == 'big':
+        packed.byteswap()
+    return packed.tobytes()
+
+
+class TreeReader:
+    """Reads the fields of an encoded tree and checks that they fit.
+
+    Every read that would run past the end of the data raises ValueError,
+    so truncated or corrupt data never reaches the node classes.
+    """
+
+    def __init__(self, data: bytes) -> None:
+        self.data = memoryview(data)
+        self.offset = 0
+
+    def take(self, size: int) -> memoryview:
+        """Returns the next size bytes."""
+        end = self.offset + size
+        if end > len(self.data):
+            raise ValueError('Truncated encoded tree')
+        chunk = self.data[self.offset:end]
+        self.offset = end
+        return chunk
+
+    def uint8(self) -> int:
+        """Returns the next unsigned 8 bit integer."""
+        return self.take(1)[0]
+
+    def uint32(self) -> int:
+        """Returns the next little endian unsigned 32 bit integer."""
+        return UINT32.unpack(self.take(4))[0]
+
+    def uint32s(self, count: int) -> array:
+        """Returns the next count little endian unsigned 32 bit integers."""
+        return self.array('I', count)
+
+    def int64s(self, count: int) -> array:
+        """Returns the next count little endian signed 64 bit integers."""
+        return self.array('q', count)
+
+    def array(self, typecode: str, count: int) -> array:
+        """Returns the next count integers of an array typecode."""
+        packed = array(typecode)
+        packed.frombytes(self.take(count * packed.itemsize))
+        if sys.byteorder == 'big':
+            packed.byteswap()
+        return packed
+
+    def finish(self) -> None:
+        """Checks that every byte of the data was read."""
+        if self.offset != len(self.data):
+            raise ValueError('Trailing data after the encoded tree')
+
+
+def checked_indexes(indexes: array, limit: int, what: str) -> array:
+    """Returns indexes after checking that each one is below limit."""
+    if indexes and max(indexes) >= limit:
+        raise ValueError(f'{what} index out of range')
+    return indexes
+
+
+def value_kind(value) -> int:
+    """Returns the column kind for a value that is not None."""
+    if isinstance(value, str):
+        if value[:1].isdigit() and value.count('.') == 3:
+            try:
+                if inet_ntoa(inet_aton(value)) == value:
+                    return IPV4
+            except OSError:
+                pass
+        elif ':' in value:
+            try:
+                if inet_ntop(AF_INET6, inet_pton(AF_INET6, value)) == value:
+                    return IPV6
+            except (OSError, ValueError):
+                pass
+        return STRING
+    if value is True:
+        return TRUE
+    if value is False:
+        return FALSE
+    if isinstance(value, StatementMixin):
+        return NODE
+    if isinstance(value, int):
+        return INTEGER if INT64_MIN <= value <= INT64_MAX else VALUE
+    if isinstance(value, list):
+        if not value:
+            return EMPTY
+        if all(isinstance(item, StatementMixin) for item in value):
+            return NODES
+    return VALUE
+
+
+class TreeEncoder:
+    """Collects the nodes of a tree into columns grouped by shape.
+
+    The shape of a node is its class together with the names of its
+    attributes in order and the kinds of those that are set. Nodes of the
+    same shape are stored as rows of one table, each set attribute as a
+    column. Set parameters are stored as attributes of their own.
+    """
+
+    def __init__(self) -> None:
+        self.strings = {}
+        self.shapes = {}
+        self.numbers = {}
+
+    def string(self, value: str) -> int:
+        """Returns the index of a string in the string table."""
+        index = self.strings.get(value)
+        if index is None:
+            index = self.strings[value] = len(self.strings)
+        return index
+
+    def add(self, node: StatementMixin) -> None:
+        """Adds a node and the nodes it holds to the tables."""
+        if id(node) in self.numbers:
+            raise ValueError(f'{node!r} is held by more than one node')
+        attributes = getattr(node, '__dict__', {})
+        # Read after the attributes, which parse a lazily parsed block.
+        node_class = type(node)
+        names, _ = slot_names(node_class)
+        items = [(name, value) for name, value in attributes.items()
+                 if name not in TRANSIENT_ATTRIBUTES]
+        items.extend((name, getattr(node, name, None)) for name in names)
+        layout = []
+        values = []
+        children = []
+        for name, value in items:
+            if value is None:
+                continue
+            if name == '_parameters' and isinstance(value, dict) and value:
+                for key, parameter in value.items():
+                    layout.append((key, value_kind(parameter), True))
+                    values.append(parameter)
+                continue
+            kind = value_kind(value)
+            if kind == NODE:
+                children.append(value)
+            elif kind == NODES:
+                children.extend(value)
+            layout.append((name, kind, False))
+            values.append(value)
+        shape = (node_class, tuple([name for name, _ in items]),
+                 tuple(layout))
+        rows = self.shapes.get(shape)
+        if rows is None:
+            rows = self.shapes[shape] = []
+        self.numbers[id(node)] = (shape, len(rows))
+        rows.append(values)
+        for child in children:
+            self.add(child)
+
+    def column(self, kind: int, values: List, first: Dict) -> bytes:
+        """Returns the stored column of the values of one attribute."""
+        if kind == STRING:
+            return uint32_bytes([self.string(value) for value in values])
+        if kind == IPV4:
+            return b''.join(map(inet_aton, values))
+        if kind == IPV6:
+            return b''.join(inet_pton(AF_INET6, value) for value in values)
+        if kind == INTEGER:
+            return int64_bytes(values)
+        if kind == NODE:
+            return uint32_bytes([self.number(value, first)
+                                 for value in values])
+        if kind == NODES:
+            return (uint32_bytes([len(value) for value in values]) +
+                    uint32_bytes([self.number(item, first)
+                                  for value in values for item in value]))
+        if kind in (TRUE, FALSE, EMPTY):
+            return b''
+        packed = bytearray()
+        for value in values:
+            self.plain_value(value, packed, 0)
+        return UINT32.pack(len(packed)) + packed
+
+    def plain_value(self, value, packed: bytearray, depth: int) -> None:
+        """Appends the tag and data of a plain value to packed.
+
+        Raises:
+            ValueError: If the value can not be stored in the format.
+
+        """
+        if depth > MAX_VALUE_DEPTH:
+            raise ValueError('Value is nested too deeply to encode')
+        if value is None:
+            packed.append(VALUE_NONE)
+        elif value is False:
+            packed.append(VALUE_FALSE)
+        elif value is True:
+            packed.append(VALUE_TRUE)
+        elif isinstance(value, int):
+            size = value.bit_length() // 8 + 1
+            if size > 255:
+                raise ValueError('Integer is too large to encode')
+            packed.append(VALUE_INTEGER)
+            packed.append(size)
+            packed += value.to_bytes(size, 'little', signed=True)
+        elif isinstance(value, str):
+            packed.append(VALUE_STRING)
+            packed += UINT32.pack(self.string(value))
+        elif isinstance(value, (list, tuple)):
+            packed.append(VALUE_LIST if isinstance(value, list)
+                          else VALUE_TUPLE)
+            packed += UINT32.pack(len(value))
+            for item in value:
+                self.plain_value(item, packed, depth + 1)
+        else:
+            raise ValueError(
+                f'Can not encode a value of type {type(value).__name__}')
+
+    def number(self, node: StatementMixin, first: Dict) -> int:
+        """Returns the position of a node among all nodes of the tree."""
+        shape, row = self.numbers[id(node)]
+        return first[shape] + row
+
+    def encode(self, tree: StatementMixin) -> bytes:
+        """Returns the encoded tree."""
+        self.add(tree)
+        first = {}
+        count = 0
+        for shape, rows in self.shapes.items():
+            first[shape] = count
+            count += len(rows)
+        body = [UINT32.pack(len(self.shapes))]
+        for (node_class, names, layout), rows in self.shapes.items():
+            body.append(UINT32.pack(self.string(node_class.__name__)))
+            body.append(UINT32.pack(len(rows)))
+            body.append(UINT32.pack(len(names)))
+            body.append(uint32_bytes(list(map(self.string, names))))
+            body.append(UINT32.pack(len(layout)))
+            for (name, kind, parameter), values in zip(layout, zip(*rows)):
+                body.append(COLUMN_HEADER.pack(self.string(name), kind,
+                                               parameter))
+                body.append(self.column(kind, values, first))
+        body.append(UINT32.pack(self.number(tree, first)))
+        strings = [value.encode('utf-8', 'surrogatepass')
+                   for value in self.strings]
+        return b''.join([MAGIC, FORMAT_VERSION.to_bytes(2, 'little'),
+                         UINT32.pack(len(strings)),
+                         uint32_bytes(list(map(len, strings))), *strings,
+                         *body])
+
+
+def encode_tree(tree: StatementMixin) -> bytes:
+    """Return a tree in the compact binary format.
+
+    All integers are little endian. The format starts with MAGIC and the
+    uint16 FORMAT_VERSION, followed by the string table: a uint32 count,
+    the uint32 byte length of every string and then the UTF-8 bytes of the
+    strings. The table holds every class name, attribute name and string
+    value once.
+
+    A uint32 count of node shapes follows. Every shape has the uint32
+    string index of its class name, its uint32 node count, a uint32 count
+    and the uint32 string indexes of its attribute names, and a uint32
+    count of columns. A column is the uint32 string index of its attribute
+    name, the uint8 column kind, a uint8 flag for set parameters and the
+    values of every node of the shape as described at the column kinds.
+    The format ends with the uint32 number of the encoded node, nodes being
+    numbered in shape order.
+
+    Only attributes that are set are stored, IP addresses are packed and
+    references to nodes are numbers. Parent links, cached text and indexes
+    are not stored, they are rebuilt when first used.
+
+    Args:
+        tree (pyisc.dhcpd.nodes.Global): The tree, or any node of a tree.
+
+    Examples:
+        >>> tree = loads('subnet 10.0.0.0 netmask 255.255.255.0 {\\n}\\n')
+        >>> copy = decode_tree(encode_tree(tree))
+        >>> copy.subnets
+        [Subnet4(network="10.0.0.0/24")]
+
+    Returns:
+        bytes: The encoded tree.
+
+    Raises:
+        ValueError: If a node is held by more than one node or an attribute
+            has a value the format can not store.
+
+    """
+    with paused_gc():
+        return TreeEncoder().encode(tree)
+
+
+def class_descriptors(node_class: type) -> Tuple[Dict[str, object], object]:
+    """Returns the slot descriptors and the __dict__ descriptor of a class.
+
+    Setting attributes through the descriptors bypasses __setattr__, so
+    decoding neither marks nodes dirty nor touches host indexes.
+    """
+    slots = {}
+    instance_dict = None
+    for base in reversed(node_class.__mro__):
+        for name, attribute in vars(base).items():
+            if name == '__dict__':
+                instance_dict = attribute
+            elif isinstance(attribute, MemberDescriptorType):
+                slots[name] = attribute
+    return slots, instance_dict
+
+
+def read_strings(reader: TreeReader) -> List[str]:
+    """Returns the string table of an encoded tree.
+
+    A table of ASCII strings, the usual case, is decoded in one piece and
+    sliced, as its byte offsets are also its character offsets.
+    """
+    lengths = reader.uint32s(reader.uint32())
+    data = bytes(reader.take(sum(lengths)))
+    if data.isascii():
+        data = data.decode('ascii')
+        return [data[end - length:end]
+                for end, length in zip(accumulate(lengths), lengths)]
+    return [data[end - length:end].decode('utf-8', 'surrogatepass')
+            for end, length in zip(accumulate(lengths), lengths)]
+
+
+def read_column(reader: TreeReader, kind: int, count: int,
+                strings: List[str]) -> object:
+    """Returns the stored values of a column of count nodes.
+
+    String indexes are checked here, node numbers once every node of the
+    tree is known.
+    """
+    if kind == STRING:
+        return checked_indexes(reader.uint32s(count), len(strings), 'String')
+    if kind == IPV4:
+        return reader.take(4 * count)
+    if kind == IPV6:
+        return reader.take(16 * count)
+    if kind == INTEGER:
+        return reader.int64s(count)
+    if kind == NODE:
+        return reader.uint32s(count)
+    if kind == NODES:
+        lengths = reader.uint32s(count)
+        return lengths, reader.uint32s(sum(lengths))
+    if kind in (TRUE, FALSE, EMPTY):
+        return None
+    values = TreeReader(reader.take(reader.uint32()))
+    column = [read_value(values, strings, 0) for _ in range(count)]
+    values.finish()
+    return column
+
+
+def read_value(reader: TreeReader, strings: List[str], depth: int):
+    """Returns the next tagged plain value of a VALUE column."""
+    if depth > MAX_VALUE_DEPTH:
+        raise ValueError('Value is nested too deeply')
+    tag = reader.uint8()
+    if tag == VALUE_NONE:
+        return None
+    if tag == VALUE_FALSE:
+        return False
+    if tag == VALUE_TRUE:
+        return True
+    if tag == VALUE_INTEGER:
+        return int.from_bytes(reader.take(reader.uint8()), 'little',
+                              signed=True)
+    if tag == VALUE_STRING:
+        index = reader.uint32()
+        if index >= len(strings):
+            raise ValueError('String index out of range')
+        return strings[index]
+    if tag in (VALUE_LIST, VALUE_TUPLE):
+        items = [read_value(reader, strings, depth + 1)
+                 for _ in range(reader.uint32())]
+        return items if tag == VALUE_LIST else tuple(items)
+    raise ValueError(f'Unknown value tag {tag}')
+
+
+def check_attributes(node_class: type, names: List[str],
+                     columns: List[tuple]) -> None:
+    """Checks the attribute names of a shape against its node class.
+
+    A class with slots needs a name for every slot, and every parameter has
+    to be one the class catalogues.
+    """
+    node_names, _ = slot_names(node_class)
+    missing = set(node_names).difference(names)
+    if missing:
+        raise ValueError(
+            f'{node_class.__name__} is missing attribute {min(missing)}')
+    for name, _, parameter, _ in columns:
+        if parameter and not isinstance(getattr(node_class, name, None),
+                                        SparseAttribute):
+            raise ValueError(
+                f'{node_class.__name__} has no parameter {name}')
+        if not parameter and name not in names:
+            raise ValueError(
+                f'{node_class.__name__} column {name} has no attribute')
+
+
+def node_references(tables: List[tuple]) -> array:
+    """Returns the node numbers held by the node columns of all tables."""
+    references = array('I')
+    for *_, columns in tables:
+        for _, kind, _, column in columns:
+            if kind == NODE:
+                references.extend(column)
+            elif kind == NODES:
+                references.extend(column[1])
+    return references
+
+
+def decode_column(kind: int, column, count: int, strings: List[str],
+                  all_nodes: List[StatementMixin]):
+    """Returns the values of a column, one for each row."""
+    if kind == STRING:
+        return map(strings.__getitem__, column)
+    if kind == IPV4:
+        return [inet_ntoa(column[i:i + 4]) for i in range(0, len(column), 4)]
+    if kind == IPV6:
+        return [inet_ntop(AF_INET6, column[i:i + 16])
+                for i in range(0, len(column), 16)]
+    if kind == TRUE:
+        return repeat(True, count)
+    if kind == FALSE:
+        return repeat(False, count)
+    if kind == NODE:
+        return map(all_nodes.__getitem__, column)
+    if kind == NODES:
+        lengths, numbers = column
+        items = list(map(all_nodes.__getitem__, numbers))
+        return [items[end - length:end]
+                for end, length in zip(accumulate(lengths), lengths)]
+    if kind == EMPTY:
+        return [[] for _ in range(count)]
+    return column
+
+
+def decode_tree(data: bytes) -> StatementMixin:
+    """Return the tree encoded by encode_tree.
+
+    Every count, length, string index and node number is checked against
+    the data before it is used, and the node references have to form a
+    tree below the encoded node. Only node classes of pyisc.dhcpd.nodes and
+    plain values are created. Slot and parameter names are checked against
+    the node classes, other attribute names are set as they are stored.
+
+    Args:
+        data (bytes): The encoded tree.
+
+    Returns:
+        Global: The tree, or whichever node was encoded.
+
+    Raises:
+        ValueError: If data is not a well formed encoded tree of this
+            format version.
+
+    """
+    if data[:len(MAGIC)] != MAGIC:
+        raise ValueError('Not an encoded dhcpd tree')
+    version = int.from_bytes(data[len(MAGIC):HEADER_SIZE], 'little')
+    if version != FORMAT_VERSION:
+        raise ValueError(f'Unsupported format version {version}')
+    reader = TreeReader(data)
+    reader.take(HEADER_SIZE)
+    # Every node but the encoded one is referenced by a uint32 number.
+    node_limit = len(data) // 4 + 1
+    with paused_gc():
+        strings = read_strings(reader)
+        tables = []
+        all_nodes = []
+        for _ in range(reader.uint32()):
+            class_name = reader.uint32()
+            if class_name >= len(strings):
+                raise ValueError('String index out of range')
+            node_class = NODE_CLASSES.get(strings[class_name])
+            if node_class is None:
+                raise ValueError(f'Unknown node class {strings[class_name]}')
+            count = reader.uint32()
+            if len(all_nodes) + count > node_limit:
+                raise ValueError('More nodes than the encoded tree can hold')
+            names = checked_indexes(reader.uint32s(reader.uint32()),
+                                    len(strings), 'String')
+            columns = []
+            for _ in range(reader.uint32()):
+                name, kind, parameter = COLUMN_HEADER.unpack(
+                    reader.take(COLUMN_HEADER.size))
+                if name >= len(strings):
+                    raise ValueError('String index out of range')
+                if kind not in COLUMN_KINDS or parameter > 1:
+                    raise ValueError(f'Unknown column kind {kind}')
+                columns.append((strings[name], kind, parameter,
+                                read_column(reader, kind, count, strings)))
+            names = list(map(strings.__getitem__, names))
+            check_attributes(node_class, names, columns)
+            shape_nodes = list(map(node_class.__new__,
+                                   repeat(node_class, count)))
+            all_nodes.extend(shape_nodes)
+            tables.append((node_class, shape_nodes, names, columns))
+        root = reader.uint32()
+        reader.finish()
+        references = node_references(tables)
+        checked_indexes(references, len(all_nodes), 'Node')
+        if root >= len(all_nodes):
+            raise ValueError('Node index out of range')
+        referenced = set(references)
+        if root in referenced or len(referenced) != len(references):
+            raise ValueError('Node references do not form a tree')
+        links = []
+        for node_class, shape_nodes, names, columns in tables:
+            fill_nodes(node_class, shape_nodes, names, columns, strings,
+                       all_nodes, links)
+        for shape_nodes, children in links:
+            for node, child in zip(shape_nodes, children):
+                link_children(node, (child,))
+    return all_nodes[root]
+
+
+def fill_nodes(node_class: type, shape_nodes: List[StatementMixin],
+               names: List[str], columns: List[tuple], strings: List[str],
+               all_nodes: List[StatementMixin], links: List[tuple]) -> None:
+    """Sets the attributes of the nodes of one shape from their columns.
+
+    Attributes without a column are None. Instance dictionaries are built
+    in the order of names, which is the order the attributes are written.
+    The node columns are added to links together with the nodes, so the
+    parent links are set once all nodes are filled.
+    """
+    count = len(shape_nodes)
+    slots, instance_dict = class_descriptors(node_class)
+    _, transient_names = slot_names(node_class)
+    values = {}
+    parameter_names = []
+    parameter_values = []
+    for name, kind, parameter, column in columns:
+        column = decode_column(kind, column, count, strings, all_nodes)
+        if kind in (NODE, NODES):
+            column = list(column)
+            links.append((shape_nodes, column))
+        if parameter:
+            parameter_names.append(name)
+            parameter_values.append(column)
+        else:
+            values[name] = column
+    if parameter_names:
+        values['_parameters'] = [dict(zip(parameter_names, row))
+                                 for row in zip(*parameter_values)]
+    dict_names = []
+    dict_values = []
+    for name in [*names, *transient_names]:
+        column = values.get(name)
+        if column is None:
+            column = repeat(None, count)
+        descriptor = slots.get(name)
+        if descriptor is None:
+            dict_names.append(name)
+            dict_values.append(column)
+        else:
+            deque(map(descriptor.__set__, shape_nodes, column), maxlen=0)
+    if instance_dict is not None:
+        if dict_names:
+            dicts = [dict(zip(dict_names, row)) for row in zip(*dict_values)]
+        else:
+            dicts = [{} for _ in range(count)]
+        deque(map(instance_dict.__set__, shape_nodes, dicts), maxlen=0)
+    elif dict_names:
+        raise ValueError(
+            f'{node_class.__name__} has no attribute {dict_names[0]}')
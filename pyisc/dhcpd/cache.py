@@ -0,0 +1,220 @@
+# Copyright 2021 Jonas Hallqvist
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import tempfile
+import time
+from hashlib import blake2b
+from typing import Tuple, Union
+from pyisc.dhcpd.binary import decode_tree, encode_tree
+from pyisc.dhcpd.nodes import Global
+from pyisc.dhcpd.parsing import DhcpdParser
+
+# Part of every entry name, bumped when the layout of the nodes changes so
+# entries written by older versions are never read.
+CACHE_FORMAT = 2
+# The default limit of the total size of the entries of a cache directory.
+MAX_SIZE = 512 * 1024 * 1024
+# Fingerprints of files modified less than this many seconds ago are not
+# stored, a second write within the resolution of the file system clock
+# could otherwise keep the same fingerprint.
+SETTLE_TIME = 2.0
+ENTRY_SUFFIX = f'.tree{CACHE_FORMAT}'
+FINGERPRINT_SUFFIX = '.stat'
+
+
+def content_digest(content: bytes) -> str:
+    """Returns the hex digest that names the cache entry of content."""
+    return blake2b(content, digest_size=20).hexdigest()
+
+
+def stat_fingerprint(status: os.stat_result) -> Tuple[int, int, int]:
+    """Returns the modification time, size and inode of a file."""
+    return status.st_mtime_ns, status.st_size, status.st_ino
+
+
+class ParseCache:
+    """A directory of parsed trees keyed by the hash of their source.
+
+    Every entry is a Global in the binary format of encode_tree, named by
+    the hash of the configuration it was parsed from. Entries are read with
+    decode_tree, so the directory must not be writable by untrusted users.
+    Next to the entries the cache keeps a fingerprint per source path,
+    holding the modification time, size and inode of the file together
+    with the hash of its content, so a file that has not changed since it
+    was last loaded is neither read nor hashed. When the fingerprint does
+    not match the file is read and hashed, which still finds the entry if
+    only the metadata changed.
+
+    Several processes may share a directory. Entries and fingerprints are
+    written to temporary files and renamed into place, so readers see
+    either a complete file or none. Entries that fail to load are treated
+    as misses. Loading an entry updates its modification time, and the
+    least recently used entries are removed, together with the
+    fingerprints that refer to them, once the total size of the entries
+    exceeds max_size.
+    """
+
+    def __init__(self, directory: Union[str, os.PathLike],
+                 max_size: int = MAX_SIZE) -> None:
+        """Initialize the cache and create its directory.
+
+        Args:
+            directory (str): The cache directory.
+            max_size (int): The limit of the total size of the entries in
+                bytes.
+
+        """
+        self.directory = os.fspath(directory)
+        self.max_size = max_size
+        os.makedirs(self.directory, exist_ok=True)
+
+    def entry_path(self, digest: str) -> str:
+        """Returns the path of the entry of a content digest."""
+        return os.path.join(self.directory, digest + ENTRY_SUFFIX)
+
+    def fingerprint_path(self, path: str) -> str:
+        """Returns the path of the fingerprint of a source file."""
+        source = os.path.abspath(path).encode('utf-8', 'surrogateescape')
+        name = blake2b(source, digest_size=20).hexdigest()
+        return os.path.join(self.directory, name + FINGERPRINT_SUFFIX)
+
+    def load(self, path: Union[str, os.PathLike]) -> Global:
+        """Return the object tree of a configuration file.
+
+        Args:
+            path (str): The path of the dhcpd configuration file.
+
+        Examples:
+            >>> cache = ParseCache('/var/cache/pyisc')
+            >>> object_tree = cache.load('etc/dhcpd.conf')
+
+        Returns:
+            Global: The cached tree or, on a miss, the newly parsed tree.
+
+        """
+        path = os.fspath(path)
+        fingerprint_path = self.fingerprint_path(path)
+        fingerprint = stat_fingerprint(os.stat(path))
+        digest = self.read_fingerprint(fingerprint_path, fingerprint)
+        if digest is not None:
+            tree = self.read_entry(digest)
+            if tree is not None:
+                return tree
+        with open(path, 'rb') as infile:
+            fingerprint = stat_fingerprint(os.fstat(infile.fileno()))
+            content = infile.read()
+        digest = content_digest(content)
+        tree = self.read_entry(digest)
+        if tree is None:
+            parser = DhcpdParser()
+            tree = parser.construct_tree_from_bytes(content)
+            self.write_entry(digest, tree)
+        if time.time() - fingerprint[0] / 1e9 > SETTLE_TIME:
+            self.write_file(fingerprint_path, ' '.join(
+                map(str, fingerprint + (digest,))).encode('ascii'))
+        return tree
+
+    def read_fingerprint(self, fingerprint_path: str,
+                         fingerprint: Tuple[int, int, int]) -> Union[
+                             str, None]:
+        """Returns the stored digest if the stored fingerprint matches."""
+        try:
+            with open(fingerprint_path, 'rb') as infile:
+                *stored, digest = infile.read().decode('ascii').split()
+            if tuple(map(int, stored)) == fingerprint:
+                return digest
+        except (OSError, ValueError):
+            pass
+        return None
+
+    def read_entry(self, digest: str) -> Union[Global, None]:
+        """Returns the tree of an entry or None if it is missing or broken."""
+        entry_path = self.entry_path(digest)
+        try:
+            with open(entry_path, 'rb') as infile:
+                tree = decode_tree(infile.read())
+        except FileNotFoundError:
+            return None
+        except Exception:
+            self.remove(entry_path)
+            return None
+        try:
+            os.utime(entry_path)
+        except OSError:
+            pass
+        return tree
+
+    def write_entry(self, digest: str, tree: Global) -> None:
+        """Stores a tree and evicts the least recently used entries."""
+        self.write_file(self.entry_path(digest), encode_tree(tree))
+        self.evict()
+
+    def write_file(self, path: str, data: bytes) -> None:
+        """Replaces a file atomically through a temporary file."""
+        handle, temporary_path = tempfile.mkstemp(dir=self.directory,
+                                                  suffix='.tmp')
+        try:
+            with os.fdopen(handle, 'wb') as outfile:
+                outfile.write(data)
+            os.replace(temporary_path, path)
+        except BaseException:
+            self.remove(temporary_path)
+            raise
+
+    def evict(self) -> None:
+        """Removes the oldest entries while the entries exceed max_size.
+
+        Fingerprints that refer to a removed entry are removed with it.
+        """
+        entries = []
+        fingerprint_paths = []
+        with os.scandir(self.directory) as scan:
+            for item in scan:
+                if item.name.endswith(FINGERPRINT_SUFFIX):
+                    fingerprint_paths.append(item.path)
+                if not item.name.endswith(ENTRY_SUFFIX):
+                    continue
+                try:
+                    status = item.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((status.st_mtime_ns, status.st_size,
+                                item.path))
+        total = sum(size for _, size, _ in entries)
+        removed = set()
+        for _, size, entry_path in sorted(entries):
+            if total <= self.max_size:
+                break
+            self.remove(entry_path)
+            removed.add(os.path.basename(entry_path)[:-len(ENTRY_SUFFIX)])
+            total -= size
+        if not removed:
+            return
+        for fingerprint_path in fingerprint_paths:
+            try:
+                with open(fingerprint_path, 'rb') as infile:
+                    digest = infile.read().decode('ascii').split()[-1]
+            except (OSError, ValueError, IndexError):
+                continue
+            if digest in removed:
+                self.remove(fingerprint_path)
+
+    @staticmethod
+    def remove(path: str) -> None:
+        """Removes a file that another process may already have removed."""
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
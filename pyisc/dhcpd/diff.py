@@ -0,0 +1,208 @@
+# Copyright 2021 Jonas Hallqvist
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from functools import lru_cache
+from inspect import signature
+from typing import Dict, Generator, List, NamedTuple, Tuple, Union
+from pyisc.dhcpd.mixin import (DeclarationMixin, StatementMixin,
+                               normalize_mac)
+from pyisc.dhcpd.nodes import (CustomOption, DhcpClass, Event, EventSet,
+                               Failover, Host, Include, Key, Option,
+                               OptionExpression, Prefix6, Range4, Range6,
+                               SharedNetwork, SubClass, Subnet4, Subnet6, Zone)
+
+# The attributes that identify a node among its siblings. Nodes of other
+# types, such as groups and pools, are matched by their position among the
+# siblings of the same type.
+KEY_ATTRIBUTES = {
+    CustomOption: ('name',),
+    DhcpClass: ('name',),
+    Event: ('event_type',),
+    EventSet: ('key',),
+    Failover: ('name',),
+    Host: ('name',),
+    Include: ('filename',),
+    Key: ('name',),
+    Option: ('name', 'number'),
+    OptionExpression: ('name',),
+    Prefix6: ('start',),
+    Range4: ('start',),
+    Range6: ('start',),
+    SharedNetwork: ('name',),
+    SubClass: ('name', 'match_value'),
+    Subnet4: ('network',),
+    Subnet6: ('network',),
+    Zone: ('name',),
+}
+
+
+class Change(NamedTuple):
+    """A node that was added, removed or modified between two trees.
+
+    The path holds the keys of the nodes from the root down to the changed
+    node, each key being the class name followed by the values of its key
+    attributes. For modified nodes attributes maps the name of every changed
+    attribute to its old and new value, child nodes are reported as changes
+    of their own.
+    """
+
+    action: str
+    path: Tuple[tuple, ...]
+    old: object
+    new: object
+    attributes: Union[Dict[str, tuple], None] = None
+
+
+@lru_cache(maxsize=None)
+def init_parameters(node_class: type) -> Tuple[str, ...]:
+    """Returns the names of the arguments of the class initializer."""
+    return tuple(name for name in signature(node_class.__init__).parameters
+                 if name != 'self')
+
+
+def node_attributes(node: StatementMixin) -> Dict[str, object]:
+    """Returns the attributes of a node that are compared by diff."""
+    if isinstance(node, DeclarationMixin):
+        return dict(node.isc_attributes())
+    return {name: getattr(node, name, None)
+            for name in init_parameters(type(node))}
+
+
+def node_keys(nodes: List) -> Generator[Tuple[tuple, object], None, None]:
+    """Yields every node of a list of siblings together with its key."""
+    seen = {}
+    for node in nodes:
+        node_class = type(node)
+        key = (node_class.__name__,) + tuple(
+            getattr(node, name) for name in KEY_ATTRIBUTES.get(node_class, ()))
+        count = seen.get(key, 0)
+        seen[key] = count + 1
+        if count or node_class not in KEY_ATTRIBUTES:
+            key += (count,)
+        yield key, node
+
+
+def host_mac(host: Host) -> Union[str, None]:
+    """Returns the normalized hardware address of a host."""
+    if host.hardware is None or not host.hardware.address:
+        return None
+    return normalize_mac(host.hardware.address)
+
+
+def is_node_list(value) -> bool:
+    """Returns True if value is a list holding nodes."""
+    return isinstance(value, list) and any(
+        isinstance(item, StatementMixin) for item in value)
+
+
+class TreeDiff:
+    """Compares two trees by matching sibling nodes through their keys.
+
+    Each node of both trees is visited at most once. Subtrees with equal
+    digests are skipped without visiting their children.
+    """
+
+    def __init__(self) -> None:
+        self.changes = []
+
+    def compare(self, old, new, path: tuple) -> None:
+        """Adds the changes between two matched nodes and their children."""
+        if old is new or old.digest() == new.digest():
+            return
+        position = len(self.changes)
+        old_attributes = node_attributes(old)
+        new_attributes = node_attributes(new)
+        modified = {}
+        for name in {**old_attributes, **new_attributes}:
+            old_value = old_attributes.get(name)
+            new_value = new_attributes.get(name)
+            if is_node_list(old_value) or is_node_list(new_value):
+                self.compare_children(old_value or [], new_value or [], path)
+            elif old_value != new_value:
+                modified[name] = (old_value, new_value)
+        if modified:
+            self.changes.insert(
+                position, Change('modified', path, old, new, modified))
+
+    def compare_children(self, old_nodes: List, new_nodes: List,
+                         path: tuple) -> None:
+        """Adds the changes between two lists of sibling nodes.
+
+        Hosts that are not matched by name are matched by hardware address,
+        so a renamed host is reported as modified.
+        """
+        old_keys = dict(node_keys(old_nodes))
+        new_keys = dict(node_keys(new_nodes))
+        removed = []
+        for key, node in old_keys.items():
+            if key in new_keys:
+                self.compare(node, new_keys[key], path + (key,))
+            else:
+                removed.append((key, node))
+        added = [(key, node) for key, node in new_keys.items()
+                 if key not in old_keys]
+        renamed = {}
+        for key, node in added:
+            if isinstance(node, Host):
+                renamed.setdefault(host_mac(node), node)
+        matched = set()
+        for key, node in removed:
+            match = None
+            if isinstance(node, Host) and host_mac(node) is not None:
+                match = renamed.pop(host_mac(node), None)
+            if match is None:
+                self.changes.append(Change('removed', path + (key,), node,
+                                           None))
+            else:
+                matched.add(id(match))
+                self.compare(node, match, path + (key,))
+        for key, node in added:
+            if id(node) not in matched:
+                self.changes.append(Change('added', path + (key,), None,
+                                           node))
+
+
+def diff(old_tree, new_tree) -> List[Change]:
+    """Return the structural changes between two trees.
+
+    Sibling nodes are matched by their keys: subnets by network, hosts by
+    name and then hardware address, classes, shared networks, keys and
+    zones by name, options by name or number and ranges by start address.
+    Groups and pools are matched by position.
+
+    Args:
+        old_tree (pyisc.dhcpd.nodes.Global): The running configuration.
+        new_tree (pyisc.dhcpd.nodes.Global): The new configuration.
+
+    Examples:
+        >>> old_tree = loads('subnet 10.0.0.0 netmask 255.255.255.0 {\\n}\\n')
+        >>> new_tree = loads('subnet 10.0.0.0 netmask 255.255.255.0 {\\n'
+        ...                  '    default-lease-time 600;\\n}\\n'
+        ...                  'host foo {\\n}\\n')
+        >>> changes = diff(old_tree, new_tree)
+        >>> for change in changes:
+        ...     print(change.action, change.path[-1])
+        modified ('Subnet4', '10.0.0.0/24')
+        added ('Host', 'foo')
+        >>> changes[0].attributes
+        {'default_lease_time': (None, 600)}
+
+    Returns:
+        list: A Change for every added, removed and modified node in tree
+            order, a modified node before the changes of its children.
+
+    """
+    tree_diff = TreeDiff()
+    tree_diff.compare(old_tree, new_tree, ())
+    return tree_diff.changes
@@ -12,8 +12,17 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from ipaddress import ip_network, IPv6Network
-from typing import List, Union, TYPE_CHECKING
+import gc
+from abc import ABCMeta, abstractmethod
+from bisect import bisect_right
+from contextlib import contextmanager
+from functools import lru_cache
+from hashlib import blake2b
+from io import StringIO
+from ipaddress import ip_address, ip_network
+from socket import AF_INET, AF_INET6, inet_pton
+from typing import (Generator, Iterable, List, NamedTuple, TextIO, Tuple,
+                    Union, TYPE_CHECKING)
 if TYPE_CHECKING:
     from pyisc.dhcpd.nodes import (
         Subnet4, Subnet6, Pool4, Range4, Option, DhcpClass, Event, EventSet,
@@ -23,7 +32,152 @@ if TYPE_CHECKING:
 # All add methods currently expects a object instance.
 
 
+def tree_root(node: object) -> object:
+    """Returns the node at the top of the tree holding node."""
+    parent = getattr(node, '_parent', None)
+    while parent is not None:
+        node = parent
+        parent = getattr(node, '_parent', None)
+    return node
+
+
+def scope_generation(node: object) -> Union[object, None]:
+    """Returns the scope generation of the tree holding node."""
+    return getattr(tree_root(node), '_scope_generation', None)
+
+
+def scopes_changed(node: object) -> None:
+    """Marks the address indexes of the tree holding node as stale.
+
+    Called whenever subnets, shared networks, groups, pools or ranges are
+    added, deleted or change their addresses. The root of the tree gets a
+    new generation token and address indexes built for another token are
+    rebuilt on their next lookup, so edits in one tree leave the indexes of
+    other trees alone. Only declarations with an address index can be the
+    root of a tree that holds one.
+    """
+    root = tree_root(node)
+    if isinstance(root, AddressIndexMixin):
+        object.__setattr__(root, '_scope_generation', object())
+
+
+def subnet_sort_key(subnet: Union['Subnet4', 'Subnet6']) -> tuple:
+    """Returns the cached sort key of a subnet."""
+    return subnet.sort_key
+
+
+def parse_address(address: str) -> Tuple[int, int]:
+    """Returns the IP version and the integer value of an address.
+
+    Raises:
+        ValueError: If address is neither an IPv4 nor an IPv6 address.
+
+    """
+    try:
+        return 4, int.from_bytes(inet_pton(AF_INET, address), 'big')
+    except OSError:
+        pass
+    try:
+        return 6, int.from_bytes(inet_pton(AF_INET6, address), 'big')
+    except OSError:
+        raise ValueError(f'{address!r} does not appear to be an IPv4 or '
+                         'IPv6 address') from None
+
+
+def address_bounds(start: str, end: Union[str, None]) -> Tuple[int, int, int]:
+    """Returns the IP version and the first and last address of a range.
+
+    Args:
+        start (str): The first address of the range, or a prefix in CIDR
+            notation when end is not set.
+        end (str): The last address of the range.
+
+    Returns:
+        tuple: The IP version followed by the first and last address as
+            integers.
+
+    """
+    if end:
+        version, first = parse_address(start)
+        return version, first, parse_address(end)[1]
+    network = ip_network(start, strict=False)
+    return (network.version, int(network.network_address),
+            int(network.broadcast_address))
+
+
+def remove_node(nodes: List, node: 'StatementMixin') -> None:
+    """Removes node itself from a list, not the first node equal to it."""
+    for position, item in enumerate(nodes):
+        if item is node:
+            del nodes[position]
+            return
+    raise ValueError(f'{node!r} is not in the list')
+
+
+class AddressBlockMixin:
+    """Integer arithmetic on the addresses of subnets and ranges.
+
+    Classes provide bounds, the IP version followed by the first and last
+    address as integers. Subnets compute it when their network is set and
+    ranges on first use after their addresses are set, so capacity,
+    containment and overlap checks do not parse any addresses.
+    """
+    __slots__ = ()
+
+    @property
+    def capacity(self) -> int:
+        """The number of addresses in the block."""
+        _, first, last = self.bounds
+        return last - first + 1
+
+    def contains(self, address: Union[str, int]) -> bool:
+        """Return True if an address lies within the block.
+
+        Args:
+            address (str, int): An IP address, or an address as an integer
+                of the same IP version as the block.
+
+        Examples:
+            >>> subnet = Subnet4('10.10.10.0/24')
+            >>> subnet.contains('10.10.10.25'), subnet.contains('fd00::1')
+            (True, False)
+
+        Returns:
+            boolean: True if the address is in the block.
+
+        """
+        version, first, last = self.bounds
+        if isinstance(address, str):
+            address_version, address = parse_address(address)
+            if address_version != version:
+                return False
+        return first <= address <= last
+
+    def covers(self, other: 'AddressBlockMixin') -> bool:
+        """Return True if every address of another block is in this one."""
+        version, first, last = self.bounds
+        other_version, other_first, other_last = other.bounds
+        return (version == other_version and first <= other_first and
+                other_last <= last)
+
+    def overlaps(self, other: 'AddressBlockMixin') -> bool:
+        """Return True if this block shares an address with another."""
+        version, first, last = self.bounds
+        other_version, other_first, other_last = other.bounds
+        return (version == other_version and first <= other_last and
+                other_first <= last)
+
+
 class SubnetMixin:
+    """Methods for working with subnets kept sorted by network.
+
+    Subnets are ordered by their sort_key, IPv4 before IPv6 and then by
+    network address and prefix length. The key is computed once when the
+    network of a subnet is set, so keeping the list sorted does not parse
+    any addresses.
+    """
+    _subnets_sorted = False
+
     def add_subnet(
         self,
         network: Union['Subnet4', 'Subnet6'],
@@ -33,14 +187,49 @@ class SubnetMixin:
 
         Args:
             network (Subnet4, Subnet6): The subnet object to be added.
-            sort (boolean): Sorts the list of subnets after an addition.
+            sort (boolean): Inserts the subnet at its sorted position instead
+                of appending it.
+        """
+        self.attach(network)
+        scopes_changed(self)
+        if not sort:
+            self.subnets.append(network)
+            self._subnets_sorted = False
+            return
+        if not self._subnets_sorted:
+            self.subnets.sort(key=subnet_sort_key)
+            self._subnets_sorted = True
+        subnets = self.subnets
+        key = network.sort_key
+        low, high = 0, len(subnets)
+        while low < high:
+            middle = (low + high) // 2
+            if key < subnets[middle].sort_key:
+                high = middle
+            else:
+                low = middle + 1
+        subnets.insert(low, network)
+
+    def add_subnets(
+        self,
+        networks: Iterable[Union['Subnet4', 'Subnet6']],
+        sort: bool = True
+    ) -> None:
+        """Adds several subnets to objects subnets.
+
+        Args:
+            networks (iterable): The subnet objects to be added.
+            sort (boolean): Sorts the list of subnets once after all
+                additions.
         """
-        self.subnets.append(network)
+        scopes_changed(self)
+        networks = list(networks)
+        for network in networks:
+            self.attach(network)
+        self.subnets.extend(networks)
         if sort:
-            self.subnets.sort(
-                key=lambda x: (
-                    isinstance(ip_network(x.network), IPv6Network),
-                    ip_network(x.network)))
+            self.subnets.sort(key=subnet_sort_key)
+        self._subnets_sorted = sort
 
     def find_subnet(self, network: str) -> Union['Subnet4', 'Subnet6']:
         """Return the first exact match from objects subnets."""
@@ -54,15 +243,130 @@ class SubnetMixin:
         """Deletes the exact subnet from objects subnets."""
         found_subnet = self.find_subnet(network)
         if found_subnet:
-            self.subnets.remove(found_subnet)
+            remove_node(self.subnets, found_subnet)
+            scopes_changed(self)
+            self.mark_dirty()
             return f'Deleted {found_subnet}.'
         else:
             return 'No subnet found'
 
 
+class AddressIndex:
+    """Sorted interval arrays over the subnets found below a scope.
+
+    Subnets are kept per IP version sorted by their first address, with
+    enclosing subnets before the subnets they contain. Each interval knows
+    its nearest enclosing interval, so a lookup is a binary search followed
+    by at most one step per nesting level.
+    """
+    __slots__ = ('generation', 'intervals')
+
+    def __init__(self, scope) -> None:
+        self.generation = scope_generation(scope)
+        entries = {4: [], 6: []}
+        pools = self.pool_ranges(getattr(scope, 'pools', ()))
+        self.collect(scope, (scope,), pools, entries)
+        self.intervals = {
+            version: self.build(items) for version, items in entries.items()}
+
+    def collect(self, scope, path: tuple, pools: List, entries: dict) -> None:
+        """Adds the subnets of scope and its nested scopes to entries."""
+        for subnet in getattr(scope, 'subnets', ()):
+            subnet_version, first, last = subnet.bounds
+            subnet_pools = [
+                (start, end, pool)
+                for version, start, end, pool in
+                self.pool_ranges(subnet.pools) + pools
+                if version == subnet_version and first <= start and
+                end <= last]
+            entries[subnet_version].append(
+                (first, last, path + (subnet,), subnet_pools))
+        for shared_network in getattr(scope, 'shared_networks', ()):
+            self.collect(shared_network, path + (shared_network,),
+                         self.pool_ranges(shared_network.pools), entries)
+        for group in getattr(scope, 'groups', ()):
+            self.collect(group, path + (group,), [], entries)
+
+    @staticmethod
+    def pool_ranges(pools: List) -> List:
+        """Returns the version, bounds and pool of every range in pools."""
+        return [dhcp_range.bounds + (pool,)
+                for pool in pools for dhcp_range in pool.ranges]
+
+    @staticmethod
+    def build(items: List) -> tuple:
+        """Returns the sorted starts, ends, parents and entries of items."""
+        items.sort(key=lambda item: (item[0], -item[1]))
+        starts = [item[0] for item in items]
+        ends = [item[1] for item in items]
+        parents = []
+        enclosing = []
+        for index, start in enumerate(starts):
+            while enclosing and ends[enclosing[-1]] < start:
+                enclosing.pop()
+            parents.append(enclosing[-1] if enclosing else -1)
+            enclosing.append(index)
+        return starts, ends, parents, [item[2:] for item in items]
+
+    def lookup(self, address: str) -> Union[List, None]:
+        """Returns the scope path of the innermost subnet holding address."""
+        address = ip_address(address)
+        number = int(address)
+        starts, ends, parents, entries = self.intervals[address.version]
+        index = bisect_right(starts, number) - 1
+        while index >= 0 and ends[index] < number:
+            index = parents[index]
+        if index < 0:
+            return None
+        path, pools = entries[index]
+        for start, end, pool in pools:
+            if start <= number <= end:
+                return list(path) + [pool]
+        return list(path)
+
+
+class AddressIndexMixin:
+    """Methods for looking up the scopes that contain an IP address."""
+    _address_index = None
+    _scope_generation = None
+
+    def lookup_address(self, address: str) -> Union[List, None]:
+        """Return the scope path of the subnet containing an address.
+
+        The index is built on the first lookup and rebuilt after subnets,
+        shared networks, groups, pools or ranges have been added or deleted
+        through the add and delete methods.
+
+        Args:
+            address (str): An IPv4 or IPv6 address.
+
+        Examples:
+            >>> subnet = Subnet4('10.10.10.0/24')
+            >>> pool = Pool4()
+            >>> pool.add_range(Range4(start='10.10.10.10', end='10.10.10.20'))
+            >>> subnet.add_pool(pool)
+            >>> tree = Global()
+            >>> tree.add_subnet(subnet)
+            >>> tree.lookup_address('10.10.10.15')
+            [Global(), Subnet4(network="10.10.10.0/24"), Pool4()]
+
+        Returns:
+            list: The scopes from this object down to the subnet, followed by
+                the pool whose range holds the address. None if no subnet
+                contains the address.
+
+        """
+        index = self._address_index
+        if index is None or index.generation is not scope_generation(self):
+            index = self._address_index = AddressIndex(self)
+        return index.lookup(address)
+
+
 class RangeMixin:
     def add_range(self, range: 'Range4'):
         self.ranges.append(range)
+        self.attach(range)
+        scopes_changed(self)
 
     def find_range(self, key):
         for index, dhcp_range in self.all_ranges():
@@ -80,6 +384,8 @@ class RangeMixin:
 class PoolMixin:
     def add_pool(self, pool: 'Pool4'):
         self.pools.append(pool)
+        self.attach(pool)
+        scopes_changed(self)
 
     def find_pool(self, key):
         try:
@@ -93,7 +399,9 @@ class PoolMixin:
     def delete_pool(self, key):
         index, found_pool = self.find_pool(key)
         if found_pool:
-            self.pools.remove(found_pool)
+            remove_node(self.pools, found_pool)
+            self.mark_dirty()
+            scopes_changed(self)
             return f'Deleted {found_pool}.'
         else:
             return 'No pool found'
@@ -102,6 +410,7 @@ class PoolMixin:
 class OptionMixin:
     def add_option(self, option: 'Option'):
         self.options.append(option)
+        self.attach(option)
 
     def find_option(self, option):
         pass
@@ -110,20 +419,424 @@ class OptionMixin:
         pass
 
 
+def normalize_mac(address: str) -> str:
+    """Returns a MAC address as lower case, zero padded, colon separated
+    octets. Addresses that can not be parsed are only lower cased."""
+    if len(address) == 17 and address[2::3] in (':::::', '-----'):
+        return address.lower().replace('-', ':')
+    try:
+        return ':'.join(f'{int(octet, 16):02x}'
+                        for octet in address.replace('-', ':').split(':'))
+    except ValueError:
+        return address.lower()
+
+
+def normalize_addresses(addresses: Union[str, List[str], None]) -> List[str]:
+    """Returns the addresses of a fixed-address value in canonical form.
+
+    The value may be a comma separated string or a list of strings. Entries
+    that are not IP addresses, such as host names, are kept as they are.
+    """
+    if not addresses:
+        return []
+    if isinstance(addresses, str):
+        addresses = addresses.split(',')
+    normalized = []
+    for address in addresses:
+        address = address.strip()
+        try:
+            address = str(ip_address(address))
+        except ValueError:
+            pass
+        normalized.append(address)
+    return normalized
+
+
+# Host attributes the host indexes are keyed on.
+INDEXED_HOST_ATTRIBUTES = frozenset(('name', 'hardware', 'fixed_address'))
+
+
+class HostIndex:
+    """Hash indexes over hosts keyed by name, MAC and fixed address.
+
+    Every key maps to the list of hosts that have it. Lookups verify the
+    current values of a candidate, so a host whose hardware object was
+    changed in place is never returned for its old address.
+    """
+    __slots__ = ('names', 'macs', 'addresses')
+
+    def __init__(self) -> None:
+        self.names = {}
+        self.macs = {}
+        self.addresses = {}
+
+    @staticmethod
+    def keys(host: 'Host') -> Tuple:
+        """Returns the name, normalized MAC and addresses of a host."""
+        hardware = host.hardware
+        mac = normalize_mac(hardware.address) if hardware else None
+        return host.name, mac, normalize_addresses(host.fixed_address)
+
+    def add(self, host: 'Host') -> None:
+        """Adds a host under its current keys."""
+        name, mac, addresses = self.keys(host)
+        self.names.setdefault(name, []).append(host)
+        if mac:
+            self.macs.setdefault(mac, []).append(host)
+        for address in addresses:
+            self.addresses.setdefault(address, []).append(host)
+
+    def remove(self, host: 'Host') -> None:
+        """Removes a host from the entries of its current keys."""
+        name, mac, addresses = self.keys(host)
+        self.discard(self.names, name, host)
+        if mac:
+            self.discard(self.macs, mac, host)
+        for address in addresses:
+            self.discard(self.addresses, address, host)
+
+    @staticmethod
+    def discard(table: dict, key: str, host: 'Host') -> None:
+        """Removes the host itself, not an equal one, from table[key]."""
+        hosts = table.get(key)
+        if not hosts:
+            return
+        for position, item in enumerate(hosts):
+            if item is host:
+                del hosts[position]
+                break
+        if not hosts:
+            del table[key]
+
+    def find(
+        self,
+        name: Union[str, None] = None,
+        mac: Union[str, None] = None,
+        ip: Union[str, None] = None
+    ) -> Union['Host', None]:
+        """Returns the first host matching every given key.
+
+        An empty ip matches no host, as hosts without a fixed address are
+        not indexed by address.
+        """
+        if mac is not None:
+            mac = normalize_mac(mac)
+        if ip is not None:
+            addresses = normalize_addresses(ip)
+            if not addresses:
+                return None
+            ip = addresses[0]
+        if name is not None:
+            candidates = self.names.get(name, ())
+        elif mac is not None:
+            candidates = self.macs.get(mac, ())
+        elif ip is not None:
+            candidates = self.addresses.get(ip, ())
+        else:
+            return None
+        for host in candidates:
+            host_name, host_mac, host_addresses = self.keys(host)
+            if all((name is None or host_name == name,
+                    mac is None or host_mac == mac,
+                    ip is None or ip in host_addresses)):
+                return host
+        return None
+
+
 class HostMixin:
+    """Methods for working with hosts through maintained hash indexes.
+
+    The index of a scope is built on the first find_host or delete_host and
+    then kept up to date by add_host, delete_host, add_group and by
+    assignments to the name, hardware and fixed_address of indexed hosts.
+    The index of the global scope also covers the hosts of its groups.
+    """
+    _host_index = None
+
     def add_host(self, host: 'Host'):
         self.hosts.append(host)
+        self.attach(host)
+        for index in self.host_indexes():
+            index.add(host)
+
+    def host_index(self) -> HostIndex:
+        """Returns the host index of the scope, building it if needed."""
+        if self._host_index is None:
+            index = HostIndex()
+            for host in self.hosts:
+                index.add(host)
+            for group in getattr(self, 'groups', ()):
+                for host in group.hosts:
+                    index.add(host)
+            self._host_index = index
+        return self._host_index
+
+    def host_indexes(self) -> List[HostIndex]:
+        """Returns the built host indexes of the scope and its parents."""
+        indexes = []
+        scope = self
+        while scope is not None:
+            if scope._host_index is not None:
+                indexes.append(scope._host_index)
+            scope = scope._parent
+        return indexes
+
+    def find_host(
+        self,
+        name: Union[str, None] = None,
+        mac: Union[str, None] = None,
+        ip: Union[str, None] = None
+    ) -> Union['Host', None]:
+        """Return the first host matching all of the given keys.
 
-    def find_host(self, host):
-        pass
+        Args:
+            name (str): The name of the host declaration.
+            mac (str): The hardware address, in any letter case or padding.
+            ip (str): One of the fixed addresses of the host.
 
-    def delete_host(self, host):
-        pass
+        Examples:
+            >>> tree = Global()
+            >>> tree.add_host(Host(name='foo', fixed_address='10.0.0.5',
+                                   hardware=Hardware(type='ethernet',
+                                                     address='0:1:2:3:4:5')))
+            >>> tree.find_host(mac='00:01:02:03:04:05')
+            Host(name=foo)
+
+        Returns:
+            Host: The matching host or None.
+
+        """
+        return self.host_index().find(name=name, mac=mac, ip=ip)
+
+    def delete_host(
+        self,
+        name: Union[str, None] = None,
+        mac: Union[str, None] = None,
+        ip: Union[str, None] = None
+    ) -> str:
+        """Deletes the first host matching all of the given keys."""
+        found_host = self.find_host(name=name, mac=mac, ip=ip)
+        if found_host:
+            owner = found_host._parent
+            remove_node(owner.hosts, found_host)
+            owner.mark_dirty()
+            for index in owner.host_indexes():
+                index.remove(found_host)
+            found_host._parent = None
+            return f'Deleted {found_host}.'
+        else:
+            return 'No host found'
+
+
+def address_keys(addresses: Union[str, List[str], None]) -> List[Tuple]:
+    """Returns the IP version and integer value of a fixed-address value.
+
+    The value may be a comma separated string or a list of strings, entries
+    that are not IP addresses are left out.
+    """
+    if not addresses:
+        return []
+    if isinstance(addresses, str):
+        addresses = addresses.split(',')
+    keys = []
+    for address in addresses:
+        address = address.strip()
+        try:
+            keys.append((4, int.from_bytes(inet_pton(AF_INET, address),
+                                           'big')))
+        except OSError:
+            try:
+                keys.append(parse_address(address))
+            except ValueError:
+                pass
+    return keys
+
+
+class Conflict(NamedTuple):
+    """A problem found by find_conflicts.
+
+    For overlaps and duplicates first is the node that sorts or appears
+    first. For ranges outside their subnet first is the subnet or shared
+    network that declares the range, for fixed addresses in a dynamic range
+    first is the range and second the host.
+    """
+
+    kind: str
+    first: object
+    second: object
+
+
+def block_order(block: Tuple) -> Tuple:
+    """Returns the sort key of a block: version, start, then widest first."""
+    return block[0], block[1], -block[2]
+
+
+def overlapping_blocks(blocks: List) -> Generator[Tuple, None, None]:
+    """Yields every pair of overlapping blocks in a single sweep.
+
+    The sweep keeps the blocks that reach the start of the current block.
+    Each of them overlaps it, so the work beyond sorting is proportional to
+    the number of blocks and pairs found.
+
+    Args:
+        blocks (list): Tuples of bounds followed by the node, sorted by
+            block_order.
+
+    Yields:
+        tuple: The node of the block that starts first, followed by the
+            node of the block that starts inside it.
+
+    """
+    active = []
+    active_version = None
+    for version, first, last, node in blocks:
+        if version != active_version:
+            active = []
+            active_version = version
+        elif active and any(reach < first for reach, _ in active):
+            active = [item for item in active if item[0] >= first]
+        for _, other in active:
+            yield other, node
+        active.append((last, node))
+
+
+class ConflictMixin:
+    """Methods for validating the addresses and hosts of a configuration."""
+
+    def conflict_scopes(self) -> Generator:
+        """Yields the scopes holding subnets and hosts, this one first."""
+        scopes = [self]
+        while scopes:
+            scope = scopes.pop()
+            yield scope
+            scopes.extend(reversed(getattr(scope, 'groups', ())))
+            scopes.extend(reversed(getattr(scope, 'shared_networks', ())))
+
+    def find_conflicts(self) -> List[Conflict]:
+        """Return the address and host conflicts of the configuration.
+
+        Reports subnets that overlap each other, ranges that overlap each
+        other or lie outside the subnets they are declared in, fixed
+        addresses inside dynamic ranges and hosts sharing a hardware address
+        or a name. Addresses are compared as integer intervals that are
+        sorted once and swept, hosts through hash tables.
+
+        Examples:
+            >>> subnet = Subnet4('10.0.0.0/24')
+            >>> subnet.add_range(Range4(start='10.0.0.10', end='10.0.0.20'))
+            >>> tree = Global(subnets=[subnet])
+            >>> tree.add_host(Host(name='foo', fixed_address='10.0.0.15'))
+            >>> [conflict.kind for conflict in tree.find_conflicts()]
+            ['fixed address in range']
+
+        Returns:
+            list: A Conflict for every problem found, grouped by kind.
+
+        """
+        subnets = []
+        ranges = []
+        outside = []
+        hosts = []
+        for scope in self.conflict_scopes():
+            hosts.extend(getattr(scope, 'hosts', ()))
+            scope_subnets = getattr(scope, 'subnets', ())
+            for subnet in scope_subnets:
+                bounds = subnet.bounds
+                subnets.append(bounds + (subnet,))
+                for dhcp_range in subnet.ranges + [
+                        x for pool in subnet.pools for x in pool.ranges]:
+                    ranges.append(dhcp_range.bounds + (dhcp_range,))
+                    if not subnet.covers(dhcp_range):
+                        outside.append(Conflict(
+                            'range outside subnet', subnet, dhcp_range))
+            if getattr(scope, 'pools', None) is None:
+                continue
+            for dhcp_range in (x for pool in scope.pools for x in pool.ranges):
+                ranges.append(dhcp_range.bounds + (dhcp_range,))
+                if not any(x.covers(dhcp_range) for x in scope_subnets):
+                    outside.append(Conflict(
+                        'range outside subnet', scope, dhcp_range))
+        subnets.sort(key=block_order)
+        ranges.sort(key=block_order)
+        conflicts = [Conflict('overlapping subnets', first, second)
+                     for first, second in overlapping_blocks(subnets)]
+        conflicts.extend(Conflict('overlapping ranges', first, second)
+                         for first, second in overlapping_blocks(ranges))
+        conflicts.extend(outside)
+        conflicts.extend(self.fixed_address_conflicts(ranges, hosts))
+        conflicts.extend(self.host_conflicts(hosts))
+        return conflicts
+
+    @staticmethod
+    def fixed_address_conflicts(
+        ranges: List,
+        hosts: List['Host']
+    ) -> List[Conflict]:
+        """Returns the hosts with a fixed address inside a dynamic range.
+
+        Args:
+            ranges (list): The bounds and node of every range, sorted by
+                block_order.
+            hosts (list[pyisc.dhcpd.nodes.Host]): The hosts to check.
+
+        """
+        # Per IP version the range starts and, for each position, the range
+        # reaching furthest among the ranges starting at or before it.
+        sweeps = {4: ([], []), 6: ([], [])}
+        for version, first, last, dhcp_range in ranges:
+            starts, reach = sweeps[version]
+            starts.append(first)
+            if reach and reach[-1][0] >= last:
+                reach.append(reach[-1])
+            else:
+                reach.append((last, dhcp_range))
+        conflicts = []
+        for host in hosts:
+            value = host.fixed_address
+            try:
+                addresses = [
+                    (4, int.from_bytes(inet_pton(AF_INET, value), 'big'))]
+            except (OSError, TypeError):
+                addresses = address_keys(value)
+            if host.fixed_address6:
+                addresses += address_keys(host.fixed_address6)
+            for version, number in addresses:
+                starts, reach = sweeps[version]
+                index = bisect_right(starts, number) - 1
+                if index >= 0 and number <= reach[index][0]:
+                    conflicts.append(Conflict(
+                        'fixed address in range', reach[index][1], host))
+        return conflicts
+
+    @staticmethod
+    def host_conflicts(hosts: List['Host']) -> List[Conflict]:
+        """Returns the hosts that share a hardware address or a name."""
+        macs = {}
+        names = {}
+        duplicate_macs = []
+        duplicate_names = []
+        for host in hosts:
+            hardware = host.hardware
+            if hardware is not None and hardware.address:
+                first = macs.setdefault(normalize_mac(hardware.address), host)
+                if first is not host:
+                    duplicate_macs.append(Conflict(
+                        'duplicate hardware address', first, host))
+            first = names.setdefault(host.name, host)
+            if first is not host:
+                duplicate_names.append(Conflict(
+                    'duplicate host name', first, host))
+        return duplicate_macs + duplicate_names
 
 
 class GroupMixin:
     def add_group(self, group: 'Group'):
         self.groups.append(group)
+        scopes_changed(self)
+        self.attach(group)
+        if self._host_index is not None:
+            for host in group.hosts:
+                self._host_index.add(host)
 
     def find_group(self, group):
         pass
@@ -135,6 +848,7 @@ class GroupMixin:
 class ClassMixin:
     def add_class(self, class_obj: 'DhcpClass'):
         self.classes.append(class_obj)
+        self.attach(class_obj)
 
     def find_class(self, class_obj):
         pass
@@ -146,6 +860,7 @@ class ClassMixin:
 class SubClassMixin:
     def add_subclass(self, subclass: 'SubClass'):
         self.subclasses.append(subclass)
+        self.attach(subclass)
 
     def find_subclass(self, subclass):
         pass
@@ -157,6 +872,8 @@ class SubClassMixin:
 class SharedNetworkMixin:
     def add_shared_network(self, shared_network: 'SharedNetwork'):
         self.shared_networks.append(shared_network)
+        self.attach(shared_network)
+        scopes_changed(self)
 
     def find_shared_network(self, shared_network):
         pass
@@ -168,6 +885,7 @@ class SharedNetworkMixin:
 class ZoneMixin:
     def add_zone(self, zone: 'Zone'):
         self.zones.append(zone)
+        self.attach(zone)
 
     def find_zone(self, zone):
         pass
@@ -179,6 +897,7 @@ class ZoneMixin:
 class KeyMixin:
     def add_key(self, key: 'Key'):
         self.keys.append(key)
+        self.attach(key)
 
     def find_key(self, key):
         pass
@@ -191,6 +910,7 @@ class IncludeMixin:
     """Methods for working with the Include class as an attribute."""
     def add_include(self, include: 'Include'):
         self.includes.append(include)
+        self.attach(include)
 
     def find_include(self, include):
         pass
@@ -202,6 +922,7 @@ class IncludeMixin:
 class EventMixin:
     def add_event(self, key: 'Event'):
         self.events.append(key)
+        self.attach(key)
 
     def find_event(self, key):
         pass
@@ -213,6 +934,7 @@ class EventMixin:
 class EventSetMixin:
     def add_event_set(self, key: 'EventSet'):
         self.event_sets.append(key)
+        self.attach(key)
 
     def find_event_set(self, key):
         pass
@@ -221,197 +943,512 @@ class EventSetMixin:
         pass
 
 
-class Permissions:
+# Private attributes that only cache derived state or link a node to its
+# parent, they are not part of a pickled node.
+TRANSIENT_ATTRIBUTES = frozenset(
+    ('_parent', '_isc_cache', '_digest', '_host_index', '_address_index',
+     '_scope_generation'))
+
+
+@lru_cache(maxsize=None)
+def slot_names(node_class: type) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    """Returns the slot attribute names of a class and its bases.
+
+    Returns:
+        tuple: The names of the slots that hold node attributes followed by
+            the names of the slots that hold transient attributes.
+
+    """
+    names = []
+    for base in node_class.__mro__:
+        slots = base.__dict__.get('__slots__', ())
+        for name in (slots,) if isinstance(slots, str) else slots:
+            if name.startswith('__') and not name.endswith('__'):
+                name = f'_{base.__name__.lstrip("_")}{name}'
+            names.append(name)
+    return (tuple(x for x in names if x not in TRANSIENT_ATTRIBUTES),
+            tuple(x for x in names if x in TRANSIENT_ATTRIBUTES))
+
+
+def restore_node(node_class: type, attributes: Union[dict, None],
+                 slots: tuple) -> 'StatementMixin':
+    """Returns a node rebuilt from the state of StatementMixin.__reduce__."""
+    node = node_class.__new__(node_class)
+    if attributes:
+        node.__dict__.update(attributes)
+    names, transient_names = slot_names(node_class)
+    for name in transient_names:
+        object.__setattr__(node, name, None)
+    for name, value in zip(names, slots):
+        object.__setattr__(node, name, value)
+    if attributes:
+        link_children(node, attributes.values())
+    link_children(node, slots)
+    return node
+
+
+def link_children(node: 'StatementMixin', values: Iterable) -> None:
+    """Makes node the parent of the nodes among values and in their lists.
+
+    Edits of a child mark its ancestors dirty through these links. They
+    are set when a node is assigned or added and when a tree is unpickled
+    or decoded, never when a tree is digested or written.
+    """
+    for value in values:
+        if isinstance(value, StatementMixin):
+            object.__setattr__(value, '_parent', node)
+        elif isinstance(value, list):
+            for item in value:
+                if isinstance(item, StatementMixin):
+                    object.__setattr__(item, '_parent', node)
+
+
+@contextmanager
+def paused_gc() -> Generator[None, None, None]:
+    """Pauses the garbage collector while a whole tree is created.
+
+    Every node is tracked by the collector, so creating a tree of several
+    hundred thousand nodes at once would otherwise trigger repeated scans
+    of the growing tree.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+class StatementMixin:
+    """Methods for writing a single statement to a file object.
+
+    Nodes know the node they were added or assigned to through _parent,
+    also the nodes in a list assigned to a public attribute. Assigning a
+    public attribute marks the node and its ancestors dirty, which drops the
+    ISC text and the digest that declarations cache.
+
+    Nodes are equal when they are of the same class and have the same
+    digest. They keep hashing by identity, as a node can be edited after it
+    was put in a set or used as a key, so equal nodes may have different
+    hashes.
+    """
+    __slots__ = ()
+    _parent = None
+    __hash__ = object.__hash__
+
+    def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
+        if type(self) is not type(other):
+            return NotImplemented
+        return self.digest() == other.digest()
+
+    def __reduce__(self) -> tuple:
+        """Pickles the attributes of the node without caches and parent.
+
+        restore_node links every child back to its parent, and the caches
+        and indexes are rebuilt when they are first used. Slots without a
+        value are restored as None.
+        """
+        attributes = getattr(self, '__dict__', None)
+        if attributes is not None:
+            attributes = {name: value for name, value in attributes.items()
+                          if name not in TRANSIENT_ATTRIBUTES}
+        names, _ = slot_names(type(self))
+        slots = tuple(getattr(self, name, None) for name in names)
+        return restore_node, (type(self), attributes, slots)
+
+    def digest(self) -> bytes:
+        """Returns a hash of the class and ISC text of the statement."""
+        return blake2b(f'{type(self).__name__}\0{self.to_isc()}'.encode(),
+                       digest_size=16).digest()
+
+    def __setattr__(self, name: str, value) -> None:
+        object.__setattr__(self, name, value)
+        if name[0] != '_':
+            if isinstance(value, (StatementMixin, list)):
+                link_children(self, (value,))
+            self.mark_dirty()
+
+    def attach(self, node: 'StatementMixin') -> None:
+        """Makes this object the parent of node and marks it dirty."""
+        object.__setattr__(node, '_parent', self)
+        self.mark_dirty()
+
+    def mark_dirty(self) -> None:
+        """Drops the cached ISC text and digest of this object and its
+        ancestors.
+
+        The walk goes all the way to the root, as an ancestor may cache
+        text that its descendants never rendered themselves, such as the
+        source text of a lazily parsed block.
+        """
+        node = self
+        while node is not None:
+            if (getattr(node, '_isc_cache', None) is not None or
+                    getattr(node, '_digest', None) is not None):
+                object.__setattr__(node, '_isc_cache', None)
+                object.__setattr__(node, '_digest', None)
+            node = getattr(node, '_parent', None)
+
+    def write_isc(self, fp: TextIO, indent: int = 0) -> None:
+        """Writes valid ISC configuration to a file object.
+
+        Args:
+            fp (file object): A text stream to write to.
+            indent (int): Supply an integer to use as indentation offset.
+                Default is 0.
+
+        """
+        fp.write(self.to_isc(indent=indent))
+
+
+class DeclarationMixin(StatementMixin, metaclass=ABCMeta):
+    """Methods for writing a declaration and its statements to a file object.
+
+    Classes using this mixin implement isc_items, which yields either a
+    finished line or a child node. Child nodes are written with their own
+    write_isc. The text of a declaration is cached together with its indent
+    until the declaration or one of its descendants changes, so writing a
+    tree again only renders the changed subtrees.
+    """
+    __slots__ = ()
+    _isc_cache = None
+    _digest = None
+
+    def digest(self) -> bytes:
+        """Returns a hash of the declaration and all of its descendants.
+
+        The hash covers the class, the declaration line and every attribute
+        that is set, with child declarations contributing their own digests
+        and other child statements their text. It is cached until
+        the declaration or one of its descendants changes, so comparing two
+        unchanged subtrees does not visit their children.
+
+        Returns:
+            bytes: A 16 byte digest.
+
+        """
+        digest = self._digest
+        if digest is None:
+            parts = [type(self).__name__, str(self)]
+            for key, value in self.isc_attributes():
+                if value is None:
+                    continue
+                if isinstance(value, list):
+                    parts.append(f'{key}=')
+                    parts.extend(self.digest_part(item) for item in value)
+                elif isinstance(value, StatementMixin):
+                    parts.append(f'{key}=')
+                    parts.append(self.digest_part(value))
+                else:
+                    parts.append(f'{key}={value!r}')
+            digest = blake2b('\0'.join(parts).encode(),
+                             digest_size=16).digest()
+            object.__setattr__(self, '_digest', digest)
+        return digest
+
+    def digest_part(self, item) -> str:
+        """Returns the text a list item or child node adds to the digest.
+
+        Child declarations add their digest and other statements their
+        class and text, both behind a control character that never starts
+        an attribute name or a repr.
+        """
+        if isinstance(item, DeclarationMixin):
+            return f'\1{item.digest().hex()}'
+        if isinstance(item, StatementMixin):
+            return f'\2{type(item).__name__} {item}'
+        return repr(item)
+
+    def isc_attributes(self) -> Generator:
+        """Yields the public attributes in the order they are written."""
+        for key, value in self.__dict__.items():
+            if key[0] != '_':
+                yield key, value
+
+    @abstractmethod
+    def isc_items(self, child_indent: int) -> Generator:
+        """Yields the lines and child nodes of the declaration."""
+
+    def write_isc(self, fp: TextIO, indent: int = 0) -> None:
+        """Writes valid ISC configuration to a file object.
+
+        Args:
+            fp (file object): A text stream to write to.
+            indent (int): Supply an integer to use as indentation offset.
+                Default is 0.
+
+        """
+        cache = self._isc_cache
+        if cache is not None and cache[0] == indent:
+            fp.write(cache[1])
+        else:
+            self.render_isc(fp, indent)
+
+    def render_isc(self, fp: TextIO, indent: int) -> None:
+        """Writes the declaration without using the cached text."""
+        self.write_block(fp, f'{" " * indent}{self.__str__()}' ' {',
+                         self.isc_items(indent+4), indent)
+
+    def write_block(self, fp: TextIO, header: str, items: Iterable,
+                    indent: int) -> None:
+        """Writes the header and each line or child node on a line of its own.
+
+        The text of a block with only lines and statements is collected and
+        cached. Once a child declaration comes up the collected text is
+        written and the rest of the block is streamed to fp, the child
+        declarations caching their own text instead.
+        """
+        child_indent = indent + 4
+        parts = [header]
+        for item in items:
+            if isinstance(item, str):
+                if parts is None:
+                    fp.write('\n')
+                    fp.write(item)
+                else:
+                    parts.append('\n')
+                    parts.append(item)
+                continue
+            if parts is not None and isinstance(item, DeclarationMixin):
+                fp.write(''.join(parts))
+                parts = None
+            if parts is None:
+                fp.write('\n')
+                item.write_isc(fp, child_indent)
+            else:
+                parts.append('\n')
+                parts.append(item.to_isc(indent=child_indent))
+        footer = '\n' f'{" " * indent}' '}'
+        if parts is None:
+            fp.write(footer)
+            return
+        parts.append(footer)
+        text = ''.join(parts)
+        object.__setattr__(self, '_isc_cache', (indent, text))
+        fp.write(text)
+
+    def to_isc(self, indent: int = 0) -> str:
+        """Returns valid ISC configuration as a string.
+
+        Args:
+            indent (int): Supply an integer to use as indentation offset.
+                Default is 0.
+
+        Returns:
+            str: A string representation of the object tree from this level.
+
+        """
+        buffer = StringIO()
+        self.write_isc(buffer, indent=indent)
+        return buffer.getvalue()
+
+
+class SparseAttribute:
+    """Descriptor that keeps a parameter in the sparse mapping of an object.
+
+    Reading an unset parameter returns None and setting a parameter to None
+    removes it, so an object only carries storage for the parameters that
+    are actually set. The mapping itself is created on the first assignment.
+    """
+    __slots__ = ('name',)
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        parameters = instance._parameters
+        if parameters is None:
+            return None
+        return parameters.get(self.name)
+
+    def __set__(self, instance, value) -> None:
+        parameters = instance._parameters
+        if value is None:
+            if parameters:
+                parameters.pop(self.name, None)
+        elif parameters is None:
+            instance._parameters = {self.name: value}
+        else:
+            parameters[self.name] = value
+
+
+class SparseMixin:
+    """Methods for objects storing parameters and permissions sparsely.
+
+    Parameters and permissions share a single mapping in the _parameters
+    attribute that only holds the values that are set.
+    """
+    __slots__ = ()
+    _parameters = None
+
+    def set_parameters(self, names: Iterable, values: dict) -> None:
+        """Stores the given values, rejecting names not in the catalogue."""
+        for name, value in values.items():
+            if name not in names:
+                raise TypeError(
+                    f'{type(self).__name__} got an unexpected keyword '
+                    f'argument {name!r}')
+            setattr(self, name, value)
+
+    def parameter_items(self) -> List:
+        """Returns the set parameters and permissions in catalogue order."""
+        if not self._parameters:
+            return []
+        return sorted(self._parameters.items(),
+                      key=lambda item: PARAMETER_ORDER[item[0]])
+
+    def isc_attributes(self) -> Generator:
+        """Yields the attributes of the object in the order they are written.
+
+        The set parameters are yielded at the position of the sparse mapping
+        in the instance dictionary, which is where they were written when
+        every parameter was an instance attribute. Other private attributes
+        are internal state and are skipped.
+        """
+        for key, value in self.__dict__.items():
+            if key == '_parameters':
+                yield from self.parameter_items()
+            elif key[0] != '_':
+                yield key, value
+
+
+class Permissions(SparseMixin):
     """Contains all inheritable non-pool permission statements.
 
     Allowed values are: 'allow', 'deny' and in some cases 'ignore'.
     For a description of the various attributes refer to the ISC KB for DHCP.
+    Only the permissions that are set are stored, see PERMISSION_NAMES for
+    the accepted keyword arguments.
     """
-    def __init__(
-        self,
-        bootp:          Union[str, None] = None,
-        booting:        Union[str, None] = None,
-        duplicates:     Union[str, None] = None,
-        declines:       Union[str, None] = None,
-        client_updates: Union[str, None] = None,
-        leasequery:     Union[str, None] = None,
-    ) -> None:
+    __slots__ = ()
+
+    def __init__(self, **permissions: Union[str, None]) -> None:
         """Initialize attributes for the class."""
-        self.bootp = bootp
-        self.booting = booting
-        self.duplicates = duplicates
-        self.declines = declines
-        self.client_updates = client_updates
-        self.leasequery = leasequery
+        self.set_parameters(PERMISSION_NAMES, permissions)
         super().__init__()
 
 
-class Parameters:
+class Parameters(SparseMixin):
     """Contains all inheritable ISC Parameters.
 
     Parameters not found in this class belong in certain scopes and hence are
     declared as an attribute directly in that class.
 
+    Only the parameters that are set are stored, see PARAMETER_NAMES for the
+    accepted keyword arguments.
+
     For a description of the various attributes refer to the ISC KB for DHCP.
     """
-    def __init__(
-        self,
-        # abandon_lease_time=None,
-        adaptive_lease_time_threshold: int = None,
-        # always_broadcast=None,
-        always_reply_rfc1048=None,
-        # authoritative=None,
-        boot_unknown_clients=None,
-        check_secs_byte_order=None,
-        # db_time_format=None,
-        ddns_hostname=None,
-        ddns_domainname=None,
-        # ddns_dual_stack_mixed_mode=None,
-        # ddns_guard_id_must_match=None,
-        ddns_local_address4=None,
-        ddns_local_address6=None,
-        # ddns_other_guard_is_dynamic=None,
-        ddns_rev_domainname=None,
-        ddns_update_style=None,
-        ddns_updates=None,
-        default_lease_time=None,
-        delayed_ack=None,
-        max_ack_delay=None,
-        dhcp_cache_threshold=None,
-        do_forward_updates=None,
-        dont_use_fsync=None,
-        dynamic_bootp_lease_cutoff=None,
-        dynamic_bootp_lease_length=None,
-        echo_client_id=None,
-        filename=None,
-        fixed_address=None,
-        fixed_address6=None,
-        fixed_prefix6=None,
-        get_lease_hostnames=None,
-        hardware_type=None,
-        hardware_address=None,
-        ignore_client_uids=None,
-        infinite_is_reserved=None,
-        # lease_file_name=None,
-        # dhcpv6_lease_file_name=None,
-        lease_id_format=None,
-        limit_addrs_per_ia=None,
-        # local_port=None,
-        # local_address=None,
-        # local_address6=None,
-        # bind_local_address6=None,
-        # log_facility=None,
-        log_threshold_high=None,
-        log_threshold_low=None,
-        max_lease_time=None,
-        min_lease_time=None,
-        min_secs=None,
-        next_server=None,
-        # omapi_port=None,
-        one_lease_per_client=None,
-        # persist_eui_64_leases=None,
-        # pid_file_name=None,
-        # dhcpv6_pid_file_name=None,
-        ping_check=None,
-        ping_cltt_secs=None,
-        ping_timeout=None,
-        ping_timeout_ms=None,
-        preferred_lifetime=None,
-        prefix_length_mode=None,
-        # release_on_roam=None,
-        # remote_port=None,
-        server_identifier=None,
-        # server_id_check=None,
-        server_name=None,
-        dhcpv6_set_tee_times=None,
-        site_option_space=None,
-        stash_agent_options=None,
-        # update_conflict_detection=None,
-        update_optimization=None,
-        update_static_leases=None,
-        # use_eui_64=None,
-        use_host_decl_names=None,
-        use_lease_addr_for_default_route=None,
-        vendor_option_space=None,
+    __slots__ = ()
 
-    ) -> None:
+    def __init__(self, **parameters) -> None:
         """Initialize attributes for the class."""
-        # self.abandon_lease_time = abandon_lease_time
-        self.adaptive_lease_time_threshold = adaptive_lease_time_threshold
-        # self.always_broadcast = always_broadcast
-        self.always_reply_rfc1048 = always_reply_rfc1048
-        # self.authoritative = authoritative
-        self.boot_unknown_clients = boot_unknown_clients
-        self.check_secs_byte_order = check_secs_byte_order
-        # self.db_time_format = db_time_format
-        self.ddns_hostname = ddns_hostname
-        self.ddns_domainname = ddns_domainname
-        # self.ddns_dual_stack_mixed_mode = ddns_dual_stack_mixed_mode
-        # self.ddns_guard_id_must_match = ddns_guard_id_must_match
-        self.ddns_local_address4 = ddns_local_address4
-        self.ddns_local_address6 = ddns_local_address6
-        # self.ddns_other_guard_is_dynamic = ddns_other_guard_is_dynamic
-        self.ddns_rev_domainname = ddns_rev_domainname
-        self.ddns_update_style = ddns_update_style
-        self.ddns_updates = ddns_updates
-        self.default_lease_time = default_lease_time
-        self.delayed_ack = delayed_ack
-        self.max_ack_delay = max_ack_delay
-        self.dhcp_cache_threshold = dhcp_cache_threshold
-        self.do_forward_updates = do_forward_updates
-        self.dont_use_fsync = dont_use_fsync
-        self.dynamic_bootp_lease_cutoff = dynamic_bootp_lease_cutoff
-        self.dynamic_bootp_lease_length = dynamic_bootp_lease_length
-        self.echo_client_id = echo_client_id
-        self.filename = filename
-        self.fixed_address = fixed_address
-        self.fixed_address6 = fixed_address6
-        self.fixed_prefix6 = fixed_prefix6
-        self.get_lease_hostnames = get_lease_hostnames
-        self.hardware_type = hardware_type
-        self.hardware_address = hardware_address
-        self.ignore_client_uids = ignore_client_uids
-        self.infinite_is_reserved = infinite_is_reserved
-        # self.lease_file_name = lease_file_name
-        # self.dhcpv6_lease_file_name = dhcpv6_lease_file_name
-        self.lease_id_format = lease_id_format
-        self.limit_addrs_per_ia = limit_addrs_per_ia
-        # self.local_port = local_port
-        # self.local_address = local_address
-        # self.local_address6 = local_address6
-        # self.bind_local_address6 = bind_local_address6
-        # self.log_facility = log_facility
-        self.log_threshold_high = log_threshold_high
-        self.log_threshold_low = log_threshold_low
-        self.max_lease_time = max_lease_time
-        self.min_lease_time = min_lease_time
-        self.min_secs = min_secs
-        self.next_server = next_server
-        # self.omapi_port = omapi_port
-        self.one_lease_per_client = one_lease_per_client
-        # self.persist_eui_64_leases = persist_eui_64_leases
-        # self.pid_file_name = pid_file_name
-        # self.dhcpv6_pid_file_name = dhcpv6_pid_file_name
-        self.ping_check = ping_check
-        self.ping_cltt_secs = ping_cltt_secs
-        self.ping_timeout = ping_timeout
-        self.ping_timeout_ms = ping_timeout_ms
-        self.preferred_lifetime = preferred_lifetime
-        self.prefix_length_mode = prefix_length_mode
-        # self.release_on_roam = release_on_roam
-        # self.remote_port = remote_port
-        self.server_identifier = server_identifier
-        # self.server_id_check = server_id_check
-        self.server_name = server_name
-        self.dhcpv6_set_tee_times = dhcpv6_set_tee_times
-        self.site_option_space = site_option_space
-        self.stash_agent_options = stash_agent_options
-        # self.update_conflict_detection = update_conflict_detection
-        self.update_optimization = update_optimization
-        self.update_static_leases = update_static_leases
-        # self.use_eui_64 = use_eui_64
-        self.use_host_decl_names = use_host_decl_names
-        self.use_lease_addr_for_default_route = \
-            use_lease_addr_for_default_route
-        self.vendor_option_space = vendor_option_space
+        self._parameters = None
+        self.set_parameters(PARAMETER_NAMES, parameters)
         super().__init__()
+
+
+# All inheritable permissions in the order they are written.
+PERMISSION_NAMES = (
+    'bootp',
+    'booting',
+    'duplicates',
+    'declines',
+    'client_updates',
+    'leasequery',
+)
+
+# All inheritable parameters in the order they are written.
+PARAMETER_NAMES = (
+    # 'abandon_lease_time',
+    'adaptive_lease_time_threshold',
+    # 'always_broadcast',
+    'always_reply_rfc1048',
+    # 'authoritative',
+    'boot_unknown_clients',
+    'check_secs_byte_order',
+    # 'db_time_format',
+    'ddns_hostname',
+    'ddns_domainname',
+    # 'ddns_dual_stack_mixed_mode',
+    # 'ddns_guard_id_must_match',
+    'ddns_local_address4',
+    'ddns_local_address6',
+    # 'ddns_other_guard_is_dynamic',
+    'ddns_rev_domainname',
+    'ddns_update_style',
+    'ddns_updates',
+    'default_lease_time',
+    'delayed_ack',
+    'max_ack_delay',
+    'dhcp_cache_threshold',
+    'do_forward_updates',
+    'dont_use_fsync',
+    'dynamic_bootp_lease_cutoff',
+    'dynamic_bootp_lease_length',
+    'echo_client_id',
+    'filename',
+    'fixed_address',
+    'fixed_address6',
+    'fixed_prefix6',
+    'get_lease_hostnames',
+    'hardware_type',
+    'hardware_address',
+    'ignore_client_uids',
+    'infinite_is_reserved',
+    # 'lease_file_name',
+    # 'dhcpv6_lease_file_name',
+    'lease_id_format',
+    'limit_addrs_per_ia',
+    # 'local_port',
+    # 'local_address',
+    # 'local_address6',
+    # 'bind_local_address6',
+    # 'log_facility',
+    'log_threshold_high',
+    'log_threshold_low',
+    'max_lease_time',
+    'min_lease_time',
+    'min_secs',
+    'next_server',
+    # 'omapi_port',
+    'one_lease_per_client',
+    # 'persist_eui_64_leases',
+    # 'pid_file_name',
+    # 'dhcpv6_pid_file_name',
+    'ping_check',
+    'ping_cltt_secs',
+    'ping_timeout',
+    'ping_timeout_ms',
+    'preferred_lifetime',
+    'prefix_length_mode',
+    # 'release_on_roam',
+    # 'remote_port',
+    'server_identifier',
+    # 'server_id_check',
+    'server_name',
+    'dhcpv6_set_tee_times',
+    'site_option_space',
+    'stash_agent_options',
+    # 'update_conflict_detection',
+    'update_optimization',
+    'update_static_leases',
+    # 'use_eui_64',
+    'use_host_decl_names',
+    'use_lease_addr_for_default_route',
+    'vendor_option_space',
+)
+
+PARAMETER_ORDER = {
+    name: index
+    for index, name in enumerate(PARAMETER_NAMES + PERMISSION_NAMES)}
+
+for name in PERMISSION_NAMES:
+    setattr(Permissions, name, SparseAttribute(name))
+for name in PARAMETER_NAMES:
+    setattr(Parameters, name, SparseAttribute(name))
@@ -12,13 +12,17 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import List, Union
+from typing import Generator, List, TextIO, Union
 from ipaddress import IPv4Network, IPv6Network
 from pyisc.dhcpd.mixin import (EventMixin, EventSetMixin, KeyMixin, Parameters,
-                               OptionMixin, Permissions, PoolMixin, RangeMixin,
+                               AddressBlockMixin, AddressIndexMixin,
+                               ConflictMixin, OptionMixin, Permissions,
+                               PoolMixin, RangeMixin,
                                SubnetMixin, SharedNetworkMixin, GroupMixin,
                                HostMixin, ClassMixin, SubClassMixin, ZoneMixin,
-                               IncludeMixin)
+                               IncludeMixin, DeclarationMixin, StatementMixin,
+                               INDEXED_HOST_ATTRIBUTES, address_bounds,
+                               scopes_changed)
 
 # TODO:
 # Add the match_if attribute to DhcpClass and make changes to current parsing
@@ -34,7 +38,7 @@ from pyisc.dhcpd.mixin import (EventMixin, EventSetMixin, KeyMixin, Parameters,
 
 
 # Parameter classes
-class CustomOption:
+class CustomOption(StatementMixin):
     """Represents an custom dhcp option definition."""
     def __init__(
         self,
@@ -81,7 +85,7 @@ class CustomOption:
         return f'{" " * indent}{self.__str__()};'
 
 
-class EventSet:
+class EventSet(StatementMixin):
     """Represents an set expression for event objects."""
     def __init__(self, key: str, value: str) -> None:
         self.key = key
@@ -116,8 +120,10 @@ class EventSet:
         return f'{" " * indent}{self.__str__()};'
 
 
-class Hardware:
+class Hardware(StatementMixin):
     """Represents an hardware parameter."""
+    __slots__ = ('type', 'address', '_parent')
+
     def __init__(
         self,
         type:       str,
@@ -161,8 +167,10 @@ class Hardware:
         return f'{" " * indent}{self.__str__()};'
 
 
-class HostIdentifier:
+class HostIdentifier(StatementMixin):
     """Represents an host identifier parameter."""
+    __slots__ = ('option_name', 'option_data', 'number', '_parent')
+
     def __init__(
         self,
         option_name:    str,
@@ -230,8 +238,10 @@ class HostIdentifier:
         return f'{" " * indent}{self.__str__()};'
 
 
-class Option:
+class Option(StatementMixin):
     """Represents an dhcp option."""
+    __slots__ = ('name', 'number', '__value', '_parent')
+
     def __init__(
         self,
         value:  str,
@@ -316,7 +326,7 @@ class Option:
         return f'{" " * indent}{self.__str__()};'
 
 
-class OptionExpression:
+class OptionExpression(StatementMixin):
     """Represents option with an expression as its value."""
     def __init__(
         self,
@@ -346,7 +356,7 @@ class OptionExpression:
         return f'{" " * indent}{self.__str__()};'
 
 
-class ServerDuidLL:
+class ServerDuidLL(StatementMixin):
     def __init__(
         self,
         hardware_type:      str,
@@ -387,7 +397,7 @@ class ServerDuidLL:
         return f'{" " * indent}{self.__str__()};'
 
 
-class ServerDuidEN:
+class ServerDuidEN(StatementMixin):
     """Represents an server DUID enterprise parameter."""
     def __init__(self, enterprise_number: int, enterprise_id: str) -> None:
         self.enterprise_number = enterprise_number
@@ -424,7 +434,7 @@ class ServerDuidEN:
 
 
 # Declarations
-class DhcpClass:
+class DhcpClass(DeclarationMixin):
     """Represents an class declaration."""
     def __init__(
         self,
@@ -491,26 +501,22 @@ class DhcpClass:
             str: A string representation of the object tree from this level.
 
         """
-        attrs = []
+        return super().to_isc(indent=indent)
+
+    def isc_items(self, child_indent: int) -> Generator:
+        """Yields the lines and child nodes of the declaration."""
         space_sep = ('lease_limit')
         excluded_atts = ('name')
-        child_indent = indent+4
-        for key, value in self.__dict__.items():
+        for key, value in self.isc_attributes():
             if key in space_sep:
                 isc_key = key.replace("_", " ")
             else:
                 isc_key = key.replace("_", "-")
             if all((value, key not in excluded_atts)):
-                attrs.append(f'{" " * child_indent}{isc_key} {value};')
-        return_str = (f'{" " * indent}{self.__str__()}' ' {')
-        if len(attrs) > 0:
-            return_str += '\n'
-        attrs_str = "\n".join(attrs)
-        section_end = '}'
-        return (f'{return_str}{attrs_str}' '\n' f'{" " * indent}{section_end}')
+                yield f'{" " * child_indent}{isc_key} {value};'
 
 
-class Event(EventSetMixin):
+class Event(EventSetMixin, DeclarationMixin):
     """Represents the event declaration."""
     def __init__(
         self,
@@ -565,24 +571,20 @@ class Event(EventSetMixin):
             str: A string representation of the object tree from this level.
 
         """
-        attrs = []
+        return super().to_isc(indent=indent)
+
+    def isc_items(self, child_indent: int) -> Generator:
+        """Yields the lines and child nodes of the declaration."""
         excluded_atts = ('event_type')
-        child_indent = indent+4
-        for key, value in self.__dict__.items():
+        for key, value in self.isc_attributes():
             if isinstance(value, list):
                 for item in value:
-                    attrs.append(item.to_isc(indent=child_indent))
+                    yield item
             elif all((value, key not in excluded_atts)):
-                attrs.append(f'{" " * child_indent}{key} {value};')
-        return_str = (f'{" " * indent}{self.__str__()}' ' {')
-        if len(attrs) > 0:
-            return_str += '\n'
-        attrs_str = "\n".join(attrs)
-        section_end = '}'
-        return (f'{return_str}{attrs_str}' '\n' f'{" " * indent}{section_end}')
+                yield f'{" " * child_indent}{key} {value};'
 
 
-class Failover:
+class Failover(DeclarationMixin):
     """Represents the Failover declaration."""
     def __init__(
         self,
@@ -669,29 +671,33 @@ class Failover:
             str: A string representation of the object tree from this level.
 
         """
-        attrs = []
+        return super().to_isc(indent=indent)
+
+    def isc_items(self, child_indent: int) -> Generator:
+        """Yields the lines and child nodes of the declaration."""
         space_sep = ('load_balance_max_seconds')
         excluded_atts = ('name')
-        child_indent = indent+4
-        for key, value in self.__dict__.items():
+        for key, value in self.isc_attributes():
             if key in space_sep:
                 isc_key = key.replace("_", " ")
             else:
                 isc_key = key.replace("_", "-")
             if all((value, key == 'role')):
-                attrs.append(f'{" " * child_indent}{value};')
+                yield f'{" " * child_indent}{value};'
             elif all((value, key not in excluded_atts)):
-                attrs.append(f'{" " * child_indent}{isc_key} {value};')
-        return_str = (f'{" " * indent}{self.__str__()}' ' {')
-        if len(attrs) > 0:
-            return_str += '\n'
-        attrs_str = "\n".join(attrs)
-        section_end = '}'
-        return (f'{return_str}{attrs_str}' '\n' f'{" " * indent}{section_end}')
+                yield f'{" " * child_indent}{isc_key} {value};'
 
 
-class Host(Parameters):
-    """Represents an host declaration."""
+class Host(Parameters, DeclarationMixin):
+    """Represents an host declaration.
+
+    Hosts are by far the most numerous declarations in larger configurations
+    so the class uses slots instead of an instance dictionary.
+    """
+    __slots__ = ('name', 'always_broadcast', 'fixed_address', 'fixed_address6',
+                 'fixed_prefix6', 'hardware', 'host_identifier', '_parameters',
+                 '_parent', '_isc_cache', '_digest')
+
     def __init__(
         self,
         name:               str,
@@ -718,6 +724,9 @@ class Host(Parameters):
                 identifier for client
 
         """
+        self._parent = None
+        self._isc_cache = None
+        self._digest = None
         self.name = name
         self.always_broadcast = always_broadcast
         self.fixed_address = fixed_address
@@ -727,6 +736,18 @@ class Host(Parameters):
         self.host_identifier = host_identifier
         super().__init__()
 
+    def __setattr__(self, name: str, value) -> None:
+        """Keeps the host indexes of the enclosing scopes up to date."""
+        if name in INDEXED_HOST_ATTRIBUTES and self._parent is not None:
+            indexes = self._parent.host_indexes()
+            for index in indexes:
+                index.remove(self)
+            super().__setattr__(name, value)
+            for index in indexes:
+                index.add(self)
+        else:
+            super().__setattr__(name, value)
+
     def __str__(self) -> str:
         return f'host {self.name}'
 
@@ -767,26 +788,29 @@ class Host(Parameters):
             str: A string representation of the object tree from this level.
 
         """
-        attrs = []
-        child_indent = indent+4
-        for key, value in self.__dict__.items():
+        return super().to_isc(indent=indent)
+
+    def isc_attributes(self) -> Generator:
+        """Yields the public slots followed by the set parameters."""
+        for key in self.__slots__:
+            if key[0] != '_':
+                yield key, getattr(self, key)
+        yield from self.parameter_items()
+
+    def isc_items(self, child_indent: int) -> Generator:
+        """Yields the lines and child nodes of the declaration."""
+        for key, value in self.isc_attributes():
             new_key = key.replace("_", "-")
             if hasattr(value, 'to_isc'):
-                attrs.append(f'{" " * child_indent}{value.to_isc()}')
+                yield f'{" " * child_indent}{value.to_isc()}'
             elif isinstance(value, bool):
-                attrs.append(
+                yield (
                     f'{" " * child_indent}{new_key} {str(value).lower()};')
             elif all((value, key != 'name')):
-                attrs.append(f'{" " * child_indent}{new_key} {value};')
-        return_str = (f'{" " * indent}{self.__str__()}' ' {')
-        if len(attrs) > 0:
-            return_str += '\n'
-        attrs_str = "\n".join(attrs)
-        section_end = '}'
-        return (f'{return_str}{attrs_str}' '\n' f'{" " * indent}{section_end}')
+                yield f'{" " * child_indent}{new_key} {value};'
 
 
-class Include:
+class Include(StatementMixin):
     """Represents the include declaration."""
     def __init__(self, filename: str) -> None:
         """Initialize attributes for the class.
@@ -825,7 +849,7 @@ class Include:
         return f'{" " * indent}{self.__str__()};'
 
 
-class Key:
+class Key(DeclarationMixin):
     """Represents an key declaration and parameter."""
     def __init__(
         self,
@@ -876,21 +900,19 @@ class Key:
             str: A string representation of the object tree from this level.
 
         """
-        attrs = []
-        child_indent = indent+4
-        for key, value in self.__dict__.items():
+        return super().to_isc(indent=indent)
+
+    def isc_items(self, child_indent: int) -> Generator:
+        """Yields the lines and child nodes of the declaration."""
+        for key, value in self.isc_attributes():
             if all((value, key != 'name')):
-                attrs.append(f'{" " * child_indent}{key} {value};')
-        return_str = (f'{" " * indent}{self.__str__()}' ' {')
-        if len(attrs) > 0:
-            return_str += '\n'
-        attrs_str = "\n".join(attrs)
-        section_end = '}'
-        return (f'{return_str}{attrs_str}' '\n' f'{" " * indent}{section_end}')
+                yield f'{" " * child_indent}{key} {value};'
 
 
-class Prefix6:
+class Prefix6(StatementMixin):
     """Represents an prefix declaration for IPv6 objects."""
+    __slots__ = ('start', 'end', 'bits', '_parent')
+
     def __init__(
         self,
         start:  str,
@@ -929,8 +951,10 @@ class Prefix6:
         return f'{" " * indent}{self.__str__()};'
 
 
-class Range4:
+class Range4(AddressBlockMixin, StatementMixin):
     """Represents the range declaration for IPv4 objects."""
+    __slots__ = ('_start', '_end', 'dynamic_bootp', '_parent', '_bounds')
+
     def __init__(
         self,
         start:          str,
@@ -950,6 +974,36 @@ class Range4:
         self.end = end
         self.dynamic_bootp = dynamic_bootp
 
+    @property
+    def start(self) -> str:
+        """The first address of the range."""
+        return self._start
+
+    @start.setter
+    def start(self, start: str) -> None:
+        self._start = start
+        self._bounds = None
+        scopes_changed(self)
+
+    @property
+    def end(self) -> Union[str, None]:
+        """The last address of the range."""
+        return self._end
+
+    @end.setter
+    def end(self, end: Union[str, None]) -> None:
+        self._end = end
+        self._bounds = None
+        scopes_changed(self)
+
+    @property
+    def bounds(self) -> tuple:
+        """The IP version and the first and last address as integers."""
+        bounds = self._bounds
+        if bounds is None:
+            bounds = self._bounds = address_bounds(self._start, self._end)
+        return bounds
+
     def __str__(self) -> str:
         list_comp = [data for data in (self.start, self.end) if data]
         if self.dynamic_bootp:
@@ -991,8 +1045,10 @@ class Range4:
         return f'{" " * indent}{self.__str__()};'
 
 
-class Range6:
+class Range6(AddressBlockMixin, StatementMixin):
     """Represents the range declaration for IPv6 objects."""
+    __slots__ = ('_start', '_end', 'temporary', '_parent', '_bounds')
+
     def __init__(
         self,
         start:      str,
@@ -1014,6 +1070,36 @@ class Range6:
         self.end = end
         self.temporary = temporary
 
+    @property
+    def start(self) -> str:
+        """The first address of the range."""
+        return self._start
+
+    @start.setter
+    def start(self, start: str) -> None:
+        self._start = start
+        self._bounds = None
+        scopes_changed(self)
+
+    @property
+    def end(self) -> Union[str, None]:
+        """The last address of the range."""
+        return self._end
+
+    @end.setter
+    def end(self, end: Union[str, None]) -> None:
+        self._end = end
+        self._bounds = None
+        scopes_changed(self)
+
+    @property
+    def bounds(self) -> tuple:
+        """The IP version and the first and last address as integers."""
+        bounds = self._bounds
+        if bounds is None:
+            bounds = self._bounds = address_bounds(self._start, self._end)
+        return bounds
+
     def __str__(self) -> str:
         list_comp = [data for data in (self.start, self.end) if data]
         if self.temporary:
@@ -1059,7 +1145,7 @@ class Range6:
         return f'{" " * indent}{self.__str__()};'
 
 
-class Zone:
+class Zone(DeclarationMixin):
     """Represents an zone declaration."""
     def __init__(
         self,
@@ -1126,22 +1212,18 @@ class Zone:
             str: A string representation of the object tree from this level.
 
         """
-        attrs = []
-        child_indent = indent+4
-        for key, value in self.__dict__.items():
+        return super().to_isc(indent=indent)
+
+    def isc_items(self, child_indent: int) -> Generator:
+        """Yields the lines and child nodes of the declaration."""
+        for key, value in self.isc_attributes():
             if all((value, key != 'name', key != 'key')):
-                attrs.append(f'{" " * child_indent}{key} {value};')
+                yield f'{" " * child_indent}{key} {value};'
         if self.key:
-            attrs.append(f'{" " * child_indent}{value};')
-        return_str = (f'{" " * indent}{self.__str__()}' ' {')
-        if len(attrs) > 0:
-            return_str += '\n'
-        attrs_str = "\n".join(attrs)
-        section_end = '}'
-        return (f'{return_str}{attrs_str}' '\n' f'{" " * indent}{section_end}')
+            yield f'{" " * child_indent}{value};'
 
 
-class Pool4(RangeMixin):
+class Pool4(RangeMixin, DeclarationMixin):
     """Represents an pool declaration for IPv4 objects."""
     def __init__(
         self,
@@ -1200,15 +1282,19 @@ class Pool4(RangeMixin):
 
     def add_allowed_member(self, member: str) -> None:
         self.allow_members_of.append(member)
+        self.mark_dirty()
 
     def delete_allowed_member(self, member: str) -> None:
         self.allow_members_of.remove(member)
+        self.mark_dirty()
 
     def add_denied_member(self, member: str) -> None:
         self.deny_members_of.append(member)
+        self.mark_dirty()
 
     def delete_denied_member(self, member: str) -> None:
         self.deny_members_of.remove(member)
+        self.mark_dirty()
 
     def object_tree(self, indent=0):
         attrs = []
@@ -1285,35 +1371,31 @@ class Pool4(RangeMixin):
             str: A string representation of the object tree from this level.
 
         """
-        attrs = []
-        child_indent = indent+4
-        for key, value in self.__dict__.items():
+        return super().to_isc(indent=indent)
+
+    def isc_items(self, child_indent: int) -> Generator:
+        """Yields the lines and child nodes of the declaration."""
+        for key, value in self.isc_attributes():
             if 'known' in key:
                 new_key = key.replace("_", "-")
             else:
                 new_key = key.replace("_", " ")
             if all((value, 'members_of' in key)):
                 for subvalue in value:
-                    attrs.append(f'{" " * child_indent}{new_key} {subvalue};')
+                    yield f'{" " * child_indent}{new_key} {subvalue};'
             elif all((value, key == 'ranges')):
                 for dhcp_range in self.ranges:
-                    attrs.append(f'{" " * child_indent}{dhcp_range.to_isc()}')
+                    yield f'{" " * child_indent}{dhcp_range.to_isc()}'
             elif all((value, key == 'failover')):
-                attrs.append(f'{" " * child_indent}{value};')
+                yield f'{" " * child_indent}{value};'
             elif any((value == 'allow', value == 'deny')):
-                attrs.append(f'{" " * child_indent}{value} {new_key};')
+                yield f'{" " * child_indent}{value} {new_key};'
             elif all((value, key != 'name')):
-                attrs.append(f'{" " * child_indent}{new_key} {value};')
-        return_str = (f'{" " * indent}{self.__str__()}' ' {')
-        if len(attrs) > 0:
-            return_str += '\n'
-        attrs_str = "\n".join(attrs)
-        section_end = '}'
-        return (f'{return_str}{attrs_str}' '\n' f'{" " * indent}{section_end}')
+                yield f'{" " * child_indent}{new_key} {value};'
 
 
 # Untested
-class Pool6:
+class Pool6(DeclarationMixin):
     """Represents an pool declaration for IPv6 objects."""
     def __init__(
         self,
@@ -1374,15 +1456,19 @@ class Pool6:
 
     def add_allowed_member(self, member: str) -> None:
         self.allow_members_of.append(member)
+        self.mark_dirty()
 
     def delete_allowed_member(self, member: str) -> None:
         self.allow_members_of.remove(member)
+        self.mark_dirty()
 
     def add_denied_member(self, member: str) -> None:
         self.deny_members_of.append(member)
+        self.mark_dirty()
 
     def delete_denied_member(self, member: str) -> None:
         self.deny_members_of.remove(member)
+        self.mark_dirty()
 
     def object_tree(self, indent=0):
         return f'{" " * indent}{self.__repr__()}'
@@ -1398,38 +1484,34 @@ class Pool6:
             str: A string representation of the object tree from this level.
 
         """
-        attrs = []
-        child_indent = indent+4
-        for key, value in self.__dict__.items():
+        return super().to_isc(indent=indent)
+
+    def isc_items(self, child_indent: int) -> Generator:
+        """Yields the lines and child nodes of the declaration."""
+        for key, value in self.isc_attributes():
             if 'known' in key:
                 new_key = key.replace("_", "-")
             else:
                 new_key = key.replace("_", " ")
             if all((value, 'members_of' in key)):
                 for subvalue in value:
-                    attrs.append(f'{" " * child_indent}{new_key} {subvalue};')
+                    yield f'{" " * child_indent}{new_key} {subvalue};'
             elif all((value, key == 'ranges')):
                 for dhcp_range in self.ranges:
-                    attrs.append(f'{" " * child_indent}{dhcp_range.to_isc()}')
+                    yield f'{" " * child_indent}{dhcp_range.to_isc()}'
             # elif all((value, key == 'prefix6')):
-            #     attrs.append(f'{" " * child_indent}{value.to_isc()}')
+            #     yield f'{" " * child_indent}{value.to_isc()}'
             elif hasattr(value, 'to_isc'):
-                attrs.append(f'{" " * child_indent}{value.to_isc()}')
+                yield f'{" " * child_indent}{value.to_isc()}'
             elif all((value, key == 'failover')):
-                attrs.append(f'{" " * child_indent}{value};')
+                yield f'{" " * child_indent}{value};'
             elif any((value == 'allow', value == 'deny')):
-                attrs.append(f'{" " * child_indent}{value} {new_key};')
+                yield f'{" " * child_indent}{value} {new_key};'
             elif all((value, key != 'name')):
-                attrs.append(f'{" " * child_indent}{new_key} {value};')
-        return_str = (f'{" " * indent}{self.__str__()}' ' {')
-        if len(attrs) > 0:
-            return_str += '\n'
-        attrs_str = "\n".join(attrs)
-        section_end = '}'
-        return (f'{return_str}{attrs_str}' '\n' f'{" " * indent}{section_end}')
+                yield f'{" " * child_indent}{new_key} {value};'
 
 
-class SubClass(Parameters, OptionMixin):
+class SubClass(Parameters, OptionMixin, DeclarationMixin):
     """Represents an subclass declaration."""
     def __init__(
         self,
@@ -1495,27 +1577,42 @@ class SubClass(Parameters, OptionMixin):
             str: A string representation of the object tree from this level.
 
         """
-        attrs = []
-        child_indent = indent+4
-        for key, value in self.__dict__.items():
+        return super().to_isc(indent=indent)
+
+    def render_isc(self, fp: TextIO, indent: int) -> None:
+        """Writes the declaration without using the cached text.
+
+        A subclass without statements is written as a single statement
+        instead of an empty declaration.
+
+        Args:
+            fp (file object): A text stream to write to.
+            indent (int): Supply an integer to use as indentation offset.
+
+        """
+        items = list(self.isc_items(indent+4))
+        if len(items) == 0:
+            fp.write(f'{" " * indent}{self.__str__()};')
+            return
+        self.write_block(fp, f'{" " * indent}{self.__str__()}' ' {', items,
+                         indent)
+
+    def isc_items(self, child_indent: int) -> Generator:
+        """Yields the lines and child nodes of the declaration."""
+        for key, value in self.isc_attributes():
             if key == 'lease_limit':
                 new_key = key.replace("_", " ")
             else:
                 new_key = key.replace("_", "-")
             if isinstance(value, list):
                 for item in value:
-                    attrs.append(item.to_isc(indent=child_indent))
+                    yield item
             elif all((value, key != 'name', key != 'match_value')):
-                attrs.append(f'{" " * child_indent}{new_key} {value};')
-        if len(attrs) == 0:
-            return f'{" " * indent}{self.__str__()};'
-        return_str = (f'{" " * indent}{self.__str__()}' ' {' '\n')
-        attrs_str = "\n".join(attrs)
-        section_end = '}'
-        return (f'{return_str}{attrs_str}' '\n' f'{" " * indent}{section_end}')
+                yield f'{" " * child_indent}{new_key} {value};'
 
 
-class Subnet4(Parameters, Permissions, OptionMixin, RangeMixin, PoolMixin):
+class Subnet4(Parameters, Permissions, OptionMixin, RangeMixin, PoolMixin,
+              AddressBlockMixin, DeclarationMixin):
     """Represents an subnet declaration for IPv4 objects."""
     def __init__(
         self,
@@ -1538,7 +1635,7 @@ class Subnet4(Parameters, Permissions, OptionMixin, RangeMixin, PoolMixin):
             pools (list[pyisc.dhcpd.nodes.Pool4]): List of pools.
 
         """
-        self.network = IPv4Network(network).with_prefixlen
+        self.network = network
         self.authoritative = authoritative
         self.server_id_check = server_id_check
         self.options = [] if not options else options
@@ -1556,10 +1653,34 @@ class Subnet4(Parameters, Permissions, OptionMixin, RangeMixin, PoolMixin):
     #         IPv4Network(self.network) == IPv4Network(other.network)
     #     )
 
+    @property
+    def network(self) -> str:
+        """The network in CIDR format."""
+        return self._network
+
+    @network.setter
+    def network(self, network: str) -> None:
+        network = IPv4Network(network)
+        first = int(network.network_address)
+        self._network = network.with_prefixlen
+        self._sort_key = (False, first, network.prefixlen)
+        self._bounds = (4, first, first + network.num_addresses - 1)
+        self._netmask = str(network.netmask)
+        scopes_changed(self)
+
+    @property
+    def bounds(self) -> tuple:
+        """The IP version and the first and last address as integers."""
+        return self._bounds
+
+    @property
+    def sort_key(self) -> tuple:
+        """The key that orders subnets, IPv4 before IPv6, by network."""
+        return self._sort_key
+
     def __str__(self) -> str:
-        ip_network = IPv4Network(self.network)
-        subnet, netmask = ip_network.with_netmask.split('/')
-        return f'subnet {subnet} netmask {netmask}'
+        subnet = self._network.split('/', 1)[0]
+        return f'subnet {subnet} netmask {self._netmask}'
 
     def __repr__(self) -> str:
         return f'Subnet4(network="{self.network}")'
@@ -1615,29 +1736,26 @@ class Subnet4(Parameters, Permissions, OptionMixin, RangeMixin, PoolMixin):
             str: A string representation of the object tree from this level.
 
         """
-        attrs = []
-        child_indent = indent+4
-        for key, value in self.__dict__.items():
+        return super().to_isc(indent=indent)
+
+    def isc_items(self, child_indent: int) -> Generator:
+        """Yields the lines and child nodes of the declaration."""
+        for key, value in self.isc_attributes():
             if isinstance(value, list):
                 for item in value:
-                    attrs.append(item.to_isc(indent=child_indent))
+                    yield item
             elif all((isinstance(value, bool), key == 'authoritative')):
                 if value:
-                    attrs.append(f'{" " * child_indent}{key};')
+                    yield f'{" " * child_indent}{key};'
                 else:
-                    attrs.append(f'{" " * child_indent}not {key};')
+                    yield f'{" " * child_indent}not {key};'
             elif all((value, key != 'network')):
-                attrs.append(f'{" " * child_indent}{key} {value};')
-        return_str = (f'{" " * indent}{self.__str__()}' ' {')
-        if len(attrs) > 0:
-            return_str += '\n'
-        attrs_str = "\n".join(attrs)
-        section_end = '}'
-        return (f'{return_str}{attrs_str}' '\n' f'{" " * indent}{section_end}')
+                yield f'{" " * child_indent}{key} {value};'
 
 
 # Untested
-class Subnet6(Parameters, Permissions, OptionMixin, RangeMixin, PoolMixin):
+class Subnet6(Parameters, Permissions, OptionMixin, RangeMixin, PoolMixin,
+              AddressBlockMixin, DeclarationMixin):
     """Represents an subnet declaration for IPv6 objects."""
     def __init__(
         self,
@@ -1661,7 +1779,7 @@ class Subnet6(Parameters, Permissions, OptionMixin, RangeMixin, PoolMixin):
             pools (list[pyisc.dhcpd.nodes.Pool4]): List of pools.
 
         """
-        self.network = IPv6Network(network).with_prefixlen
+        self.network = network
         self.authoritative = authoritative
         self.server_id_check = server_id_check
         self.options = [] if not options else options
@@ -1680,6 +1798,30 @@ class Subnet6(Parameters, Permissions, OptionMixin, RangeMixin, PoolMixin):
     #         IPv6Network(self.network) == IPv6Network(other.network)
     #     )
 
+    @property
+    def network(self) -> str:
+        """The network in CIDR format."""
+        return self._network
+
+    @network.setter
+    def network(self, network: str) -> None:
+        network = IPv6Network(network)
+        first = int(network.network_address)
+        self._network = network.with_prefixlen
+        self._sort_key = (True, first, network.prefixlen)
+        self._bounds = (6, first, first + network.num_addresses - 1)
+        scopes_changed(self)
+
+    @property
+    def bounds(self) -> tuple:
+        """The IP version and the first and last address as integers."""
+        return self._bounds
+
+    @property
+    def sort_key(self) -> tuple:
+        """The key that orders subnets, IPv4 before IPv6, by network."""
+        return self._sort_key
+
     def __str__(self) -> str:
         return f'subnet6 {self.network}'
 
@@ -1703,31 +1845,27 @@ class Subnet6(Parameters, Permissions, OptionMixin, RangeMixin, PoolMixin):
             str: A string representation of the object tree from this level.
 
         """
-        attrs = []
-        child_indent = indent+4
-        for key, value in self.__dict__.items():
+        return super().to_isc(indent=indent)
+
+    def isc_items(self, child_indent: int) -> Generator:
+        """Yields the lines and child nodes of the declaration."""
+        for key, value in self.isc_attributes():
             if isinstance(value, list):
                 for item in value:
-                    attrs.append(item.to_isc(indent=child_indent))
+                    yield item
             elif hasattr(value, 'to_isc'):
-                attrs.append(f'{" " * child_indent}{value.to_isc()}')
+                yield f'{" " * child_indent}{value.to_isc()}'
             elif all((isinstance(value, bool), key == 'authoritative')):
                 if value:
-                    attrs.append(f'{" " * child_indent}{key};')
+                    yield f'{" " * child_indent}{key};'
                 else:
-                    attrs.append(f'{" " * child_indent}not {key};')
+                    yield f'{" " * child_indent}not {key};'
             elif all((value, key != 'network')):
-                attrs.append(f'{" " * child_indent}{key} {value};')
-        return_str = (f'{" " * indent}{self.__str__()}' ' {')
-        if len(attrs) > 0:
-            return_str += '\n'
-        attrs_str = "\n".join(attrs)
-        section_end = '}'
-        return (f'{return_str}{attrs_str}' '\n' f'{" " * indent}{section_end}')
+                yield f'{" " * child_indent}{key} {value};'
 
 
 class SharedNetwork(Parameters, Permissions, OptionMixin, SubnetMixin,
-                    PoolMixin):
+                    AddressIndexMixin, PoolMixin, DeclarationMixin):
     """Represents an shared network declaration."""
     def __init__(
         self,
@@ -1808,29 +1946,25 @@ class SharedNetwork(Parameters, Permissions, OptionMixin, SubnetMixin,
             str: A string representation of the object tree from this level.
 
         """
-        attrs = []
-        child_indent = indent+4
-        for key, value in self.__dict__.items():
+        return super().to_isc(indent=indent)
+
+    def isc_items(self, child_indent: int) -> Generator:
+        """Yields the lines and child nodes of the declaration."""
+        for key, value in self.isc_attributes():
             if isinstance(value, list):
                 for item in value:
-                    attrs.append(item.to_isc(indent=child_indent))
+                    yield item
             elif all((isinstance(value, bool), key == 'authoritative')):
                 if value:
-                    attrs.append(f'{key};')
+                    yield f'{key};'
                 else:
-                    attrs.append(f'not {key};')
+                    yield f'not {key};'
             elif all((value, key != 'name')):
-                attrs.append(f'{" " * child_indent}{key} {value};')
-        return_str = (f'{" " * indent}{self.__str__()}' ' {')
-        if len(attrs) > 0:
-            return_str += '\n'
-        attrs_str = "\n".join(attrs)
-        section_end = '}'
-        return (f'{return_str}{attrs_str}' '\n' f'{" " * indent}{section_end}')
+                yield f'{" " * child_indent}{key} {value};'
 
 
-class Group(Parameters, SubnetMixin, SharedNetworkMixin, HostMixin,
-            OptionMixin):
+class Group(Parameters, SubnetMixin, AddressIndexMixin, SharedNetworkMixin,
+            HostMixin, OptionMixin, DeclarationMixin):
     """Represents an group declaration."""
     def __init__(
         self,
@@ -1910,25 +2044,22 @@ class Group(Parameters, SubnetMixin, SharedNetworkMixin, HostMixin,
             str: A string representation of the object tree from this level.
 
         """
-        attrs = []
-        child_indent = indent+4
-        for key, value in self.__dict__.items():
+        return super().to_isc(indent=indent)
+
+    def isc_items(self, child_indent: int) -> Generator:
+        """Yields the lines and child nodes of the declaration."""
+        for key, value in self.isc_attributes():
             if isinstance(value, list):
                 for item in value:
-                    attrs.append(item.to_isc(indent=child_indent))
+                    yield item
             elif value:
-                attrs.append(f'{" " * child_indent}{key} {value};')
-        return_str = (f'{" " * indent}{self.__str__()}' ' {')
-        if len(attrs) > 0:
-            return_str += '\n'
-        attrs_str = "\n".join(attrs)
-        section_end = '}'
-        return (f'{return_str}{attrs_str}' '\n' f'{" " * indent}{section_end}')
+                yield f'{" " * child_indent}{key} {value};'
 
 
 class Global(Parameters, Permissions, OptionMixin, SubnetMixin,
-             SharedNetworkMixin, GroupMixin, HostMixin, ClassMixin,
-             SubClassMixin, KeyMixin, ZoneMixin, IncludeMixin, EventMixin):
+             AddressIndexMixin, ConflictMixin, SharedNetworkMixin, GroupMixin,
+             HostMixin, ClassMixin, SubClassMixin, KeyMixin, ZoneMixin,
+             IncludeMixin, EventMixin, DeclarationMixin):
     """Represents the global dhcp server settings."""
     def __init__(
         self,
@@ -2029,6 +2160,7 @@ class Global(Parameters, Permissions, OptionMixin, SubnetMixin,
 
     def add_custom_option(self, option: CustomOption):
         self.custom_options.append(option)
+        self.attach(option)
 
     def find_custom_option(self, option):
         pass
@@ -2038,6 +2170,7 @@ class Global(Parameters, Permissions, OptionMixin, SubnetMixin,
 
     def add_option_expression(self, option: OptionExpression):
         self.option_expressions.append(option)
+        self.attach(option)
 
     def find_option_expression(self, option):
         pass
@@ -2056,7 +2189,30 @@ class Global(Parameters, Permissions, OptionMixin, SubnetMixin,
             str: A string representation of the object tree from this level.
 
         """
-        attrs = []
+        return super().to_isc()
+
+    def write_isc(self, fp: TextIO, indent: int = 0) -> None:
+        """Writes valid ISC configuration to a file object.
+
+        The global scope has no enclosing braces, its statements and
+        declarations are written one per line without indentation.
+
+        Args:
+            fp (file object): A text stream to write to.
+            indent (int): Not used, kept for a uniform signature.
+
+        """
+        separator = ''
+        for item in self.isc_items(0):
+            fp.write(separator)
+            separator = '\n'
+            if isinstance(item, str):
+                fp.write(item)
+            else:
+                item.write_isc(fp)
+
+    def isc_items(self, child_indent: int) -> Generator:
+        """Yields the lines and child nodes of the declaration."""
         sort_order = {
             'options': 1,
             'includes': 2,
@@ -2074,24 +2230,22 @@ class Global(Parameters, Permissions, OptionMixin, SubnetMixin,
             'events': 14
             }
         sorted_dict = sorted(
-            self.__dict__.items(), key=lambda x: sort_order.get(x[0], 0))
+            self.isc_attributes(), key=lambda x: sort_order.get(x[0], 0))
         for key, value in sorted_dict:
             new_key = key.replace("_", "-")
             if value and key == 'failover':
-                attrs.append(value.to_isc())
+                yield value
             elif all((isinstance(value, bool), key == 'authoritative')):
                 if value:
-                    attrs.append(f'{key};')
+                    yield f'{key};'
                 else:
-                    attrs.append(f'not {key};')
+                    yield f'not {key};'
             elif isinstance(value, list):
                 for item in value:
-                    attrs.append(item.to_isc())
+                    yield item
             elif isinstance(value, bool):
-                attrs.append(f'{new_key} {str(value).lower()};')
+                yield f'{new_key} {str(value).lower()};'
             elif value in ('deny', 'allow', 'ignore'):
-                attrs.append(f'{value} {new_key};')
+                yield f'{value} {new_key};'
             elif value:
-                attrs.append(f'{new_key} {value};')
-        attrs_str = "\n".join(attrs)
-        return (f'{attrs_str}')
+                yield f'{new_key} {value};'
@@ -12,10 +12,16 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import Generator, NamedTuple
+import mmap
+import os
+from functools import lru_cache
+from typing import (Callable, Collection, Dict, FrozenSet, Generator,
+                    Iterable, NamedTuple, TextIO, Tuple, Union)
 import re
+from pyisc.dhcpd.mixin import DeclarationMixin, StatementMixin
 from pyisc.dhcpd.nodes import Global
-from pyisc.dhcpd.utils import TokenProcessor
+from pyisc.dhcpd.utils import (CONTAINER_TYPES, SCOPE_TYPES, TOKEN_NODE_TYPES,
+                               TokenProcessor)
 
 
 class Token(NamedTuple):
@@ -27,6 +33,282 @@ class Token(NamedTuple):
     column: int
 
 
+class Span(NamedTuple):
+    """The position of a token in a buffer of encoded text."""
+
+    type: str
+    start: int
+    end: int
+    line: int
+    column: int
+
+
+TOKEN_SPECIFICATION = [
+    ('SHARED_NETWORK',      r'shared-network\s+[^\n]*?{'),
+    ('SUBNET4',             r'subnet\s+[^\n]*?{'),
+    ('SUBNET6',             r'subnet6\s+[^\n]*?{'),
+    ('POOL',                r'pool\s+[^\n]*?{'),
+    ('GROUP',               r'group\s+[^\n]*?{'),
+    ('HOST',                r'host\s+[^\n]*?{'),
+    ('SUBCLASS',            r'subclass\s+[^\n]*?({|;)'),
+    ('FAILOVER',            r'failover\s+[^\n]*?({|;)'),
+    ('DHCP_CLASS',          r'class\s+[^\n]*?{'),
+    ('SERVER_DUID_LL',      r'server-duid\s+LL[^\n]*?;'),
+    ('SERVER_DUID_EN',      r'server-duid\s+[^\n]*?;'),
+    ('HARDWARE',            r'hardware\s+[^\n]*?;'),
+    ('KEY',                 r'key\s+[^\n]*?({|;)'),
+    ('ZONE',                r'zone\s+[^\n]*?{'),
+    ('PRIMARY',             r'primary\s+[^\n]*?;'),
+    ('EVENT',               r'on\s+[^\n]*?{'),
+    ('EVENT_SET',           r'set\s+[^\n]*?=[^\n]*?;'),
+    ('EVENT_LOG',           r'log\([^\n]*?[^\n]*?;'),
+    ('EVENT_EXECUTE',       r'execute\([^\n]*?[^\n]*?;'),
+    ('OPTION',              r'option\s+[^\n=]*?;'),
+    ('RANGE4',              r'range\s+[^\n]*?;'),
+    ('RANGE6',              r'range6\s+[^\n]*?;'),
+    ('PREFIX6',             r'prefix6\s+[^\n]*?;'),
+    ('INCLUDE',             r'include\s+[^\n]*?;'),
+    ('FAILOVER_ROLE',       r'(primary|secondary);'),
+    ('AUTHORITATIVE',       r'(?:not\s+)?authoritative;'),
+    ('ALLOW_MEMBER',        r'allow\s+member[^\n]*?;'),
+    ('DENY_MEMBER',         r'deny\s+member[^\n]*?;'),
+    ('IGNORE_GENERAL',      r'ignore[^\n]*?;'),
+    ('ALLOW_GENERAL',       r'allow[^\n]*?;'),
+    ('DENY_GENERAL',        r'deny[^\n]*?;'),
+    ('CLASS_STATEMENT',     r'match\s+(?:if\s+)?[^\n]*?;'),
+    ('SPAWN_CLASS',         r'spawn\s+[^\n]*?;'),
+    ('CUSTOM_OPTION',       r'option\s+[^\n]*?code\s+\d+\s+=[^\n]*?;'),
+    ('OPTION_EXPRESSION',   r'option\s+[^\n]*?=[^\n]*?;'),
+    ('GENERAL_PARAMETER',   r'[\w]+\s*?[^\n]*?;'),
+    ('SCOPE_END',           r'}'),
+    ('COMMENT_UNIX',        r'\#.*'),
+    ('NEWLINE',             r'\n'),
+    ('WHITESPACE',          r'[ \t]+'),
+    ('MISMATCH',            r'.'),
+]
+TOKEN_REGEX = re.compile('|'.join(
+    '(?P<%s>%s)' % pair for pair in TOKEN_SPECIFICATION))
+WHITESPACE_REGEX = re.compile(r'\s+')
+# The same tokens matched in UTF-8 encoded text.
+BYTES_TOKEN_REGEX = re.compile(TOKEN_REGEX.pattern.encode('ascii'))
+# Tokens whose normalized value is always a single space.
+TRIVIA_TOKENS = ('NEWLINE', 'WHITESPACE')
+# Default number of characters read per chunk when parsing from a stream.
+CHUNK_SIZE = 1024 * 1024
+# Finds the braces of a block, skipping quoted strings and comments. Each
+# match first consumes the text up to the next quote, comment or brace, so
+# the pattern is tried once per such character rather than once per offset.
+BRACE_REGEX = re.compile(
+    r'[^"#{}]*(?:"(?:[^"\\\n]|\\.)*"|#[^\n]*|(?P<brace>[{}])|"|\Z)')
+# Attributes of a lazily parsed declaration that are available before its
+# block is parsed: the parent link and caches used when writing the tree,
+# and the sort key and bounds that subnets take from their declaration line.
+LAZY_ATTRIBUTES = frozenset((
+    '__class__', '_parent', '_isc_cache', '_digest', '_host_index',
+    '_address_index', 'to_isc', 'write_isc', '_sort_key', 'sort_key',
+    '_bounds', 'bounds'))
+# The tokens that may start with each leading word, in the order of
+# TOKEN_SPECIFICATION. A word is the run of letters a statement starts with,
+# so subnet6 is found under subnet and shared-network under shared.
+KEYWORD_TOKENS = {
+    'allow': ('ALLOW_MEMBER', 'ALLOW_GENERAL'),
+    'authoritative': ('AUTHORITATIVE',),
+    'class': ('DHCP_CLASS',),
+    'deny': ('DENY_MEMBER', 'DENY_GENERAL'),
+    'execute': ('EVENT_EXECUTE',),
+    'failover': ('FAILOVER',),
+    'group': ('GROUP',),
+    'hardware': ('HARDWARE',),
+    'host': ('HOST',),
+    'ignore': ('IGNORE_GENERAL',),
+    'include': ('INCLUDE',),
+    'key': ('KEY',),
+    'log': ('EVENT_LOG',),
+    'match': ('CLASS_STATEMENT',),
+    'not': ('AUTHORITATIVE',),
+    'on': ('EVENT',),
+    'option': ('OPTION', 'CUSTOM_OPTION', 'OPTION_EXPRESSION'),
+    'pool': ('POOL',),
+    'prefix': ('PREFIX6',),
+    'primary': ('PRIMARY', 'FAILOVER_ROLE'),
+    'range': ('RANGE4', 'RANGE6'),
+    'secondary': ('FAILOVER_ROLE',),
+    'server': ('SERVER_DUID_LL', 'SERVER_DUID_EN'),
+    'set': ('EVENT_SET',),
+    'shared': ('SHARED_NETWORK',),
+    'spawn': ('SPAWN_CLASS',),
+    'subclass': ('SUBCLASS',),
+    'subnet': ('SUBNET4', 'SUBNET6'),
+    'zone': ('ZONE',),
+}
+# Longer words that start with these keywords can still match the keyword
+# tokens, as nothing has to follow the keyword in their patterns.
+OPEN_KEYWORDS = ('allow', 'deny', 'ignore')
+# Skips the whitespace, newlines and comments in front of a token and
+# captures its leading word.
+LEADING_WORD_REGEX = re.compile(r'[ \t\n]*(?:\#.*[ \t\n]*)*([A-Za-z]*)')
+
+
+def token_regex(names: Tuple[str, ...]) -> re.Pattern:
+    """Returns the alternation of the named tokens and the fallbacks."""
+    patterns = dict(TOKEN_SPECIFICATION)
+    return re.compile('|'.join(
+        '(?P<%s>%s)' % (name, patterns[name])
+        for name in names + ('GENERAL_PARAMETER', 'MISMATCH')))
+
+
+KEYWORD_REGEXES = {word: token_regex(names)
+                   for word, names in KEYWORD_TOKENS.items()}
+PARAMETER_REGEX = token_regex(())
+
+
+def statement_boundary(buffer: str) -> int:
+    """
+    Return the offset just after the last line that ends a statement.
+
+    Tokens can only continue on the next line through the whitespace that
+    follows a keyword, so a line whose last non-whitespace character is one
+    of ';', '{' or '}' can never be part of a token on the following line.
+    Splitting the buffer after such a line is therefore safe.
+
+    Args:
+        buffer (str): A part of a configuration file.
+
+    Returns:
+        int: The offset to split the buffer at or 0 if there is none.
+
+    """
+    end = len(buffer)
+    while True:
+        newline = buffer.rfind('\n', 0, end)
+        if newline == -1:
+            return 0
+        index = newline - 1
+        while index >= 0 and buffer[index].isspace():
+            index -= 1
+        if index < 0:
+            return 0
+        if buffer[index] in ';{}':
+            return newline + 1
+        end = index
+
+
+def block_end(content: str, start: int) -> int:
+    """
+    Return the offset just after the brace that closes a block.
+
+    Args:
+        content (str): A configuration.
+        start (int): The offset just after the opening brace of the block.
+
+    Returns:
+        int: The offset after the closing brace or -1 if the block is not
+            closed.
+
+    """
+    depth = 1
+    for mo in BRACE_REGEX.finditer(content, start):
+        brace = mo.group('brace')
+        if brace is None:
+            continue
+        if brace == '{':
+            depth += 1
+        else:
+            depth -= 1
+            if not depth:
+                return mo.end()
+    return -1
+
+
+def parse_block(node: DeclarationMixin) -> None:
+    """
+    Parses the block of a lazily parsed declaration into the declaration.
+
+    The declaration gets back its own class, and the source text stays
+    cached as its ISC text until the declaration or one of its children
+    changes. The declaration is detached while its children are added, so
+    the caches of its ancestors are kept.
+
+    Args:
+        node (DeclarationMixin): A declaration returned by construct_tree
+            in lazy mode.
+
+    """
+    lazy_type = type(node)
+    _, text, line_num = object.__getattribute__(node, '_isc_cache')
+    parent = object.__getattribute__(node, '_parent')
+    object.__setattr__(node, '__class__', lazy_type.__bases__[0])
+    object.__setattr__(node, '_parent', None)
+    parser = DhcpdParser()
+    header_end = TOKEN_REGEX.match(text).end()
+    line_num += text.count('\n', 0, header_end)
+    parser.build_tree(parser.tokenize_content(text[header_end:-1], line_num),
+                      node)
+    object.__setattr__(node, '_parent', parent)
+    object.__setattr__(node, '_isc_cache', (0, text))
+
+
+def lazy_getattribute(node: DeclarationMixin, name: str):
+    """Parses the block of a lazy declaration before most lookups."""
+    if name not in LAZY_ATTRIBUTES:
+        parse_block(node)
+    return object.__getattribute__(node, name)
+
+
+def lazy_setattr(node: DeclarationMixin, name: str, value) -> None:
+    """Parses the block of a lazy declaration before an assignment."""
+    parse_block(node)
+    setattr(node, name, value)
+
+
+def lazy_eq(node: DeclarationMixin, other: object) -> bool:
+    """Parses the block of a lazy declaration before a comparison."""
+    parse_block(node)
+    return node == other
+
+
+@lru_cache(maxsize=None)
+def lazy_class(node_class: type) -> type:
+    """
+    Return the class of declarations of node_class whose block is unparsed.
+
+    The class adds no storage, so a declaration can switch between it and
+    node_class, and it has the name of node_class. It hashes by identity
+    like node_class, so hashing a declaration does not parse its block.
+    The source text of the block is kept in the ISC text cache of the
+    declaration, together with the line number the block starts on.
+    """
+    return type(node_class.__name__, (node_class,), {
+        '__slots__': (),
+        '__module__': node_class.__module__,
+        '__qualname__': node_class.__qualname__,
+        '__doc__': node_class.__doc__,
+        '__getattribute__': lazy_getattribute,
+        '__setattr__': lazy_setattr,
+        '__eq__': lazy_eq,
+        '__hash__': StatementMixin.__hash__,
+    })
+
+
+def node_types(types: Union[Collection[type], None]) -> Union[
+        FrozenSet[type], None]:
+    """
+    Return the node classes of a projection as a set.
+
+    Raises:
+        ValueError: If a class is not one the parser builds.
+
+    """
+    if types is None:
+        return None
+    types = frozenset(types)
+    unknown = types.difference(TOKEN_NODE_TYPES.values())
+    if unknown:
+        names = ', '.join(sorted(map(str, unknown)))
+        raise ValueError(f'The parser does not build {names}')
+    return types
+
+
 class DhcpdParser:
     """A parser for ISC DHCPD configs.
 
@@ -37,12 +319,17 @@ class DhcpdParser:
 
     """
 
-    def tokenize(self, content: str) -> Generator:
+    # Maps (node class, method name) to the resolved adder function.
+    _adders: Dict[Tuple[type, str], Union[Callable, None]] = {}
+
+    def tokenize(self, content: str, line_num: int = 1) -> Generator:
         """
         Return a generator of token objects.
 
         Args:
             content (str): A supplied string to turn into tokens.
+            line_num (int): The line number of the first line in content.
+                Default is 1.
 
         Returns:
             generator: A generator containing the tokens.
@@ -56,56 +343,14 @@ class DhcpdParser:
             line=1, column=0)
 
         """
-        token_specification = [
-            ('SHARED_NETWORK',      r'shared-network\s+[^\n]*?{'),
-            ('SUBNET4',             r'subnet\s+[^\n]*?{'),
-            ('SUBNET6',             r'subnet6\s+[^\n]*?{'),
-            ('POOL',                r'pool\s+[^\n]*?{'),
-            ('GROUP',               r'group\s+[^\n]*?{'),
-            ('HOST',                r'host\s+[^\n]*?{'),
-            ('SUBCLASS',            r'subclass\s+[^\n]*?({|;)'),
-            ('FAILOVER',            r'failover\s+[^\n]*?({|;)'),
-            ('DHCP_CLASS',          r'class\s+[^\n]*?{'),
-            ('SERVER_DUID_LL',      r'server-duid\s+LL[^\n]*?;'),
-            ('SERVER_DUID_EN',      r'server-duid\s+[^\n]*?;'),
-            ('HARDWARE',            r'hardware\s+[^\n]*?;'),
-            ('KEY',                 r'key\s+[^\n]*?({|;)'),
-            ('ZONE',                r'zone\s+[^\n]*?{'),
-            ('PRIMARY',             r'primary\s+[^\n]*?;'),
-            ('EVENT',               r'on\s+[^\n]*?{'),
-            ('EVENT_SET',           r'set\s+[^\n]*?=[^\n]*?;'),
-            ('EVENT_LOG',           r'log\([^\n]*?[^\n]*?;'),
-            ('EVENT_EXECUTE',       r'execute\([^\n]*?[^\n]*?;'),
-            ('OPTION',              r'option\s+[^\n=]*?;'),
-            ('RANGE4',              r'range\s+[^\n]*?;'),
-            ('RANGE6',              r'range6\s+[^\n]*?;'),
-            ('PREFIX6',             r'prefix6\s+[^\n]*?;'),
-            ('INCLUDE',             r'include\s+[^\n]*?;'),
-            ('FAILOVER_ROLE',       r'(primary|secondary);'),
-            ('AUTHORITATIVE',       r'(?:not\s+)?authoritative;'),
-            ('ALLOW_MEMBER',        r'allow\s+member[^\n]*?;'),
-            ('DENY_MEMBER',         r'deny\s+member[^\n]*?;'),
-            ('IGNORE_GENERAL',      r'ignore[^\n]*?;'),
-            ('ALLOW_GENERAL',       r'allow[^\n]*?;'),
-            ('DENY_GENERAL',        r'deny[^\n]*?;'),
-            ('CLASS_STATEMENT',     r'match\s+(?:if\s+)?[^\n]*?;'),
-            ('SPAWN_CLASS',         r'spawn\s+[^\n]*?;'),
-            ('CUSTOM_OPTION',       r'option\s+[^\n]*?code\s+\d+\s+=[^\n]*?;'),
-            ('OPTION_EXPRESSION',   r'option\s+[^\n]*?=[^\n]*?;'),
-            ('GENERAL_PARAMETER',   r'[\w]+\s*?[^\n]*?;'),
-            ('SCOPE_END',           r'}'),
-            ('COMMENT_UNIX',        r'\#.*'),
-            ('NEWLINE',             r'\n'),
-            ('WHITESPACE',          r'[ \t]+'),
-            ('MISMATCH',            r'.'),
-        ]
-        tok_regex = '|'.join(
-            '(?P<%s>%s)' % pair for pair in token_specification)
-        line_num = 1
+        normalize = WHITESPACE_REGEX.sub
         line_start = 0
-        for mo in re.finditer(tok_regex, content):
+        for mo in TOKEN_REGEX.finditer(content):
             kind = mo.lastgroup
-            value = re.sub(r'\s+', ' ', mo.group())
+            if kind in TRIVIA_TOKENS:
+                value = ' '
+            else:
+                value = normalize(' ', mo.group())
             column = mo.start() - line_start
             if kind == 'NEWLINE':
                 line_start = mo.end()
@@ -114,12 +359,278 @@ class DhcpdParser:
                 raise RuntimeError(f'{value!r} unexpected on line {line_num}')
             yield Token(kind, value, line_num, column)
 
-    def construct_tree(self, content: str) -> Global:
+    def tokenize_content(self, content: str, line_num: int = 1) -> Generator:
+        """
+        Return a generator of token objects without the trivia tokens.
+
+        Newlines, whitespace and comments are consumed by the scanner in
+        front of the token that follows them, so no tokens are created for
+        them. The leading word of each token selects the few patterns in
+        KEYWORD_TOKENS it can match, tried before the general parameter,
+        instead of trying every pattern of TOKEN_SPECIFICATION in turn, and
+        the tokens found are the ones tokenize finds. The line numbers are
+        found by counting the newlines between tokens, which includes
+        newlines inside a token such as a declaration whose brace is on the
+        next line. This is the mode used when constructing trees.
+
+        Args:
+            content (str): A supplied string to turn into tokens.
+            line_num (int): The line number of the first line in content.
+                Default is 1.
+
+        Returns:
+            generator: A generator containing the tokens.
+
+        Raises:
+            RuntimeError: If the content holds an unexpected character.
+
+        Examples:
+            >>> for token in parser.tokenize_content('group {\\n  # a\\n}'):
+            ...     token
+            Token(type='GROUP', value='group {', line=1, column=0)
+            Token(type='SCOPE_END', value='}', line=3, column=0)
+
+        """
+        normalize = WHITESPACE_REGEX.sub
+        count = content.count
+        rfind = content.rfind
+        leading_word = LEADING_WORD_REGEX.match
+        keyword_regex = KEYWORD_REGEXES.get
+        size = len(content)
+        line_start = 0
+        previous = 0
+        position = 0
+        while True:
+            mo = leading_word(content, position)
+            start = mo.start(1)
+            if start == size:
+                return
+            newlines = count('\n', previous, start)
+            if newlines:
+                line_num += newlines
+                line_start = rfind('\n', previous, start) + 1
+            previous = start
+            word = mo.group(1)
+            if word:
+                regex = keyword_regex(word)
+                if regex is None:
+                    regex = (TOKEN_REGEX if word.startswith(OPEN_KEYWORDS)
+                             else PARAMETER_REGEX)
+            elif content[start] == '}':
+                position = start + 1
+                yield Token('SCOPE_END', '}', line_num, start - line_start)
+                continue
+            else:
+                regex = PARAMETER_REGEX
+            mo = regex.match(content, start)
+            kind = mo.lastgroup
+            position = mo.end()
+            value = normalize(' ', mo.group())
+            if kind == 'MISMATCH':
+                raise RuntimeError(f'{value!r} unexpected on line {line_num}')
+            yield Token(kind, value, line_num, start - line_start)
+
+    def tokenize_stream(
+        self,
+        stream: TextIO,
+        chunk_size: int = CHUNK_SIZE
+    ) -> Generator:
+        """
+        Return a generator of token objects read from a text stream.
+
+        The stream is read in chunks of chunk_size characters. Each chunk is
+        tokenized up to the last line that ends a statement and the remainder
+        is carried over to the next chunk, so tokens crossing a chunk
+        boundary are kept intact and the whole content is never held in
+        memory.
+
+        Args:
+            stream (file object): A text stream opened for reading.
+            chunk_size (int): The number of characters read at a time.
+
+        Returns:
+            generator: A generator containing the tokens.
+
+        Examples:
+            >>> with open('dhcpd.conf', 'r') as infile:
+            ...     for token in parser.tokenize_stream(infile):
+            ...         token
+            Token(type='OPTION', value='option domain-name "example.org";',
+            line=1, column=0)
+
+        """
+        line_num = 1
+        pending = ''
+        for chunk in iter(lambda: stream.read(chunk_size), ''):
+            buffer = pending + chunk
+            boundary = statement_boundary(buffer)
+            if not boundary:
+                pending = buffer
+                continue
+            pending = buffer[boundary:]
+            for token in self.tokenize(buffer[:boundary], line_num):
+                yield token
+            # The last token is the NEWLINE that carries the next line number.
+            line_num = token.line
+        if pending:
+            yield from self.tokenize(pending, line_num)
+
+    def tokenize_bytes(self, buffer, line_num: int = 1) -> Generator:
+        """
+        Return a generator of the spans of the tokens in encoded text.
+
+        The tokens are matched in the bytes of the buffer, which may be a
+        memory mapped file, and are returned as offsets into it without
+        copying their text. Newlines, whitespace and comments are counted
+        for the line numbers but not returned.
+
+        Args:
+            buffer (bytes-like): UTF-8 encoded text, such as bytes or mmap.
+            line_num (int): The line number of the first line in buffer.
+                Default is 1.
+
+        Returns:
+            generator: A generator containing the spans.
+
+        Raises:
+            RuntimeError: If the buffer holds an unexpected character.
+
+        Examples:
+            >>> for span in parser.tokenize_bytes(b'group {\\n}\\n'):
+            ...     span
+            Span(type='GROUP', start=0, end=7, line=1, column=0)
+            Span(type='SCOPE_END', start=8, end=9, line=2, column=0)
+
+        """
+        line_start = 0
+        for mo in BYTES_TOKEN_REGEX.finditer(buffer):
+            kind = mo.lastgroup
+            if kind == 'NEWLINE':
+                line_start = mo.end()
+                line_num += 1
+            elif kind == 'MISMATCH':
+                value = mo.group().decode('utf-8', 'replace')
+                raise RuntimeError(f'{value!r} unexpected on line {line_num}')
+            elif kind not in ('WHITESPACE', 'COMMENT_UNIX'):
+                start, end = mo.span()
+                yield Span(kind, start, end, line_num, start - line_start)
+
+    def tokenize_projection(
+        self,
+        content: str,
+        include_types: Union[Collection[type], None] = None,
+        exclude_types: Union[Collection[type], None] = None,
+        line_num: int = 1
+    ) -> Generator:
+        """
+        Return a generator of the tokens of the selected declarations.
+
+        Declarations of a class in exclude_types are skipped together with
+        their blocks. When include_types is given, declarations of those
+        classes are kept with everything inside them except excluded
+        declarations. Subnets, shared networks, groups and pools are kept
+        as scopes so the selected declarations keep their place in the
+        tree, and so are the other declarations that may enclose an
+        included class, such as the hosts, classes and subclasses of
+        pyisc.dhcpd.nodes.Option. Everything else outside the selected
+        blocks is skipped.
+
+        Skipped blocks are passed over by counting braces and skipped
+        statements are matched but never turned into tokens, so no nodes
+        or tokens are created for them. Trivia tokens are left out.
+
+        Args:
+            content (str): A supplied string to turn into tokens.
+            include_types (collection): Node classes to build, such as
+                pyisc.dhcpd.nodes.Host. Default is all.
+            exclude_types (collection): Node classes to skip.
+            line_num (int): The line number of the first line in content.
+
+        Returns:
+            generator: A generator containing the tokens.
+
+        Raises:
+            ValueError: If a given class is not one the parser builds.
+
+        Examples:
+            >>> tokens = parser.tokenize_projection(
+            ...     'group {\\n  authoritative;\\n  host foo {\\n  }\\n}',
+            ...     include_types=[Host])
+            >>> [token.value for token in tokens]
+            ['group {', 'host foo {', '}', '}']
+
+        """
+        include = node_types(include_types)
+        exclude = node_types(exclude_types) or frozenset()
+        normalize = WHITESPACE_REGEX.sub
+        match = TOKEN_REGEX.match
+        selected = include is None
+        scopes = SCOPE_TYPES
+        if include:
+            scopes = scopes.union(*(
+                CONTAINER_TYPES.get(node_type, ()) for node_type in include))
+        stack = []
+        line_start = 0
+        position = 0
+        while position < len(content):
+            mo = match(content, position)
+            kind = mo.lastgroup
+            start = position
+            position = mo.end()
+            if kind == 'NEWLINE':
+                line_start = position
+                line_num += 1
+                continue
+            if kind in ('WHITESPACE', 'COMMENT_UNIX'):
+                continue
+            if kind == 'MISMATCH':
+                raise RuntimeError(
+                    f'{mo.group()!r} unexpected on line {line_num}')
+            if kind == 'SCOPE_END':
+                if stack:
+                    selected = stack.pop()
+                yield Token(kind, '}', line_num, start - line_start)
+                continue
+            node_type = TOKEN_NODE_TYPES.get(kind)
+            keep = node_type not in exclude and (
+                selected or node_type in include or node_type in scopes)
+            block = content[position - 1] == '{'
+            if not keep:
+                if block:
+                    end = block_end(content, position)
+                    if end < 0:
+                        raise RuntimeError(
+                            f'Block on line {line_num} is not closed')
+                    newline = content.rfind('\n', position, end)
+                    if newline >= 0:
+                        line_num += content.count('\n', position, end)
+                        line_start = newline + 1
+                    position = end
+                continue
+            if block:
+                stack.append(selected)
+                selected = selected or node_type in include
+            yield Token(kind, normalize(' ', mo.group()), line_num,
+                        start - line_start)
+
+    def construct_tree(
+        self,
+        content: str,
+        lazy: bool = False,
+        include_types: Union[Collection[type], None] = None,
+        exclude_types: Union[Collection[type], None] = None
+    ) -> Global:
         """
         Return an object tree of supplied string.
 
         Args:
             content (str): A supplied string to turn into tokens.
+            lazy (bool): Parse the blocks of top level declarations when
+                they are first used instead, see build_lazy_tree.
+            include_types (collection): Only build these node classes,
+                see tokenize_projection.
+            exclude_types (collection): Skip these node classes, see
+                tokenize_projection.
 
         Returns:
             Global: An object tree with the root of Global.
@@ -131,10 +642,118 @@ class DhcpdParser:
             >>> object_tree = parser.construct_tree(conf)
 
         """
-        node = Global()
+        if include_types is not None or exclude_types is not None:
+            if lazy:
+                raise ValueError(
+                    'Lazy parsing cannot be combined with a projection')
+            return self.build_tree(self.tokenize_projection(
+                content, include_types, exclude_types))
+        if lazy:
+            return self.build_lazy_tree(content)
+        return self.build_tree(self.tokenize_content(content))
+
+    def construct_tree_from_stream(
+        self,
+        stream: TextIO,
+        chunk_size: int = CHUNK_SIZE
+    ) -> Global:
+        """
+        Return an object tree of a supplied text stream.
+
+        Args:
+            stream (file object): A text stream opened for reading.
+            chunk_size (int): The number of characters read at a time.
+
+        Returns:
+            Global: An object tree with the root of Global.
+
+        Examples:
+            >>> parser = DhcpdParser()
+            >>> with open('dhcpd1.conf','r') as infile:
+            ...     object_tree = parser.construct_tree_from_stream(infile)
+
+        """
+        return self.build_tree(self.tokenize_stream(stream, chunk_size))
+
+    def construct_tree_from_bytes(self, buffer) -> Global:
+        """
+        Return an object tree of UTF-8 encoded text.
+
+        The buffer is tokenized with tokenize_bytes and only the text of
+        the tokens that make up nodes and values is decoded, the content
+        as a whole is never decoded.
+
+        Args:
+            buffer (bytes-like): UTF-8 encoded text, such as bytes or mmap.
+
+        Returns:
+            Global: An object tree with the root of Global.
+
+        """
+        normalize = WHITESPACE_REGEX.sub
+        tokens = (
+            Token('SCOPE_END', '}', span.line, span.column)
+            if span.type == 'SCOPE_END' else
+            Token(span.type, normalize(
+                ' ', str(buffer[span.start:span.end], 'utf-8')),
+                span.line, span.column)
+            for span in self.tokenize_bytes(buffer))
+        return self.build_tree(tokens)
+
+    def construct_tree_from_file(
+        self,
+        path: Union[str, os.PathLike]
+    ) -> Global:
+        """
+        Return an object tree of a configuration file read through mmap.
+
+        The file is mapped into memory and parsed with
+        construct_tree_from_bytes, so its pages are read by the operating
+        system as the tokenizer reaches them and may be dropped again from
+        the page cache, and the decoded text is never held in memory.
+
+        Args:
+            path (str): The path of a UTF-8 encoded configuration file.
+
+        Returns:
+            Global: An object tree with the root of Global.
+
+        Examples:
+            >>> parser = DhcpdParser()
+            >>> object_tree = parser.construct_tree_from_file('dhcpd.conf')
+
+        """
+        with open(path, 'rb') as infile:
+            if not os.fstat(infile.fileno()).st_size:
+                return Global()
+            with mmap.mmap(infile.fileno(), 0,
+                           access=mmap.ACCESS_READ) as buffer:
+                return self.construct_tree_from_bytes(buffer)
+
+    def build_tree(
+        self,
+        tokens: Iterable[Token],
+        node: Union[DeclarationMixin, None] = None
+    ) -> Global:
+        """
+        Return an object tree of supplied tokens.
+
+        Args:
+            tokens (iterable): Tokens as produced by one of the tokenize
+                methods.
+            node (DeclarationMixin): The declaration the tokens are added
+                to. Default is a new Global.
+
+        Returns:
+            Global: An object tree with the root of Global.
+
+        """
+        if node is None:
+            node = Global()
         node_stack = []
         processor = TokenProcessor()
-        for token in self.tokenize(content):
+        resolve_adder = self.resolve_adder
+        for token in tokens:
             if token.type in ('NEWLINE', 'WHITESPACE', 'COMMENT_UNIX'):
                 continue
             elif token.type == 'SCOPE_END':
@@ -142,15 +761,133 @@ class DhcpdParser:
             else:
                 # maybe value, attribute instead of declaration, method?
                 declaration, method = processor.switch(token)
-                if not hasattr(node, method):
-                    raise AttributeError(
-                        f'{node} attribute {method} does not exist')
-                node_method = getattr(node, method)
-                if callable(node_method):
-                    node_method(declaration)
+                adder = resolve_adder(node, method)
+                if adder:
+                    adder(node, declaration)
                 else:
                     setattr(node, method, declaration)
                 if token.value[-1] == '{':
                     node_stack.append(node)
                     node = declaration
         return node
+
+    def build_lazy_tree(self, content: str) -> Global:
+        """
+        Return an object tree whose top level blocks are parsed on first use.
+
+        Only the statements and declaration lines of the top level are
+        tokenized. The block of each top level declaration is found by
+        counting braces, and the declaration keeps the block as its source
+        text. Reading or assigning an attribute of the declaration parses
+        the block into it, while writing the tree returns the source text
+        of every block that has not changed, byte for byte.
+
+        Args:
+            content (str): A supplied string to turn into tokens.
+
+        Returns:
+            Global: An object tree with the root of Global.
+
+        Raises:
+            RuntimeError: If the top level holds an unexpected character or
+                a block that is not closed. Errors inside a block are raised
+                when the block is parsed.
+
+        Examples:
+            >>> parser = DhcpdParser()
+            >>> object_tree = parser.build_lazy_tree(
+            ...     'subnet 10.0.0.0 netmask 255.255.255.0 {\\n'
+            ...     '  range 10.0.0.10 10.0.0.20; # pool\\n}')
+            >>> print(object_tree.to_isc())
+            subnet 10.0.0.0 netmask 255.255.255.0 {
+              range 10.0.0.10 10.0.0.20; # pool
+            }
+            >>> object_tree.subnets[0].ranges
+            [Range4(start=10.0.0.10, end=10.0.0.20, dynamic_bootp=False)]
+
+        """
+        node = Global()
+        processor = TokenProcessor()
+        resolve_adder = self.resolve_adder
+        normalize = WHITESPACE_REGEX.sub
+        match = TOKEN_REGEX.match
+        line_num = 1
+        line_start = 0
+        position = 0
+        while position < len(content):
+            mo = match(content, position)
+            kind = mo.lastgroup
+            start = position
+            position = mo.end()
+            if kind == 'NEWLINE':
+                line_start = position
+                line_num += 1
+                continue
+            if kind in ('WHITESPACE', 'COMMENT_UNIX'):
+                continue
+            value = normalize(' ', mo.group())
+            if kind in ('MISMATCH', 'SCOPE_END'):
+                raise RuntimeError(f'{value!r} unexpected on line {line_num}')
+            token = Token(kind, value, line_num, start - line_start)
+            declaration, method = processor.switch(token)
+            adder = resolve_adder(node, method)
+            if adder:
+                adder(node, declaration)
+            else:
+                setattr(node, method, declaration)
+            if value[-1] != '{':
+                continue
+            end = block_end(content, position)
+            if end < 0:
+                raise RuntimeError(f'Block on line {line_num} is not closed')
+            text = content[start:end]
+            if isinstance(declaration, DeclarationMixin):
+                object.__setattr__(declaration, '__class__',
+                                   lazy_class(type(declaration)))
+                object.__setattr__(declaration, '_isc_cache',
+                                   (0, text, line_num))
+            else:
+                self.build_tree(self.tokenize_content(
+                    content[position:end - 1],
+                    line_num + content.count('\n', start, position)),
+                    declaration)
+            newline = text.rfind('\n')
+            if newline >= 0:
+                line_num += text.count('\n')
+                line_start = start + newline + 1
+            position = end
+        return node
+
+    def resolve_adder(self, node, method: str) -> Union[Callable, None]:
+        """
+        Return the function used to add a declaration to a node.
+
+        The lookup is resolved once per node class and method name and then
+        served from a cache shared by all parser instances.
+
+        Args:
+            node (object): The node that the declaration is added to.
+            method (str): The method or attribute name given by the
+                TokenProcessor.
+
+        Returns:
+            function: The unbound method to call with the node and the
+                declaration, or None if the declaration should be set as an
+                attribute.
+
+        Raises:
+            AttributeError: If the node has no such method or attribute.
+
+        """
+        key = (node.__class__, method)
+        try:
+            return self._adders[key]
+        except KeyError:
+            pass
+        if not hasattr(node, method):
+            raise AttributeError(
+                f'{node} attribute {method} does not exist')
+        class_attribute = getattr(node.__class__, method, None)
+        adder = class_attribute if callable(class_attribute) else None
+        self._adders[key] = adder
+        return adder
@@ -12,13 +12,52 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import Tuple
+from typing import Dict, Tuple
 from pyisc.dhcpd.nodes import (CustomOption, DhcpClass, Event, EventSet, Group,
                                Hardware, Host, Include, Key, Failover, Option,
                                OptionExpression, Pool4, Prefix6, Range4,
                                Range6, ServerDuidEN, ServerDuidLL, SubClass,
                                Subnet4, Subnet6, SharedNetwork, Zone)
 
+# The node class created for each token type. Other token types set plain
+# values on the enclosing node.
+TOKEN_NODE_TYPES = {
+    'SHARED_NETWORK': SharedNetwork,
+    'SUBNET4': Subnet4,
+    'SUBNET6': Subnet6,
+    'POOL': Pool4,
+    'GROUP': Group,
+    'HOST': Host,
+    'SUBCLASS': SubClass,
+    'FAILOVER': Failover,
+    'DHCP_CLASS': DhcpClass,
+    'SERVER_DUID_LL': ServerDuidLL,
+    'SERVER_DUID_EN': ServerDuidEN,
+    'HARDWARE': Hardware,
+    'KEY': Key,
+    'ZONE': Zone,
+    'EVENT': Event,
+    'EVENT_SET': EventSet,
+    'OPTION': Option,
+    'RANGE4': Range4,
+    'RANGE6': Range6,
+    'PREFIX6': Prefix6,
+    'INCLUDE': Include,
+    'CUSTOM_OPTION': CustomOption,
+    'OPTION_EXPRESSION': OptionExpression,
+}
+# Declarations that may enclose other declarations of the address space.
+SCOPE_TYPES = frozenset((SharedNetwork, Subnet4, Subnet6, Group, Pool4))
+# Other declarations that may enclose a node class in dhcpd.conf, by
+# enclosed class. Projections keep them as scopes, so a selected node is
+# never dropped together with the block holding it.
+CONTAINER_TYPES = {
+    Hardware: (Host,),
+    Key: (Zone,),
+    Option: (Host, DhcpClass, SubClass),
+    EventSet: (Event,),
+}
+
 
 class TokenProcessor:
     """A processor class for tokens.
@@ -53,7 +92,32 @@ class TokenProcessor:
 
         """
         self.token = token
-        return getattr(self, str(token.type).lower(), self.not_found)()
+        handler = self.dispatch_table().get(token.type)
+        if handler is None:
+            return self.not_found()
+        return handler(self)
+
+    @classmethod
+    def dispatch_table(cls) -> Dict:
+        """
+        Returns a mapping of token type to handler for the class.
+
+        The table is built on first use from the lowercase handler names and
+        stored on the class, so switch avoids a getattr per token.
+
+        Returns:
+            dict: Token type as key and the unbound handler as value.
+
+        """
+        table = cls.__dict__.get('_dispatch_table')
+        if table is None:
+            excluded = ('switch', 'not_found', 'dispatch_table')
+            table = {
+                name.upper(): getattr(cls, name) for name in dir(cls)
+                if not name.startswith('_') and name not in excluded
+                and callable(getattr(cls, name))}
+            cls._dispatch_table = table
+        return table
 
     def not_found(self):
         raise AttributeError(
@@ -0,0 +1,60 @@
+# Copyright 2021 Jonas Hallqvist
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Reads ISC dhcpd lease files.
+
+Enables reading the lease database dhcpd keeps in dhcpd.leases as a
+stream of compact lease records.
+
+Example:
+    >>> from pyisc import leases
+    >>> with open('data/dhcpd.leases', 'r') as leases_file:
+    ...     for lease in leases.iter_leases(leases_file):
+    ...         print(lease.ip, lease.binding_state)
+    110.31.40.13 active
+    103.32.10.93 active
+    10.0.1.1 free
+    ...
+
+    >>> with open('data/dhcpd.leases', 'r') as leases_file:
+    ...     table = leases.load(leases_file)
+    >>> table.get('10.0.1.3').hardware_address
+    '00:11:22:33:44:57'
+
+Attributes:
+    iter_leases (file object): Yields a Lease record for every lease block
+        of a dhcpd.leases text stream.
+    load (file object): Returns a LeaseTable with the newest lease of every
+        address of a dhcpd.leases text stream.
+    LeaseFollower (str): Reads only the leases appended to a dhcpd.leases
+        file since its previous poll.
+    utilization (pyisc.dhcpd.Global, file object): Returns the lease counts
+        and capacity of every IPv4 subnet, pool and shared network of a
+        configuration.
+
+"""
+
+__all__ = ['iter_leases', 'load', 'utilization', 'Lease', 'LeaseEntry',
+           'LeaseFollower', 'LeaseTable', 'LeaseUpdate', 'Utilization']
+__version__ = '0.1.0'
+__author__ = 'Jonas Hallqvist'
+
+from pyisc.leases.parsing import iter_leases, Lease
+from pyisc.leases.table import LeaseEntry, LeaseTable
+from pyisc.leases.follow import LeaseFollower, LeaseUpdate
+from pyisc.leases.report import table_utilization, utilization, Utilization
+
+
+def load(fp):
+    return LeaseTable.load(fp)
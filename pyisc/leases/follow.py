@@ -0,0 +1,161 @@
+# Copyright 2021 Jonas Hallqvist
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import os
+import time
+from typing import (AsyncGenerator, BinaryIO, Generator, NamedTuple, Tuple,
+                    Union)
+from pyisc.leases.parsing import Lease, iter_leases
+from pyisc.leases.table import LeaseTable
+
+
+class LeaseUpdate(NamedTuple):
+    """The leases read by a single poll of a LeaseFollower.
+
+    When reload is True the file was read from the start, because it is
+    polled for the first time or was replaced or truncated. Earlier state
+    should then be discarded, and the leases of the file are only applied
+    to the table of the follower, so leases is empty and reading a file of
+    any size does not hold its leases in memory.
+    """
+
+    reload: bool
+    leases: Tuple[Lease, ...]
+
+
+class LeaseFollower:
+    """Follows a dhcpd.leases file as dhcpd appends to it.
+
+    dhcpd only appends lease blocks to dhcpd.leases until it rewrites the
+    whole file, which it does by writing a new file and renaming the old one
+    to dhcpd.leases~. The follower remembers the inode of the file and the
+    offset after the last complete block, so each poll reads only the data
+    appended since. A new inode, or a file shorter than the offset, makes
+    the next poll read the file from the start.
+
+    The newest lease of every address is kept in table, which is replaced
+    on reloads.
+    """
+
+    def __init__(self, path: str, inode: Union[int, None] = None,
+                 offset: int = 0) -> None:
+        """Initialize the follower.
+
+        Args:
+            path (str): The path of the dhcpd.leases file.
+            inode (int): The inode of a previous follower, used together with
+                offset to continue where it stopped.
+            offset (int): The offset after the last block that was read.
+
+        """
+        self.path = path
+        self.inode = inode
+        self.offset = offset
+        self.table = LeaseTable()
+
+    def poll(self) -> LeaseUpdate:
+        """Return the leases appended since the previous poll.
+
+        The file is streamed line by line and only the complete blocks are
+        parsed, so memory use depends on the leases appended since the
+        previous poll but not on the size of the file.
+
+        Examples:
+            >>> follower = LeaseFollower('data/dhcpd.leases')
+            >>> follower.poll()
+            LeaseUpdate(reload=True, leases=())
+            >>> len(follower.table)
+            14
+            >>> follower.poll()
+            LeaseUpdate(reload=False, leases=())
+
+        Returns:
+            LeaseUpdate: The new leases in file order.
+
+        """
+        with open(self.path, 'rb') as leases_file:
+            status = os.fstat(leases_file.fileno())
+            reload = (status.st_ino != self.inode or
+                      status.st_size < self.offset)
+            if reload:
+                self.inode = status.st_ino
+                self.offset = 0
+            leases_file.seek(self.offset)
+            leases = iter_leases(self.complete_lines(leases_file))
+            if reload:
+                self.table = LeaseTable(leases)
+                leases = ()
+            else:
+                leases = tuple(leases)
+                self.table.update(leases)
+        return LeaseUpdate(reload, leases)
+
+    def complete_lines(self, leases_file: BinaryIO) -> Generator[
+            str, None, None]:
+        """Yields the lines of the complete blocks from the file position.
+
+        Top level statements and blocks are complete once their line, or
+        the line with their closing brace, ends with a newline. The lines of
+        a block are held back until it is complete, and offset is moved past
+        each complete block, so a block dhcpd has not finished writing is
+        read again by the next poll.
+        """
+        depth = 0
+        block = []
+        for line in leases_file:
+            if not line.endswith(b'\n'):
+                break
+            block.append(line)
+            stripped = line.strip()
+            if stripped.endswith(b'{'):
+                depth += 1
+            elif stripped == b'}':
+                depth -= 1
+            if depth <= 0:
+                depth = 0
+                self.offset += sum(map(len, block))
+                for item in block:
+                    yield item.decode('utf-8', 'replace')
+                block.clear()
+
+    def follow(self, interval: float = 60.0) -> Generator[
+            LeaseUpdate, None, None]:
+        """Yields an update every time the file has changed.
+
+        Args:
+            interval (float): Seconds to wait between polls.
+
+        Yields:
+            LeaseUpdate: The leases read by a poll that found new data.
+
+        """
+        while True:
+            update = self.poll()
+            if update.reload or update.leases:
+                yield update
+            time.sleep(interval)
+
+    async def follow_async(self, interval: float = 60.0) -> AsyncGenerator[
+            LeaseUpdate, None]:
+        """Yields an update every time the file has changed, see follow.
+
+        The file is read in the default executor of the event loop.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            update = await loop.run_in_executor(None, self.poll)
+            if update.reload or update.leases:
+                yield update
+            await asyncio.sleep(interval)
@@ -0,0 +1,223 @@
+# Copyright 2021 Jonas Hallqvist
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from calendar import timegm
+from functools import lru_cache
+from typing import Dict, Generator, Iterator, NamedTuple, TextIO, Tuple, Union
+
+
+class Lease(NamedTuple):
+    """A single lease block of a dhcpd.leases file.
+
+    Times are seconds since the epoch (UTC) and None when the statement is
+    missing or set to never. Quoted client hostnames and set values are
+    stored without their quotes, escapes are kept as written. The uid is
+    kept as written since dhcpd writes it either quoted or as hex octets.
+    """
+
+    ip: str
+    starts: Union[int, None] = None
+    ends: Union[int, None] = None
+    tstp: Union[int, None] = None
+    tsfp: Union[int, None] = None
+    atsfp: Union[int, None] = None
+    cltt: Union[int, None] = None
+    binding_state: Union[str, None] = None
+    next_binding_state: Union[str, None] = None
+    rewind_binding_state: Union[str, None] = None
+    hardware_type: Union[str, None] = None
+    hardware_address: Union[str, None] = None
+    uid: Union[str, None] = None
+    client_hostname: Union[str, None] = None
+    variables: Union[Dict[str, str], None] = None
+    events: Union[Dict[str, Tuple[str, ...]], None] = None
+    statements: Union[Tuple[str, ...], None] = None
+
+
+# All binding states dhcpd writes, the position is used as a compact code.
+BINDING_STATES = ('free', 'active', 'expired', 'released', 'abandoned',
+                  'reset', 'backup', 'reserved', 'bootp')
+# Shares a single string object per binding state between all records.
+BINDING_STATE_NAMES = {state: state for state in BINDING_STATES}
+
+TIME_STATEMENTS = frozenset(('starts', 'ends', 'tstp', 'tsfp', 'atsfp',
+                             'cltt'))
+
+
+@lru_cache(maxsize=4096)
+def epoch_day(date: str) -> int:
+    """Returns the epoch seconds of midnight UTC of a YYYY/MM/DD date."""
+    year, month, day = date.split('/')
+    return timegm((int(year), int(month), int(day), 0, 0, 0))
+
+
+def parse_time(value: str) -> Union[int, None]:
+    """Returns the epoch seconds of a lease time value.
+
+    Args:
+        value (str): The value of a time statement without the trailing
+            semicolon, in either of the formats dhcpd writes: 'W YYYY/MM/DD
+            HH:MM:SS', 'epoch N' or 'never'.
+
+    Returns:
+        int: Seconds since the epoch or None for never.
+
+    """
+    if value == 'never':
+        return None
+    weekday, rest = value.split(' ', 1)
+    if weekday == 'epoch':
+        return int(rest)
+    date, clock = rest.split(' ', 1)
+    hours, minutes, seconds = clock.split(':')
+    return (epoch_day(date) + int(hours) * 3600 + int(minutes) * 60 +
+            int(seconds))
+
+
+def unquote(value: str) -> str:
+    """Returns value without surrounding double quotes."""
+    if len(value) > 1 and value[0] == '"' and value[-1] == '"':
+        return value[1:-1]
+    return value
+
+
+def read_statement(line: str, lines: Iterator[str]) -> str:
+    """Returns a statement that may continue on the following lines."""
+    while not line.endswith((';', '{', '}')):
+        try:
+            line = f'{line} {next(lines).strip()}'
+        except StopIteration:
+            break
+    return line
+
+
+def skip_block(lines: Iterator[str]) -> None:
+    """Consumes lines up to the brace closing an already opened block."""
+    depth = 1
+    for line in lines:
+        line = line.strip()
+        if line.endswith('{'):
+            depth += 1
+        elif line == '}':
+            depth -= 1
+            if depth == 0:
+                return
+
+
+def read_event(lines: Iterator[str]) -> Tuple[str, ...]:
+    """Returns the statements of an on event block as written."""
+    statements = []
+    depth = 1
+    for line in lines:
+        line = line.strip()
+        if line.endswith('{'):
+            depth += 1
+        elif line == '}':
+            depth -= 1
+            if depth == 0:
+                break
+        if line:
+            statements.append(line)
+    return tuple(statements)
+
+
+def parse_lease(ip: str, lines: Iterator[str]) -> Lease:
+    """Parses the statements of a lease block up to its closing brace.
+
+    Args:
+        ip (str): The address given in the lease declaration.
+        lines (iterator): The remaining lines of the file.
+
+    Returns:
+        Lease: The lease record.
+
+    """
+    fields = {}
+    variables = None
+    events = None
+    statements = None
+    for line in lines:
+        line = line.strip()
+        if not line or line[0] == '#':
+            continue
+        if line == '}':
+            break
+        line = read_statement(line, lines)
+        keyword, _, rest = line.partition(' ')
+        if keyword in TIME_STATEMENTS:
+            fields[keyword] = parse_time(rest.split(';', 1)[0].strip())
+        elif keyword == 'binding':
+            state = rest[6:-1]
+            fields['binding_state'] = BINDING_STATE_NAMES.get(state, state)
+        elif keyword in ('next', 'rewind'):
+            state = rest[14:-1]
+            fields[f'{keyword}_binding_state'] = \
+                BINDING_STATE_NAMES.get(state, state)
+        elif keyword == 'hardware':
+            hardware_type, _, address = rest[:-1].partition(' ')
+            fields['hardware_type'] = hardware_type
+            fields['hardware_address'] = address
+        elif keyword == 'uid':
+            fields['uid'] = rest[:-1]
+        elif keyword == 'client-hostname':
+            fields['client_hostname'] = unquote(rest[:-1])
+        elif keyword == 'set':
+            name, _, value = rest[:-1].partition('=')
+            if variables is None:
+                variables = {}
+            variables[name.strip()] = unquote(value.strip())
+        elif keyword == 'on':
+            if events is None:
+                events = {}
+            events[rest[:-1].strip()] = read_event(lines)
+        else:
+            if statements is None:
+                statements = []
+            statements.append(line[:-1] if line.endswith(';') else line)
+            if line.endswith('{'):
+                skip_block(lines)
+    if statements is not None:
+        statements = tuple(statements)
+    return Lease(ip, variables=variables, events=events,
+                 statements=statements, **fields)
+
+
+def iter_leases(fp: TextIO) -> Generator[Lease, None, None]:
+    """Yields the lease blocks of a dhcpd.leases file one at a time.
+
+    The file is read line by line, so memory use does not depend on the
+    size of the file. The parser follows the layout dhcpd writes, with every
+    statement on a line of its own. Blocks other than IPv4 lease blocks,
+    such as failover state and IPv6 ia-na blocks, are skipped.
+
+    Args:
+        fp (file object): A text stream of a dhcpd.leases file.
+
+    Examples:
+        >>> with open('data/dhcpd.leases', 'r') as leases_file:
+        ...     lease = next(iter_leases(leases_file))
+        >>> lease.ip, lease.binding_state, lease.hardware_address
+        ('110.31.40.13', 'active', '54:ab:aa:36:b4:e1')
+
+    Yields:
+        Lease: A record for each lease block in file order.
+
+    """
+    lines = iter(fp)
+    for line in lines:
+        line = line.strip()
+        if line.startswith('lease ') and line.endswith('{'):
+            yield parse_lease(line[6:-1].strip(), lines)
+        elif line.endswith('{'):
+            skip_block(lines)
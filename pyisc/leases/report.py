@@ -0,0 +1,155 @@
+# Copyright 2021 Jonas Hallqvist
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from bisect import bisect_left, bisect_right
+from typing import Iterable, List, NamedTuple, TextIO, Tuple
+from pyisc.leases.parsing import BINDING_STATES
+from pyisc.leases.table import LeaseTable
+
+# The binding states counted by a utilization report.
+REPORTED_STATES = ('active', 'free', 'backup', 'abandoned')
+# The capacity and state counts of a scope without ranges.
+NO_COUNTS = (0,) * (len(REPORTED_STATES) + 1)
+
+
+class Utilization(NamedTuple):
+    """The lease counts of a subnet, pool or shared network.
+
+    Capacity is the number of addresses in the dynamic ranges of the scope.
+    The counts are the addresses in those ranges whose newest lease is in
+    the binding state.
+    """
+
+    scope: object
+    capacity: int
+    active: int
+    free: int
+    backup: int
+    abandoned: int
+
+
+class StateCounter:
+    """Counts leases per binding state in address intervals.
+
+    The addresses of every reported binding state are sorted once, after
+    which counting the leases of an interval takes two binary searches per
+    state.
+    """
+
+    def __init__(self, table: LeaseTable) -> None:
+        codes = {BINDING_STATES.index(state): [] for state in REPORTED_STATES}
+        for address, state in zip(table.addresses, table.states):
+            addresses = codes.get(state)
+            if addresses is not None:
+                addresses.append(address)
+        self.addresses = [sorted(codes[BINDING_STATES.index(state)])
+                          for state in REPORTED_STATES]
+
+    def count(self, ranges: Iterable) -> Tuple[int, ...]:
+        """Returns the capacity and state counts of IPv4 ranges."""
+        totals = list(NO_COUNTS)
+        for dhcp_range in ranges:
+            version, first, last = dhcp_range.bounds
+            if version != 4:
+                continue
+            totals[0] += last - first + 1
+            for index, addresses in enumerate(self.addresses, 1):
+                totals[index] += (bisect_right(addresses, last) -
+                                  bisect_left(addresses, first))
+        return tuple(totals)
+
+
+def add_counts(*counts: Tuple[int, ...]) -> Tuple[int, ...]:
+    """Returns the element wise sum of capacity and state counts."""
+    return tuple(sum(column) for column in zip(NO_COUNTS, *counts))
+
+
+def count_subnet(counter: StateCounter, subnet,
+                 report: List[Utilization]) -> Tuple[int, ...]:
+    """Adds a subnet and its pools to report and returns the subnet total."""
+    records = [Utilization(pool, *counter.count(pool.ranges))
+               for pool in subnet.pools]
+    total = add_counts(counter.count(subnet.ranges),
+                       *(record[1:] for record in records))
+    report.append(Utilization(subnet, *total))
+    report.extend(records)
+    return total
+
+
+def count_scope(counter: StateCounter, scope,
+                report: List[Utilization]) -> None:
+    """Adds the IPv4 subnets, pools and shared networks of scope to report."""
+    for subnet in getattr(scope, 'subnets', ()):
+        if subnet.sort_key[0]:
+            continue
+        count_subnet(counter, subnet, report)
+    for shared_network in getattr(scope, 'shared_networks', ()):
+        records = []
+        totals = [count_subnet(counter, subnet, records)
+                  for subnet in shared_network.subnets
+                  if not subnet.sort_key[0]]
+        pools = [Utilization(pool, *counter.count(pool.ranges))
+                 for pool in shared_network.pools]
+        totals.extend(record[1:] for record in pools)
+        report.append(Utilization(shared_network, *add_counts(*totals)))
+        report.extend(records)
+        report.extend(pools)
+    for group in getattr(scope, 'groups', ()):
+        count_scope(counter, group, report)
+
+
+def table_utilization(tree, table: LeaseTable) -> List[Utilization]:
+    """Return the utilization of the IPv4 scopes of a tree.
+
+    Args:
+        tree (pyisc.dhcpd.Global): The parsed dhcpd configuration.
+        table (LeaseTable): The newest lease of every address.
+
+    Returns:
+        list: A Utilization for every IPv4 subnet, pool and shared network
+            in tree order, each scope followed by the scopes it contains.
+
+    """
+    report = []
+    count_scope(StateCounter(table), tree, report)
+    return report
+
+
+def utilization(tree, fp: TextIO) -> List[Utilization]:
+    """Return the utilization of the IPv4 scopes of a tree.
+
+    Only the newest lease of every address in the lease file is counted.
+    A shared network counts the ranges of its subnets and of its own pools,
+    a subnet counts its own ranges and the ranges of its pools.
+
+    Args:
+        tree (pyisc.dhcpd.Global): The parsed dhcpd configuration.
+        fp (file object): A text stream of a dhcpd.leases file.
+
+    Examples:
+        >>> from pyisc import dhcpd
+        >>> tree = dhcpd.loads(
+        ...     'subnet 10.0.1.0 netmask 255.255.255.0 {\\n'
+        ...     '    range 10.0.1.1 10.0.1.100;\\n}\\n')
+        >>> with open('data/dhcpd.leases', 'r') as leases_file:
+        ...     record, = utilization(tree, leases_file)
+        >>> record.capacity, record.active, record.free
+        (100, 0, 3)
+
+    Returns:
+        list: A Utilization for every IPv4 subnet, pool and shared network
+            in tree order, each scope followed by the scopes it contains.
+
+    """
+    return table_utilization(tree, LeaseTable.load(fp))
@@ -0,0 +1,299 @@
+# Copyright 2021 Jonas Hallqvist
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from array import array
+from socket import inet_aton, inet_ntoa
+from typing import Generator, Iterable, NamedTuple, TextIO, Union
+from pyisc.leases.parsing import BINDING_STATES, Lease, iter_leases
+
+# Stored in the time columns for missing times and times set to never.
+NO_TIME = -1
+# Stored in the binding state column when the state is missing or unknown.
+NO_STATE = -1
+# Stored in the hardware column when a lease has no usable MAC address,
+# it lies outside the 48 bits of a MAC address.
+NO_MAC = 1 << 48
+# Marks an unused slot in the hash tables.
+EMPTY = -1
+
+BINDING_STATE_CODES = {
+    state: code for code, state in enumerate(BINDING_STATES)}
+HASH_MULTIPLIER = 0x9E3779B97F4A7C15
+HASH_MASK = (1 << 64) - 1
+
+
+class LeaseEntry(NamedTuple):
+    """The columns of a single address in a LeaseTable."""
+
+    ip: str
+    starts: Union[int, None]
+    ends: Union[int, None]
+    cltt: Union[int, None]
+    binding_state: Union[str, None]
+    hardware_address: Union[str, None]
+
+
+def address_to_int(address: str) -> int:
+    """Returns an IPv4 address as an unsigned 32 bit integer."""
+    return int.from_bytes(inet_aton(address), 'big')
+
+
+def int_to_address(number: int) -> str:
+    """Returns the dotted quad of an unsigned 32 bit integer."""
+    return inet_ntoa(number.to_bytes(4, 'big'))
+
+
+def mac_to_int(address: Union[str, None]) -> int:
+    """Returns a colon separated MAC address as a 48 bit integer.
+
+    Addresses with missing zero padding are accepted. Anything that is not
+    six hexadecimal octets returns NO_MAC.
+    """
+    if not address:
+        return NO_MAC
+    octets = address.split(':')
+    if len(octets) != 6:
+        return NO_MAC
+    try:
+        number = 0
+        for octet in octets:
+            number = (number << 8) | int(octet, 16)
+    except ValueError:
+        return NO_MAC
+    return number
+
+
+def int_to_mac(number: int) -> str:
+    """Returns a 48 bit integer as a lower case MAC address."""
+    return ':'.join(f'{octet:02x}' for octet in number.to_bytes(6, 'big'))
+
+
+class LeaseTable:
+    """The newest lease of every IPv4 address of a dhcpd.leases file.
+
+    dhcpd appends a lease block every time a lease changes, so the last
+    block of an address in the file is the current one. The table keeps one
+    row per address in typed arrays: addresses as uint32, starts, ends and
+    cltt as epoch seconds, binding states as small integer codes and
+    hardware addresses as 48 bit integers. Rows are found through two open
+    addressing hash tables, keyed by address and by MAC address, which hold
+    row numbers in arrays as well. No Python object is kept per lease.
+
+    Lease blocks of IPv6 addresses are not part of the table.
+    """
+
+    def __init__(self, leases: Iterable[Lease] = ()) -> None:
+        """Initialize the columns and load leases.
+
+        Args:
+            leases (iterable[pyisc.leases.Lease]): Lease records in file
+                order.
+
+        """
+        self.addresses = array('I')
+        self.starts = array('q')
+        self.ends = array('q')
+        self.cltts = array('q')
+        self.states = array('b')
+        self.macs = array('Q')
+        self.bits = 0
+        self.address_slots = array('i')
+        self.mac_slots = array('i')
+        self.mac_slots_used = 0
+        self.resize(16)
+        self.update(leases)
+
+    @classmethod
+    def load(cls, fp: TextIO) -> 'LeaseTable':
+        """Returns a table of the leases in a dhcpd.leases text stream."""
+        return cls(iter_leases(fp))
+
+    def __len__(self) -> int:
+        return len(self.addresses)
+
+    def __contains__(self, ip: str) -> bool:
+        return self.find_row(address_to_int(ip)) != EMPTY
+
+    def __iter__(self) -> Generator[LeaseEntry, None, None]:
+        for row in range(len(self.addresses)):
+            yield self.entry(row)
+
+    def slot(self, key: int) -> int:
+        """Returns the first slot to probe for key."""
+        return ((key * HASH_MULTIPLIER) & HASH_MASK) >> (64 - self.bits)
+
+    def resize(self, bits: int) -> None:
+        """Rebuilds both hash tables with 2 ** bits slots.
+
+        The MAC table keeps the row each MAC address currently resolves to,
+        which is not necessarily the last row holding that MAC address.
+        """
+        macs = self.macs
+        newest = array('i', (EMPTY if mac == NO_MAC else self.find_mac(mac)
+                             for mac in macs))
+        self.bits = bits
+        self.address_slots = array('i', [EMPTY]) * (1 << bits)
+        self.mac_slots = array('i', [EMPTY]) * (1 << bits)
+        self.mac_slots_used = 0
+        for row, address in enumerate(self.addresses):
+            self.insert_address(address, row)
+        for row, newest_row in enumerate(newest):
+            if newest_row != EMPTY:
+                self.insert_mac(macs[row], newest_row)
+
+    def insert_address(self, key: int, row: int) -> None:
+        """Points the first free slot on the probe path of key at row."""
+        slots = self.address_slots
+        mask = len(slots) - 1
+        slot = self.slot(key)
+        while slots[slot] != EMPTY:
+            slot = (slot + 1) & mask
+        slots[slot] = row
+
+    def find_row(self, key: int) -> int:
+        """Returns the row of an integer address or EMPTY."""
+        slots = self.address_slots
+        addresses = self.addresses
+        mask = len(slots) - 1
+        slot = self.slot(key)
+        while True:
+            row = slots[slot]
+            if row == EMPTY or addresses[row] == key:
+                return row
+            slot = (slot + 1) & mask
+
+    def update(self, leases: Iterable[Lease]) -> None:
+        """Applies lease records in file order, the last one wins.
+
+        Args:
+            leases (iterable[pyisc.leases.Lease]): Lease records, such as the
+                ones yielded by iter_leases.
+
+        """
+        for lease in leases:
+            try:
+                key = address_to_int(lease.ip)
+            except OSError:
+                continue
+            mac = mac_to_int(lease.hardware_address)
+            row = self.find_row(key)
+            if row == EMPTY:
+                row = len(self.addresses)
+                if (row + 1) * 2 > len(self.address_slots):
+                    self.resize(self.bits + 1)
+                self.addresses.append(key)
+                self.starts.append(NO_TIME)
+                self.ends.append(NO_TIME)
+                self.cltts.append(NO_TIME)
+                self.states.append(NO_STATE)
+                self.macs.append(NO_MAC)
+                self.insert_address(key, row)
+            self.starts[row] = NO_TIME if lease.starts is None else \
+                lease.starts
+            self.ends[row] = NO_TIME if lease.ends is None else lease.ends
+            self.cltts[row] = NO_TIME if lease.cltt is None else lease.cltt
+            self.states[row] = BINDING_STATE_CODES.get(
+                lease.binding_state, NO_STATE)
+            self.macs[row] = mac
+            if mac != NO_MAC:
+                self.insert_mac(mac, row)
+
+    def insert_mac(self, mac: int, row: int) -> None:
+        """Points the MAC hash table at the newest row of mac.
+
+        The slot already holding row or another row of mac is reused. A slot
+        whose row has since changed to another MAC address stays in place
+        and is skipped by lookups, until the table is compacted once used
+        slots fill more than half of it.
+        """
+        slots = self.mac_slots
+        macs = self.macs
+        mask = len(slots) - 1
+        slot = self.slot(mac)
+        while True:
+            current = slots[slot]
+            if current == EMPTY:
+                self.mac_slots_used += 1
+                break
+            if current == row or macs[current] == mac:
+                break
+            slot = (slot + 1) & mask
+        slots[slot] = row
+        if self.mac_slots_used * 2 > len(slots):
+            self.resize(self.bits)
+
+    def entry(self, row: int) -> LeaseEntry:
+        """Returns the columns of a row as a LeaseEntry."""
+        state = self.states[row]
+        mac = self.macs[row]
+        return LeaseEntry(
+            ip=int_to_address(self.addresses[row]),
+            starts=None if self.starts[row] == NO_TIME else self.starts[row],
+            ends=None if self.ends[row] == NO_TIME else self.ends[row],
+            cltt=None if self.cltts[row] == NO_TIME else self.cltts[row],
+            binding_state=None if state == NO_STATE else BINDING_STATES[state],
+            hardware_address=None if mac == NO_MAC else int_to_mac(mac))
+
+    def get(self, ip: str) -> Union[LeaseEntry, None]:
+        """Return the newest lease of an IPv4 address.
+
+        Args:
+            ip (str): The IPv4 address.
+
+        Examples:
+            >>> with open('data/dhcpd.leases', 'r') as leases_file:
+            ...     table = LeaseTable.load(leases_file)
+            >>> table.get('10.0.1.3').starts
+            1431656221
+
+        Returns:
+            LeaseEntry: The lease or None if the address has no lease.
+
+        """
+        row = self.find_row(address_to_int(ip))
+        return None if row == EMPTY else self.entry(row)
+
+    def find_by_mac(self, mac: str) -> Union[LeaseEntry, None]:
+        """Return the newest lease that is held by a MAC address.
+
+        A MAC address that has since moved to a lease of another address
+        returns that newer lease. A MAC address whose only lease was taken
+        over by another client returns None.
+
+        Args:
+            mac (str): The hardware address, in any letter case or padding.
+
+        Returns:
+            LeaseEntry: The lease or None if the address holds no lease.
+
+        """
+        key = mac_to_int(mac)
+        if key == NO_MAC:
+            return None
+        row = self.find_mac(key)
+        return None if row == EMPTY else self.entry(row)
+
+    def find_mac(self, key: int) -> int:
+        """Returns the row an integer MAC address resolves to or EMPTY."""
+        slots = self.mac_slots
+        if not slots:
+            return EMPTY
+        macs = self.macs
+        mask = len(slots) - 1
+        slot = self.slot(key)
+        while True:
+            row = slots[slot]
+            if row == EMPTY or macs[row] == key:
+                return row
+            slot = (slot + 1) & mask
@@ -0,0 +1,106 @@
+import io
+import unittest
+from pyisc import dhcpd
+from pyisc.dhcpd import nodes
+from pyisc.dhcpd.binary import (FORMAT_VERSION, HEADER_SIZE, MAGIC,
+                                decode_tree, encode_tree)
+
+CONFIG = (
+    'authoritative;\n'
+    'default-lease-time 600;\n'
+    'option domain-name "example.org";\n'
+    'subnet 10.0.0.0 netmask 255.255.255.0 {\n'
+    '    range 10.0.0.10 10.0.0.20;\n'
+    '    option routers 10.0.0.1;\n'
+    '    pool {\n'
+    '        allow members of "foo";\n'
+    '        range 10.0.0.100 10.0.0.200;\n    }\n}\n'
+    'subnet6 2001:db8::/64 {\n'
+    '    range6 2001:db8::100 2001:db8::200;\n}\n'
+    'shared-network office {\n'
+    '    subnet 10.2.0.0 netmask 255.255.0.0 {\n'
+    '        max-lease-time 7200;\n    }\n}\n'
+    'group {\n'
+    '    host foo {\n'
+    '        hardware ethernet 0:1:2:3:4:5;\n'
+    '        fixed-address 10.0.0.5;\n    }\n'
+    '    host bar {\n'
+    '        fixed-address bar.example.org;\n    }\n}\n')
+
+
+class TestBinaryFormat(unittest.TestCase):
+    def setUp(self):
+        self.tree = dhcpd.loads(CONFIG)
+
+    def test_round_trip(self):
+        copy = decode_tree(encode_tree(self.tree))
+        self.assertEqual(dhcpd.dumps(copy), dhcpd.dumps(self.tree))
+        self.assertEqual(copy, self.tree)
+        with open('tests/data/dhcpd-classes.conf', 'r') as infile:
+            tree = dhcpd.loads(infile.read())
+        self.assertEqual(dhcpd.dumps(decode_tree(encode_tree(tree))),
+                         dhcpd.dumps(tree))
+
+    def test_dump_and_load_functions(self):
+        buffer = io.BytesIO()
+        dhcpd.dump_binary(self.tree, buffer)
+        self.assertTrue(buffer.getvalue().startswith(MAGIC))
+        buffer.seek(0)
+        self.assertEqual(dhcpd.load_binary(buffer), self.tree)
+
+    def test_addresses_are_packed(self):
+        data = encode_tree(self.tree)
+        self.assertNotIn(b'10.0.0.5', data)
+        self.assertNotIn(b'2001:db8::100', data)
+        self.assertIn(b'bar.example.org', data)
+
+    def test_decoded_tree_is_usable(self):
+        copy = decode_tree(encode_tree(self.tree))
+        host = copy.find_host(mac='00:01:02:03:04:05')
+        self.assertEqual(host.name, 'foo')
+        host.fixed_address = '10.0.0.6'
+        self.assertIs(copy.find_host(ip='10.0.0.6'), host)
+        self.assertIn('fixed-address 10.0.0.6;', dhcpd.dumps(copy))
+        self.assertEqual(copy.subnets[0].capacity, 256)
+        copy.subnets[0].max_lease_time = 900
+        self.assertNotEqual(copy, self.tree)
+        self.assertEqual(len(dhcpd.diff(self.tree, copy)), 2)
+
+    def test_decoded_tree_edits(self):
+        dhcpd.dumps(self.tree)
+        copy = decode_tree(encode_tree(self.tree))
+        dhcpd.dumps(copy)
+        copy.groups[0].hosts[0].hardware.address = '9:9:9:9:9:9'
+        copy.subnets[0].pools[0].ranges[0].end = '10.0.0.210'
+        text = dhcpd.dumps(copy)
+        self.assertIn('hardware ethernet 9:9:9:9:9:9;', text)
+        self.assertIn('range 10.0.0.100 10.0.0.210;', text)
+
+    def test_rejects_other_data(self):
+        data = encode_tree(self.tree)
+        with self.assertRaises(ValueError):
+            decode_tree(b'not a tree')
+        newer = MAGIC + (FORMAT_VERSION + 1).to_bytes(2, 'little')
+        with self.assertRaises(ValueError):
+            decode_tree(newer + data[len(newer):])
+
+    def test_rejects_malformed_data(self):
+        data = encode_tree(self.tree)
+        for size in range(HEADER_SIZE, len(data), 7):
+            with self.assertRaises(ValueError):
+                decode_tree(data[:size])
+        with self.assertRaises(ValueError):
+            decode_tree(data + b'\0')
+        # The string table starts with its count, point it past the end.
+        count = len(data) // 4
+        with self.assertRaises(ValueError):
+            decode_tree(data[:HEADER_SIZE] + count.to_bytes(4, 'little') +
+                        data[HEADER_SIZE + 4:])
+
+    def test_rejects_shared_nodes(self):
+        tree = nodes.Global()
+        option = nodes.Option(name='routers', value='10.0.0.1')
+        tree.add_option(option)
+        tree.add_option(option)
+        with self.assertRaises(ValueError):
+            encode_tree(tree)
@@ -0,0 +1,133 @@
+import io
+import os
+import pickle
+import tempfile
+import unittest
+from unittest import mock
+from pyisc import dhcpd
+from pyisc.dhcpd.cache import ENTRY_SUFFIX, FINGERPRINT_SUFFIX, ParseCache
+
+CONFIG = (
+    'option domain-name "example.org";\n'
+    'subnet 10.0.0.0 netmask 255.255.255.0 {\n'
+    '    range 10.0.0.10 10.0.0.20;\n}\n'
+    'group {\n'
+    '    host foo {\n'
+    '        hardware ethernet 0:1:2:3:4:5;\n'
+    '        fixed-address 10.0.0.5;\n    }\n}\n')
+
+
+class TestParseCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.cache_dir = os.path.join(self.directory.name, 'cache')
+        self.path = os.path.join(self.directory.name, 'dhcpd.conf')
+        self.write(CONFIG)
+
+    def write(self, content, age=60):
+        with open(self.path, 'w') as outfile:
+            outfile.write(content)
+        modified = os.stat(self.path).st_mtime - age
+        os.utime(self.path, (modified, modified))
+
+    def entries(self):
+        return sorted(name for name in os.listdir(self.cache_dir)
+                      if name.endswith(ENTRY_SUFFIX))
+
+    def fingerprints(self):
+        return sorted(name for name in os.listdir(self.cache_dir)
+                      if name.endswith(FINGERPRINT_SUFFIX))
+
+    def test_pickle_round_trip(self):
+        tree = dhcpd.loads(CONFIG)
+        copy = pickle.loads(pickle.dumps(tree))
+        self.assertEqual(copy, tree)
+        self.assertEqual(dhcpd.dumps(copy), dhcpd.dumps(tree))
+        self.assertEqual(copy.find_host(mac='0:1:2:3:4:5').name, 'foo')
+        self.assertIs(copy.lookup_address('10.0.0.15')[-1], copy.subnets[0])
+
+    def test_pickled_tree_edits(self):
+        tree = dhcpd.loads(CONFIG)
+        dhcpd.dumps(tree)
+        copy = pickle.loads(pickle.dumps(tree))
+        dhcpd.dumps(copy)
+        copy.groups[0].hosts[0].hardware.address = '9:9:9:9:9:9'
+        copy.subnets[0].ranges[0].end = '10.0.0.30'
+        text = dhcpd.dumps(copy)
+        self.assertIn('hardware ethernet 9:9:9:9:9:9;', text)
+        self.assertIn('range 10.0.0.10 10.0.0.30;', text)
+
+    def test_hit(self):
+        tree = dhcpd.load(self.path, cache_dir=self.cache_dir)
+        self.assertEqual(dhcpd.dumps(tree), dhcpd.dumps(dhcpd.loads(CONFIG)))
+        self.assertEqual(len(self.entries()), 1)
+        with mock.patch.object(dhcpd.DhcpdParser, 'build_tree',
+                               side_effect=AssertionError):
+            cached = dhcpd.load(self.path, cache_dir=self.cache_dir)
+        self.assertIsNot(cached, tree)
+        self.assertEqual(cached, tree)
+
+    def test_cached_tree_edits(self):
+        dhcpd.load(self.path, cache_dir=self.cache_dir)
+        tree = dhcpd.load(self.path, cache_dir=self.cache_dir)
+        dhcpd.dumps(tree)
+        tree.groups[0].hosts[0].hardware.address = '9:9:9:9:9:9'
+        tree.subnets[0].ranges[0].end = '10.0.0.30'
+        text = dhcpd.dumps(tree)
+        self.assertIn('hardware ethernet 9:9:9:9:9:9;', text)
+        self.assertIn('range 10.0.0.10 10.0.0.30;', text)
+
+    def test_modified_file(self):
+        dhcpd.load(self.path, cache_dir=self.cache_dir)
+        self.write(CONFIG.replace('10.0.0.20', '10.0.0.30'), age=0)
+        tree = dhcpd.load(self.path, cache_dir=self.cache_dir)
+        self.assertEqual(tree.subnets[0].ranges[0].end, '10.0.0.30')
+        self.assertEqual(len(self.entries()), 2)
+
+    def test_broken_entry(self):
+        dhcpd.load(self.path, cache_dir=self.cache_dir)
+        entry, = self.entries()
+        with open(os.path.join(self.cache_dir, entry), 'wb') as outfile:
+            outfile.write(b'broken')
+        tree = dhcpd.load(self.path, cache_dir=self.cache_dir)
+        self.assertEqual(tree, dhcpd.loads(CONFIG))
+
+    def test_eviction(self):
+        cache = ParseCache(self.cache_dir)
+        cache.load(self.path)
+        entry_size = os.path.getsize(
+            os.path.join(self.cache_dir, self.entries()[0]))
+        cache.max_size = entry_size * 5 // 2
+        first = self.entries()
+        self.write(CONFIG + 'authoritative;\n')
+        cache.load(self.path)
+        self.write(CONFIG + 'not authoritative;\n')
+        entry = os.path.join(self.cache_dir, first[0])
+        os.utime(entry, (0, 0))
+        cache.load(self.path)
+        entries = self.entries()
+        self.assertEqual(len(entries), 2)
+        self.assertNotIn(first[0], entries)
+
+    def test_eviction_removes_fingerprints(self):
+        cache = ParseCache(self.cache_dir)
+        cache.load(self.path)
+        entry, = self.entries()
+        fingerprint, = self.fingerprints()
+        entry_size = os.path.getsize(os.path.join(self.cache_dir, entry))
+        cache.max_size = entry_size * 3 // 2
+        os.utime(os.path.join(self.cache_dir, entry), (0, 0))
+        self.path = os.path.join(self.directory.name, 'other.conf')
+        self.write(CONFIG + 'authoritative;\n')
+        cache.load(self.path)
+        self.assertNotIn(entry, self.entries())
+        self.assertEqual(len(self.entries()), 1)
+        fingerprints = self.fingerprints()
+        self.assertNotIn(fingerprint, fingerprints)
+        self.assertEqual(len(fingerprints), 1)
+
+    def test_stream(self):
+        tree = dhcpd.load(io.StringIO(CONFIG), cache_dir=self.cache_dir)
+        self.assertEqual(tree, dhcpd.loads(CONFIG))
+        self.assertFalse(os.path.exists(self.cache_dir))
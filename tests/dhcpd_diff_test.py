@@ -0,0 +1,76 @@
+import unittest
+from pyisc import dhcpd
+from pyisc.dhcpd import nodes
+
+CONFIG = (
+    'option domain-name "example.org";\n'
+    'subnet 10.0.0.0 netmask 255.255.255.0 {\n'
+    '    range 10.0.0.10 10.0.0.20;\n'
+    '    option routers 10.0.0.1;\n}\n'
+    'shared-network office {\n'
+    '    subnet 10.2.0.0 netmask 255.255.0.0 {\n    }\n}\n'
+    'group {\n'
+    '    host foo {\n'
+    '        hardware ethernet 0:1:2:3:4:5;\n'
+    '        fixed-address 10.0.0.5;\n    }\n'
+    '    host bar {\n'
+    '        fixed-address 10.0.0.6;\n    }\n}\n'
+    'class "voip" {\n'
+    '    match if substring(hardware, 1, 3) = 00:01:02;\n}\n')
+
+
+class TestDiff(unittest.TestCase):
+    def setUp(self):
+        self.old = dhcpd.loads(CONFIG)
+        self.new = dhcpd.loads(CONFIG)
+
+    def changes(self):
+        return [(change.action, change.path, change.attributes)
+                for change in dhcpd.diff(self.old, self.new)]
+
+    def test_equal_trees(self):
+        self.assertEqual(dhcpd.diff(self.old, self.new), [])
+        dhcpd.dumps(self.old)
+        dhcpd.dumps(self.new)
+        self.assertEqual(dhcpd.diff(self.old, self.new), [])
+
+    def test_modified_attributes(self):
+        subnet = self.new.subnets[0]
+        subnet.default_lease_time = 600
+        subnet.ranges[0].end = '10.0.0.30'
+        subnet.options[0].value = '10.0.0.254'
+        self.new.groups[0].hosts[1].fixed_address = '10.0.0.7'
+        subnet_key = ('Subnet4', '10.0.0.0/24')
+        self.assertEqual(self.changes(), [
+            ('modified', (subnet_key,), {'default_lease_time': (None, 600)}),
+            ('modified', (subnet_key, ('Option', 'routers', None)),
+             {'value': ('10.0.0.1', '10.0.0.254')}),
+            ('modified', (subnet_key, ('Range4', '10.0.0.10')),
+             {'end': ('10.0.0.20', '10.0.0.30')}),
+            ('modified', (('Group', 0), ('Host', 'bar')),
+             {'fixed_address': ('10.0.0.6', '10.0.0.7')})])
+
+    def test_added_and_removed_nodes(self):
+        removed = self.new.shared_networks[0].subnets.pop()
+        added = nodes.Subnet4('10.3.0.0/16')
+        self.new.shared_networks[0].add_subnet(added)
+        self.new.add_host(nodes.Host(name='baz'))
+        changes = dhcpd.diff(self.old, self.new)
+        self.assertEqual(
+            [(change.action, change.path[-1]) for change in changes],
+            [('removed', ('Subnet4', '10.2.0.0/16')),
+             ('added', ('Subnet4', '10.3.0.0/16')),
+             ('added', ('Host', 'baz'))])
+        self.assertIsNone(changes[1].old)
+        self.assertIs(changes[1].new, added)
+        self.assertEqual(changes[0].old.network, removed.network)
+
+    def test_renamed_host_matches_by_mac(self):
+        self.new.groups[0].hosts[0].name = 'qux'
+        self.assertEqual(self.changes(), [
+            ('modified', (('Group', 0), ('Host', 'foo')),
+             {'name': ('foo', 'qux')})])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,476 @@
+import io
+import unittest
+from unittest import mock
+from pyisc import dhcpd
+from pyisc.dhcpd import nodes
+from pyisc.dhcpd.mixin import DeclarationMixin
+
+
+class TestStreamWriting(unittest.TestCase):
+    def setUp(self):
+        dhcpd_file = 'tests/data/dhcpd-classes.conf'
+        with open(dhcpd_file, 'r') as testfile:
+            self.tree = dhcpd.loads(testfile.read())
+
+    def test_dump_function(self):
+        tree = dhcpd.loads(
+            'subnet 10.0.0.0 netmask 255.255.255.0 {\n'
+            '  range 10.0.0.10 10.0.0.20;\n}\n'
+            'host foo {\n  fixed-address 10.0.0.5;\n}\n')
+        buffer = io.StringIO()
+        dhcpd.dump(tree, buffer)
+        self.assertEqual(
+            buffer.getvalue(),
+            'subnet 10.0.0.0 netmask 255.255.255.0 {\n'
+            '    range 10.0.0.10 10.0.0.20;\n}\n'
+            'host foo {\n    fixed-address 10.0.0.5;\n}')
+
+    def test_declarations_implement_items(self):
+        class Incomplete(DeclarationMixin):
+            pass
+
+        with self.assertRaises(TypeError):
+            Incomplete()
+
+    def test_write_isc_indent(self):
+        subclass = nodes.SubClass(name='"foo"', match_value='1:2:3')
+        buffer = io.StringIO()
+        subclass.write_isc(buffer, indent=4)
+        self.assertEqual(buffer.getvalue(), '    subclass "foo" 1:2:3;')
+        subclass.lease_limit = 4
+        self.assertEqual(
+            subclass.to_isc(indent=4),
+            '    subclass "foo" 1:2:3 {\n        lease limit 4;\n    }')
+
+
+class TestCompactNodes(unittest.TestCase):
+    def test_leaf_nodes_have_no_dict(self):
+        for node in (nodes.Host(name='foo'),
+                     nodes.Hardware(type='ethernet', address='0:1:2:3:4:5'),
+                     nodes.Option(name='routers', value='10.0.0.1'),
+                     nodes.Range4(start='10.0.0.1', end='10.0.0.9'),
+                     nodes.Range6(start='fd::1', end='fd::9'),
+                     nodes.Prefix6(start='fd::', end='fd:0:0:ff::', bits=64),
+                     nodes.HostIdentifier(option_name='dhcp6.client-id',
+                                          option_data='0:1')):
+            self.assertFalse(hasattr(node, '__dict__'), type(node))
+
+    def test_host_sparse_parameters(self):
+        host = nodes.Host(name='foo')
+        self.assertIsNone(host.ddns_hostname)
+        self.assertIsNone(host._parameters)
+        host.ddns_hostname = '"bar"'
+        host.filename = '"pxelinux.0"'
+        self.assertEqual(
+            host.to_isc(),
+            'host foo {\n    ddns-hostname "bar";\n'
+            '    filename "pxelinux.0";\n}')
+        host.filename = None
+        self.assertEqual(host._parameters, {'ddns_hostname': '"bar"'})
+
+
+class TestSparseParameters(unittest.TestCase):
+    def test_only_set_parameters_are_stored(self):
+        subnet = nodes.Subnet4('10.0.0.0/24')
+        self.assertIsNone(subnet._parameters)
+        self.assertIsNone(subnet.max_lease_time)
+        self.assertIsNone(subnet.bootp)
+        subnet.bootp = 'deny'
+        subnet.max_lease_time = 7200
+        subnet.default_lease_time = 600
+        self.assertEqual(len(subnet._parameters), 3)
+        self.assertEqual(
+            subnet.to_isc(),
+            'subnet 10.0.0.0 netmask 255.255.255.0 {\n'
+            '    default_lease_time 600;\n'
+            '    max_lease_time 7200;\n'
+            '    bootp deny;\n}')
+
+    def test_parameter_keyword_arguments(self):
+        group = nodes.Group()
+        nodes.Parameters.__init__(group, filename='"pxelinux.0"')
+        self.assertEqual(group.filename, '"pxelinux.0"')
+        with self.assertRaises(TypeError):
+            nodes.Parameters.__init__(group, bootp='deny')
+
+    def test_shared_network_parameters(self):
+        tree = dhcpd.loads(
+            'shared-network foo {\n    default-lease-time 600;\n}\n')
+        self.assertEqual(tree.shared_networks[0].default_lease_time, 600)
+
+
+class TestAddressLookup(unittest.TestCase):
+    def setUp(self):
+        self.tree = dhcpd.loads(
+            'subnet 10.0.0.0 netmask 255.255.255.0 {\n'
+            '    pool {\n        range 10.0.0.10 10.0.0.20;\n    }\n}\n'
+            'shared-network office {\n'
+            '    subnet 10.2.0.0 netmask 255.255.0.0 {\n    }\n'
+            '    pool {\n        range 10.2.3.1 10.2.3.9;\n    }\n}\n'
+            'group {\n'
+            '    subnet 10.3.0.0 netmask 255.255.255.0 {\n    }\n}\n'
+            'subnet6 fd00::/64 {\n}\n')
+
+    def test_scope_path(self):
+        subnet = self.tree.subnets[0]
+        shared_network = self.tree.shared_networks[0]
+        group = self.tree.groups[0]
+        self.assertEqual(self.tree.lookup_address('10.0.0.15'),
+                         [self.tree, subnet, subnet.pools[0]])
+        self.assertEqual(self.tree.lookup_address('10.0.0.30'),
+                         [self.tree, subnet])
+        self.assertEqual(
+            self.tree.lookup_address('10.2.3.4'),
+            [self.tree, shared_network, shared_network.subnets[0],
+             shared_network.pools[0]])
+        self.assertEqual(self.tree.lookup_address('10.3.0.1'),
+                         [self.tree, group, group.subnets[0]])
+        self.assertEqual(self.tree.lookup_address('fd00::1'),
+                         [self.tree, self.tree.subnets[1]])
+        self.assertIsNone(self.tree.lookup_address('10.4.0.1'))
+
+    def test_nested_subnets(self):
+        outer = nodes.Subnet4('10.4.0.0/16')
+        inner = nodes.Subnet4('10.4.1.0/24')
+        self.tree.add_subnet(outer)
+        self.tree.add_subnet(inner)
+        self.assertEqual(self.tree.lookup_address('10.4.1.1')[-1], inner)
+        self.assertEqual(self.tree.lookup_address('10.4.2.1')[-1], outer)
+
+    def test_index_follows_changes(self):
+        self.assertIsNone(self.tree.lookup_address('10.4.0.1'))
+        subnet = nodes.Subnet4('10.4.0.0/16')
+        self.tree.add_subnet(subnet)
+        self.assertEqual(self.tree.lookup_address('10.4.0.1'),
+                         [self.tree, subnet])
+        self.tree.delete_subnet('10.4.0.0/16')
+        self.assertIsNone(self.tree.lookup_address('10.4.0.1'))
+
+    def test_index_is_kept_per_tree(self):
+        group = self.tree.groups[0]
+        self.assertIsNone(self.tree.lookup_address('10.4.0.1'))
+        self.assertIsNone(group.lookup_address('10.4.0.1'))
+        index = self.tree._address_index
+        other = dhcpd.loads('group {\n}\n')
+        other.groups[0].add_subnet(nodes.Subnet4('10.5.0.0/16'))
+        self.assertIsNone(self.tree.lookup_address('10.4.0.1'))
+        self.assertIs(self.tree._address_index, index)
+        group.add_subnet(nodes.Subnet4('10.4.0.0/16'))
+        self.assertEqual(self.tree.lookup_address('10.4.0.1')[-2:],
+                         [group, group.subnets[-1]])
+        self.assertEqual(group.lookup_address('10.4.0.1')[0], group)
+
+
+class TestSortedSubnets(unittest.TestCase):
+    networks = ['fd00::/64', '10.0.1.0/24', '10.0.0.0/16', '10.0.0.0/24',
+                '192.168.0.0/24']
+    expected = ['10.0.0.0/16', '10.0.0.0/24', '10.0.1.0/24',
+                '192.168.0.0/24', 'fd00::/64']
+
+    def make_subnet(self, network):
+        if ':' in network:
+            return nodes.Subnet6(network)
+        return nodes.Subnet4(network)
+
+    def test_add_subnet(self):
+        tree = nodes.Global()
+        for network in self.networks:
+            tree.add_subnet(self.make_subnet(network))
+        self.assertEqual([x.network for x in tree.subnets], self.expected)
+
+    def test_add_subnet_after_unsorted(self):
+        tree = nodes.Global()
+        for network in self.networks[:-1]:
+            tree.add_subnet(self.make_subnet(network), sort=False)
+        tree.add_subnet(self.make_subnet(self.networks[-1]))
+        self.assertEqual([x.network for x in tree.subnets], self.expected)
+
+    def test_add_subnets(self):
+        tree = nodes.Global()
+        tree.add_subnets(self.make_subnet(x) for x in self.networks)
+        self.assertEqual([x.network for x in tree.subnets], self.expected)
+
+    def test_sort_key_follows_network(self):
+        subnet = nodes.Subnet4('10.0.0.0/24')
+        subnet.network = '10.0.1.0/24'
+        self.assertEqual(subnet.sort_key, (False, 167772416, 24))
+
+
+class TestAddressBlocks(unittest.TestCase):
+    def test_subnet_integers(self):
+        subnet = nodes.Subnet4('10.0.0.0/24')
+        self.assertEqual(subnet.bounds, (4, 167772160, 167772415))
+        self.assertEqual(subnet.capacity, 256)
+        self.assertTrue(subnet.contains('10.0.0.255'))
+        self.assertTrue(subnet.contains(167772160))
+        self.assertFalse(subnet.contains('10.0.1.0'))
+        self.assertFalse(subnet.contains('::a00:1'))
+        subnet.network = '10.0.0.0/16'
+        self.assertEqual(str(subnet), 'subnet 10.0.0.0 netmask 255.255.0.0')
+        self.assertTrue(subnet.contains('10.0.1.0'))
+        self.assertEqual(nodes.Subnet6('fd00::/64').capacity, 1 << 64)
+
+    def test_range_integers(self):
+        subnet = nodes.Subnet4('10.0.0.0/24')
+        dhcp_range = nodes.Range4(start='10.0.0.10', end='10.0.0.20')
+        self.assertEqual(dhcp_range.capacity, 11)
+        self.assertTrue(subnet.covers(dhcp_range))
+        self.assertTrue(dhcp_range.overlaps(
+            nodes.Range4(start='10.0.0.20', end='10.0.0.30')))
+        self.assertFalse(dhcp_range.overlaps(nodes.Range4(start='10.0.0.21')))
+        dhcp_range.end = '10.0.1.20'
+        self.assertEqual(dhcp_range.capacity, 267)
+        self.assertFalse(subnet.covers(dhcp_range))
+        self.assertEqual(dhcp_range.to_isc(), 'range 10.0.0.10 10.0.1.20;')
+        prefix = nodes.Range6(start='fd00::/120')
+        self.assertEqual(prefix.capacity, 256)
+        self.assertFalse(prefix.overlaps(dhcp_range))
+
+
+class TestFindConflicts(unittest.TestCase):
+    def test_conflicts(self):
+        tree = dhcpd.loads(
+            'subnet 10.0.0.0 netmask 255.255.255.0 {\n'
+            '    range 10.0.0.10 10.0.0.20;\n'
+            '    range 10.0.1.10 10.0.1.20;\n'
+            '    pool {\n        range 10.0.0.20 10.0.0.30;\n    }\n}\n'
+            'shared-network office {\n'
+            '    subnet 10.0.0.128 netmask 255.255.255.128 {\n    }\n'
+            '    pool {\n        range 10.0.2.1 10.0.2.9;\n    }\n}\n'
+            'host foo {\n'
+            '    hardware ethernet 0:1:2:3:4:5;\n'
+            '    fixed-address 10.0.0.25;\n}\n'
+            'group {\n'
+            '    host foo {\n'
+            '        hardware ethernet 00:01:02:03:04:05;\n    }\n'
+            '    host bar {\n'
+            '        fixed-address 10.0.1.9;\n    }\n}\n')
+        subnet = tree.subnets[0]
+        shared_network = tree.shared_networks[0]
+        first_range, second_range = subnet.ranges
+        pool_range = subnet.pools[0].ranges[0]
+        foo, duplicate = tree.hosts[0], tree.groups[0].hosts[0]
+        self.assertEqual(tree.find_conflicts(), [
+            ('overlapping subnets', subnet, shared_network.subnets[0]),
+            ('overlapping ranges', first_range, pool_range),
+            ('range outside subnet', subnet, second_range),
+            ('range outside subnet', shared_network,
+             shared_network.pools[0].ranges[0]),
+            ('fixed address in range', pool_range, foo),
+            ('duplicate hardware address', foo, duplicate),
+            ('duplicate host name', foo, duplicate)])
+
+    def test_every_overlapping_pair(self):
+        tree = dhcpd.loads(
+            'subnet 10.0.0.0 netmask 255.255.255.0 {\n'
+            '    range 10.0.0.0 10.0.0.100;\n'
+            '    range 10.0.0.10 10.0.0.20;\n'
+            '    range 10.0.0.15 10.0.0.30;\n}\n'
+            'host foo {\n    fixed-address 10.0.0.25;\n}\n')
+        first, second, third = tree.subnets[0].ranges
+        self.assertEqual(tree.find_conflicts(), [
+            ('overlapping ranges', first, second),
+            ('overlapping ranges', first, third),
+            ('overlapping ranges', second, third),
+            ('fixed address in range', first, tree.hosts[0])])
+
+    def test_no_conflicts(self):
+        tree = dhcpd.loads(
+            'subnet 10.0.0.0 netmask 255.255.255.0 {\n'
+            '    range 10.0.0.10 10.0.0.20;\n}\n'
+            'subnet6 fd00::/64 {\n    range6 fd00::10 fd00::20;\n}\n'
+            'host foo {\n    fixed-address 10.0.0.21;\n}\n')
+        self.assertEqual(tree.find_conflicts(), [])
+
+
+class TestHostIndex(unittest.TestCase):
+    def setUp(self):
+        self.tree = dhcpd.loads(
+            'host foo {\n'
+            '    hardware ethernet 0:1:2:3:4:5;\n'
+            '    fixed-address 10.0.0.5;\n}\n'
+            'group {\n'
+            '    host bar {\n'
+            '        hardware ethernet 00:01:02:03:04:AA;\n'
+            '        fixed-address 10.0.0.6;\n    }\n}\n')
+        self.foo = self.tree.hosts[0]
+        self.group = self.tree.groups[0]
+        self.bar = self.group.hosts[0]
+
+    def test_find_host(self):
+        self.assertIs(self.tree.find_host(name='foo'), self.foo)
+        self.assertIs(self.tree.find_host(mac='00:01:02:03:04:05'), self.foo)
+        self.assertIs(self.tree.find_host(ip='10.0.0.6'), self.bar)
+        self.assertIs(self.tree.find_host(mac='0:1:2:3:4:aa'), self.bar)
+        self.assertIs(self.group.find_host(name='bar'), self.bar)
+        self.assertIsNone(self.group.find_host(name='foo'))
+        self.assertIsNone(self.tree.find_host(name='foo', ip='10.0.0.6'))
+        self.assertIsNone(self.tree.find_host(ip=''))
+        self.assertIsNone(self.tree.find_host(name='foo', ip=''))
+
+    def test_index_follows_changes(self):
+        self.tree.find_host(name='foo')
+        self.group.find_host(name='bar')
+        self.bar.fixed_address = '10.0.0.7'
+        self.assertIsNone(self.tree.find_host(ip='10.0.0.6'))
+        self.assertIs(self.tree.find_host(ip='10.0.0.7'), self.bar)
+        self.assertIs(self.group.find_host(ip='10.0.0.7'), self.bar)
+        host = nodes.Host(name='baz', fixed_address='10.0.0.8')
+        self.group.add_host(host)
+        self.assertIs(self.tree.find_host(ip='10.0.0.8'), host)
+        group = nodes.Group(hosts=[nodes.Host(name='qux')])
+        self.tree.add_group(group)
+        self.assertIs(self.tree.find_host(name='qux'), group.hosts[0])
+
+    def test_delete_host(self):
+        self.assertEqual(self.tree.delete_host(mac='0:1:2:3:4:aa'),
+                         'Deleted host bar.')
+        self.assertEqual(self.group.hosts, [])
+        self.assertIsNone(self.tree.find_host(name='bar'))
+        self.assertEqual(self.tree.delete_host(name='bar'), 'No host found')
+
+
+class TestCachedRendering(unittest.TestCase):
+    def setUp(self):
+        self.tree = dhcpd.loads(
+            'group {\n'
+            '    host foo {\n'
+            '        hardware ethernet 0:1:2:3:4:5;\n    }\n'
+            '    host bar {\n'
+            '        fixed-address 10.0.0.6;\n    }\n}\n'
+            'shared-network office {\n'
+            '    subnet 10.2.0.0 netmask 255.255.0.0 {\n    }\n}\n')
+        self.expected = dhcpd.dumps(self.tree)
+
+    def test_unchanged_subtrees_are_reused(self):
+        foo, bar = self.tree.groups[0].hosts
+        cached = bar._isc_cache
+        foo.fixed_address = '10.0.0.5'
+        self.assertIsNone(foo._isc_cache)
+        self.assertIsNone(self.tree.groups[0]._isc_cache)
+        self.assertIs(bar._isc_cache, cached)
+        self.assertEqual(
+            dhcpd.dumps(self.tree),
+            self.expected.replace(
+                '        hardware ethernet 0:1:2:3:4:5;',
+                '        fixed-address 10.0.0.5;\n'
+                '        hardware ethernet 0:1:2:3:4:5;'))
+        self.assertIs(bar._isc_cache, cached)
+
+    def test_blocks_with_declarations_are_streamed(self):
+        group = self.tree.groups[0]
+        self.assertIsNone(group._isc_cache)
+        self.assertIsNone(self.tree.shared_networks[0]._isc_cache)
+        self.assertIsNotNone(group.hosts[0]._isc_cache)
+        writes = []
+        self.tree.write_isc(mock.Mock(write=writes.append))
+        self.assertEqual(''.join(writes), self.expected)
+        self.assertIn('group {', writes)
+
+    def test_nested_changes_are_written(self):
+        self.tree.groups[0].hosts[0].hardware.address = '0:1:2:3:4:6'
+        subnet = self.tree.shared_networks[0].subnets[0]
+        subnet.add_option(nodes.Option(name='routers', value='10.2.0.1'))
+        self.assertEqual(
+            dhcpd.dumps(self.tree),
+            self.expected.replace('4:5;', '4:6;').replace(
+                'netmask 255.255.0.0 {',
+                'netmask 255.255.0.0 {\n        option routers 10.2.0.1;'))
+
+    def test_member_and_global_changes_are_written(self):
+        tree = dhcpd.loads(
+            'subnet 10.0.0.0 netmask 255.255.255.0 {\n'
+            '    pool {\n        range 10.0.0.10 10.0.0.20;\n    }\n}\n')
+        pool = tree.subnets[0].pools[0]
+        tree.to_isc()
+        pool.add_allowed_member('known-clients')
+        self.assertIn('allow members of known-clients;', tree.to_isc())
+        pool.delete_allowed_member('known-clients')
+        pool.add_denied_member('known-clients')
+        text = tree.to_isc()
+        self.assertNotIn('allow members of', text)
+        self.assertIn('deny members of known-clients;', text)
+        pool.delete_denied_member('known-clients')
+        self.assertNotIn('members of', tree.to_isc())
+        option = nodes.CustomOption(name='foo', code=224, definition='text')
+        digest = tree.digest()
+        tree.add_custom_option(option)
+        self.assertIs(option._parent, tree)
+        self.assertNotEqual(tree.digest(), digest)
+        self.assertTrue(
+            tree.to_isc().startswith('option foo code 224 = text;'))
+
+    def test_cache_depends_on_indent(self):
+        host = self.tree.groups[0].hosts[1]
+        self.assertEqual(
+            host.to_isc(), 'host bar {\n    fixed-address 10.0.0.6;\n}')
+        self.assertEqual(dhcpd.dumps(self.tree), self.expected)
+
+
+class TestDigest(unittest.TestCase):
+    def setUp(self):
+        content = (
+            'subnet 10.0.0.0 netmask 255.255.255.0 {\n'
+            '    range 10.0.0.10 10.0.0.20;\n}\n'
+            'group {\n'
+            '    host foo {\n'
+            '        hardware ethernet 0:1:2:3:4:5;\n    }\n'
+            '    host foo {\n'
+            '        hardware ethernet 0:1:2:3:4:5;\n    }\n}\n')
+        self.old = dhcpd.loads(content)
+        self.new = dhcpd.loads(content)
+
+    def test_equal_trees(self):
+        self.assertEqual(self.old.digest(), self.new.digest())
+        self.assertEqual(self.old, self.new)
+        self.assertNotEqual(nodes.Subnet4('10.0.0.0/24'),
+                            nodes.Subnet4('10.0.1.0/24'))
+        self.assertNotEqual(nodes.Subnet4('10.0.0.0/24'),
+                            nodes.Subnet6('fd00::/64'))
+        self.assertEqual(len({self.old, self.new}), 2)
+        self.assertEqual({self.old: 1}.get(self.old), 1)
+
+    def test_changes_invalidate_ancestors(self):
+        group = self.new.groups[0]
+        self.new.digest()
+        host_digest = group.hosts[1].digest()
+        group.hosts[0].hardware.address = '0:1:2:3:4:6'
+        self.assertIsNone(group._digest)
+        self.assertIsNone(self.new._digest)
+        self.assertEqual(group.hosts[1]._digest, host_digest)
+        self.assertNotEqual(self.old, self.new)
+        self.new.subnets[0].ranges[0].end = '10.0.0.30'
+        group.hosts[0].hardware.address = '0:1:2:3:4:5'
+        self.assertNotEqual(self.old, self.new)
+        self.new.subnets[0].ranges[0].end = '10.0.0.20'
+        self.assertEqual(self.old, self.new)
+
+    def test_delete_removes_the_found_node(self):
+        group = self.old.groups[0]
+        first, second = group.hosts
+        self.assertEqual(first, second)
+        self.old.find_host(name='foo')
+        self.old.delete_host(name='foo')
+        self.assertEqual(len(group.hosts), 1)
+        self.assertIs(self.old.find_host(name='foo'), group.hosts[0])
+
+    def test_reading_keeps_parents(self):
+        host = self.old.groups[0].hosts[0]
+        self.new.groups[0].hosts[0] = host
+        self.new.digest()
+        dhcpd.dumps(self.new)
+        self.new.find_host(name='foo')
+        self.assertIs(host._parent, self.old.groups[0])
+        self.assertIs(host.hardware._parent, host)
+
+    def test_assigned_lists_are_linked(self):
+        dhcp_range = nodes.Range4('10.0.0.10', '10.0.0.20')
+        subnet = nodes.Subnet4('10.0.0.0/24', ranges=[dhcp_range])
+        self.assertIs(dhcp_range._parent, subnet)
+        digest = subnet.digest()
+        dhcp_range.end = '10.0.0.30'
+        self.assertNotEqual(subnet.digest(), digest)
+
+
+if __name__ == '__main__':
+    unittest.main()
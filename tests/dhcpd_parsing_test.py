@@ -0,0 +1,239 @@
+import io
+import unittest
+from pyisc import dhcpd
+from pyisc.dhcpd import nodes
+from pyisc.dhcpd.parsing import statement_boundary
+
+
+class TestStreamParsing(unittest.TestCase):
+    def setUp(self):
+        dhcpd_file = 'tests/data/dhcpd-classes.conf'
+        with open(dhcpd_file, 'r') as testfile:
+            self.testdata = testfile.read()
+        self.parser = dhcpd.DhcpdParser()
+
+    def test_statement_boundary(self):
+        self.assertEqual(statement_boundary('authoritative;\npool\n'), 15)
+        self.assertEqual(statement_boundary('subnet\n  10.0.0.0'), 0)
+        self.assertEqual(statement_boundary('}\n\n  \n'), 6)
+
+    def test_tokens_match_tokenize(self):
+        expected = list(self.parser.tokenize(self.testdata))
+        for chunk_size in (1, 7, 64, 4096):
+            stream = io.StringIO(self.testdata)
+            tokens = list(self.parser.tokenize_stream(stream, chunk_size))
+            self.assertEqual(tokens, expected)
+
+    def test_token_across_lines(self):
+        content = 'pool\n{\n    range 10.0.0.1 10.0.0.2;\n}\n'
+        expected = list(self.parser.tokenize(content))
+        stream = io.StringIO(content)
+        self.assertEqual(
+            list(self.parser.tokenize_stream(stream, chunk_size=3)), expected)
+
+    def test_content_tokens(self):
+        expected = [token for token in self.parser.tokenize(self.testdata)
+                    if token.type not in ('NEWLINE', 'WHITESPACE',
+                                          'COMMENT_UNIX')]
+        self.assertEqual(list(self.parser.tokenize_content(self.testdata)),
+                         expected)
+        tokens = list(self.parser.tokenize_content(
+            'pool\n  {\n  # comment\n    range 10.0.0.1 10.0.0.2; }\n\n'))
+        self.assertEqual([(token.line, token.column) for token in tokens],
+                         [(1, 0), (4, 4), (4, 29)])
+        with self.assertRaisesRegex(RuntimeError, 'line 3'):
+            dhcpd.loads('group\n{\n  ?\n}\n')
+
+    def test_keyword_dispatch(self):
+        content = (
+            'allowed-x 1;\nallow booting;\ndeny-all 2;\nignored 3;\n'
+            'not authoritative;\nprimary;\nprimary 10.0.0.1;\n'
+            'server-duid LL ethernet 0:1:2:3:4:5;\nhostname foo;\n_x 1;\n'
+            'option space-x code 10 = string;\noption foo = concat("a");\n'
+            'subnet6 2001:db8::/64 {\n  range6 2001:db8::1 2001:db8::2;\n}\n'
+            'on commit {\n  set ip = leased-address;\n  log(info, ip);\n}\n')
+        expected = [(token.type, token.value)
+                    for token in self.parser.tokenize(content)
+                    if token.type not in ('NEWLINE', 'WHITESPACE')]
+        self.assertEqual([(token.type, token.value) for token in
+                          self.parser.tokenize_content(content)], expected)
+        self.assertEqual(expected[0][0], 'ALLOW_GENERAL')
+        self.assertEqual(expected[8][0], 'GENERAL_PARAMETER')
+
+    def test_load_function(self):
+        expected = dhcpd.dumps(dhcpd.loads(self.testdata))
+        with open('tests/data/dhcpd-classes.conf', 'r') as testfile:
+            self.assertEqual(dhcpd.dumps(dhcpd.load(testfile)), expected)
+
+
+class TestBytesParsing(unittest.TestCase):
+    def setUp(self):
+        self.path = 'tests/data/dhcpd-classes.conf'
+        with open(self.path, 'r') as testfile:
+            self.testdata = testfile.read()
+        self.parser = dhcpd.DhcpdParser()
+
+    def test_spans_match_tokenize(self):
+        content = self.testdata.encode('utf-8')
+        expected = [token for token in self.parser.tokenize(self.testdata)
+                    if token.type not in ('NEWLINE', 'WHITESPACE',
+                                          'COMMENT_UNIX')]
+        spans = list(self.parser.tokenize_bytes(content))
+        self.assertEqual([(span.type, span.line, span.column)
+                          for span in spans],
+                         [(token.type, token.line, token.column)
+                          for token in expected])
+        self.assertEqual(content[spans[0].start:spans[0].end],
+                         expected[0].value.encode('utf-8'))
+
+    def test_load_path(self):
+        expected = dhcpd.loads(self.testdata)
+        self.assertEqual(dhcpd.load(self.path), expected)
+        self.assertEqual(self.parser.construct_tree_from_file(self.path),
+                         expected)
+
+    def test_encoded_values(self):
+        content = 'option domain-name "\u00e5\u00e4\u00f6.example.org";\n'
+        tree = self.parser.construct_tree_from_bytes(content.encode('utf-8'))
+        self.assertEqual(tree, dhcpd.loads(content))
+        with self.assertRaisesRegex(RuntimeError, 'line 2'):
+            self.parser.construct_tree_from_bytes(b'group {\n  ?\n}\n')
+
+
+LAZY_CONFIG = (
+    'authoritative;\n'
+    'subnet 10.0.0.0 netmask 255.255.255.0 {\n'
+    '  range 10.0.0.10 10.0.0.20; # dynamic\n'
+    '    option   routers 10.0.0.1;\n'
+    '}\n'
+    'group {\n'
+    '  option domain-name "{example}";\n'
+    '  host foo { hardware ethernet 0:1:2:3:4:5; fixed-address 10.0.0.5; }\n'
+    '}\n')
+
+
+class TestLazyParsing(unittest.TestCase):
+    def setUp(self):
+        self.tree = dhcpd.loads(LAZY_CONFIG, lazy=True)
+
+    def test_untouched_blocks_keep_their_text(self):
+        self.assertIsNot(type(self.tree.subnets[0]), nodes.Subnet4)
+        self.assertEqual(dhcpd.dumps(self.tree) + '\n', LAZY_CONFIG)
+        self.assertIsNot(type(self.tree.groups[0]), nodes.Group)
+
+    def test_blocks_are_parsed_on_access(self):
+        subnet = self.tree.subnets[0]
+        self.assertEqual(subnet.ranges[0].end, '10.0.0.20')
+        self.assertIs(type(subnet), nodes.Subnet4)
+        self.assertIsNot(type(self.tree.groups[0]), nodes.Group)
+        self.assertEqual(dhcpd.dumps(self.tree) + '\n', LAZY_CONFIG)
+        self.assertEqual(self.tree.find_host(mac='0:1:2:3:4:5').name, 'foo')
+        self.assertEqual(self.tree, dhcpd.loads(LAZY_CONFIG))
+
+    def test_lazy_declarations_are_hashable(self):
+        subnet = self.tree.subnets[0]
+        scopes = {subnet: 'subnet'}
+        self.assertIsNot(type(subnet), nodes.Subnet4)
+        self.assertEqual(subnet.ranges[0].end, '10.0.0.20')
+        self.assertEqual(scopes[subnet], 'subnet')
+
+    def test_edit_rewrites_only_that_block(self):
+        self.tree.subnets[0].authoritative = True
+        text = dhcpd.dumps(self.tree)
+        self.assertIn('    authoritative;\n', text)
+        self.assertNotIn('# dynamic', text)
+        self.assertIn('  host foo { hardware ethernet 0:1:2:3:4:5;', text)
+
+    def test_nested_edits_are_written(self):
+        self.tree.groups[0].hosts[0].fixed_address = '10.0.0.99'
+        self.tree.subnets[0].ranges[0].end = '10.0.0.30'
+        text = dhcpd.dumps(self.tree)
+        self.assertIn('fixed-address 10.0.0.99;', text)
+        self.assertIn('range 10.0.0.10 10.0.0.30;', text)
+        tree = dhcpd.loads(
+            'shared-network office {\n'
+            '  subnet 10.2.0.0 netmask 255.255.0.0 {\n'
+            '    pool {\n      range 10.2.0.10 10.2.0.20;\n    }\n  }\n}\n',
+            lazy=True)
+        tree.shared_networks[0].subnets[0].pools[0].ranges[0].end = \
+            '10.2.0.30'
+        self.assertIn('range 10.2.0.10 10.2.0.30;', dhcpd.dumps(tree))
+
+    def test_errors_keep_line_numbers(self):
+        tree = dhcpd.loads('authoritative;\ngroup {\n\n  ?\n}\n', lazy=True)
+        with self.assertRaisesRegex(RuntimeError, 'line 4'):
+            tree.groups[0].hosts
+        with self.assertRaisesRegex(RuntimeError, 'line 2'):
+            dhcpd.loads('authoritative;\ngroup {\n', lazy=True)
+
+
+PROJECTION_CONFIG = (
+    'authoritative;\n'
+    'subnet 10.0.0.0 netmask 255.255.255.0 {\n'
+    '  range 10.0.0.10 10.0.0.20;\n'
+    '  option routers 10.0.0.1;\n}\n'
+    'group {\n'
+    '  option domain-name "example.org";\n'
+    '  host foo {\n'
+    '    hardware ethernet 0:1:2:3:4:5;\n  }\n}\n'
+    'host bar {\n  fixed-address 10.0.0.5;\n}\n')
+
+
+class TestProjectionParsing(unittest.TestCase):
+    def test_include_types(self):
+        tree = dhcpd.loads(PROJECTION_CONFIG, include_types=[nodes.Host])
+        self.assertEqual(tree.hosts[0].name, 'bar')
+        self.assertEqual(tree.find_host(mac='0:1:2:3:4:5').name, 'foo')
+        self.assertIsNone(tree.authoritative)
+        self.assertFalse(tree.subnets[0].ranges)
+        self.assertFalse(tree.groups[0].options)
+        tree = dhcpd.loads(PROJECTION_CONFIG, include_types=[nodes.Subnet4])
+        self.assertEqual(tree.subnets[0].ranges[0].end, '10.0.0.20')
+        self.assertFalse(tree.hosts or tree.groups[0].hosts)
+
+    def test_include_nested_types(self):
+        tree = dhcpd.loads(PROJECTION_CONFIG, include_types=[nodes.Hardware])
+        host = tree.groups[0].hosts[0]
+        self.assertEqual(host.name, 'foo')
+        self.assertEqual(host.hardware.address, '0:1:2:3:4:5')
+        self.assertIsNone(tree.hosts[0].fixed_address)
+        content = 'subclass "foo" 1:2:3 {\n  option routers 10.0.0.1;\n}\n'
+        tree = dhcpd.loads(content, include_types=[nodes.Option])
+        self.assertEqual(tree.subclasses[0].options[0].value, '10.0.0.1')
+
+    def test_include_options_of_every_container(self):
+        tree = dhcpd.loads(PROJECTION_CONFIG, include_types=[nodes.Option])
+        self.assertEqual(tree.hosts[0].name, 'bar')
+        self.assertEqual(tree.groups[0].hosts[0].name, 'foo')
+        self.assertTrue(tree.subnets[0].options)
+        content = 'host foo {\n  option routers 10.0.0.1;\n}\n'
+        with self.assertRaisesRegex(AttributeError, 'add_option'):
+            dhcpd.loads(content)
+        with self.assertRaisesRegex(AttributeError, 'add_option'):
+            dhcpd.loads(content, include_types=[nodes.Option])
+
+    def test_exclude_types(self):
+        tree = dhcpd.loads(PROJECTION_CONFIG,
+                           exclude_types=[nodes.Host, nodes.Option])
+        self.assertTrue(tree.authoritative)
+        self.assertFalse(tree.hosts or tree.groups[0].hosts)
+        self.assertEqual(tree.subnets[0].ranges[0].start, '10.0.0.10')
+        self.assertFalse(tree.subnets[0].options)
+        full = dhcpd.loads(PROJECTION_CONFIG, exclude_types=[])
+        self.assertEqual(full, dhcpd.loads(PROJECTION_CONFIG))
+
+    def test_skipped_blocks_keep_line_numbers(self):
+        content = 'group {\n  host foo {\n\n  }\n}\n?\n'
+        with self.assertRaisesRegex(RuntimeError, 'line 6'):
+            dhcpd.loads(content, include_types=[nodes.Subnet4])
+
+    def test_rejects_unknown_types(self):
+        with self.assertRaises(ValueError):
+            dhcpd.loads(PROJECTION_CONFIG, include_types=[nodes.Global])
+        with self.assertRaises(ValueError):
+            dhcpd.loads(PROJECTION_CONFIG, lazy=True,
+                        exclude_types=[nodes.Host])
+
+
+if __name__ == '__main__':
+    unittest.main()
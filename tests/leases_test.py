@@ -0,0 +1,194 @@
+import asyncio
+import io
+import os
+import tempfile
+import unittest
+from calendar import timegm
+from pyisc import dhcpd, leases
+
+
+class TestIterLeases(unittest.TestCase):
+    def setUp(self):
+        with open('data/dhcpd.leases', 'r') as leases_file:
+            self.leases = list(leases.iter_leases(leases_file))
+
+    def test_all_lease_blocks(self):
+        self.assertEqual(len(self.leases), 14)
+        self.assertEqual(
+            [lease.uid for lease in self.leases if lease.ip == '10.0.1.3'],
+            ['"baz-1"', '"baz-2"'])
+
+    def test_lease_fields(self):
+        lease = self.leases[0]
+        self.assertEqual(lease.ip, '110.31.40.13')
+        self.assertEqual(lease.starts, timegm((2016, 10, 18, 10, 16, 46)))
+        self.assertEqual(lease.ends, timegm((2016, 10, 18, 10, 21, 46)))
+        self.assertEqual(lease.binding_state, 'active')
+        self.assertEqual(lease.next_binding_state, 'free')
+        self.assertEqual(lease.rewind_binding_state, 'free')
+        self.assertEqual(lease.hardware_type, 'ethernet')
+        self.assertEqual(lease.hardware_address, '54:ab:aa:36:b4:e1')
+        self.assertEqual(lease.client_hostname, 'other')
+        self.assertIsNone(lease.variables)
+
+    def test_variables_and_events(self):
+        lease = self.leases[1]
+        self.assertEqual(lease.variables['ip_addr'], '102.31.50.97')
+        self.assertEqual(sorted(lease.events), ['expiry', 'release'])
+        self.assertTrue(lease.events['expiry'][0].startswith('execute ('))
+
+    def test_other_blocks_and_formats(self):
+        content = (
+            'authoring-byte-order little-endian;\n'
+            'failover peer "peer" state {\n'
+            '  my state normal at 1 2021/01/01 00:00:00;\n}\n'
+            'ia-na "abc" {\n  iaaddr 2001:db8::1 {\n'
+            '    binding state active;\n  }\n}\n'
+            'lease 10.0.0.1 {\n'
+            '  starts epoch 1609459200; # Fri Jan 01 00:00:00 2021\n'
+            '  ends never;\n'
+            '  binding state abandoned;\n'
+            '  abandoned;\n'
+            '}\n')
+        lease, = leases.iter_leases(io.StringIO(content))
+        self.assertEqual(lease.ip, '10.0.0.1')
+        self.assertEqual(lease.starts, 1609459200)
+        self.assertIsNone(lease.ends)
+        self.assertEqual(lease.binding_state, 'abandoned')
+        self.assertEqual(lease.statements, ('abandoned',))
+
+
+class TestLeaseTable(unittest.TestCase):
+    def setUp(self):
+        with open('data/dhcpd.leases', 'r') as leases_file:
+            self.table = leases.load(leases_file)
+
+    def test_last_lease_wins(self):
+        self.assertEqual(len(self.table), 13)
+        lease = self.table.get('10.0.1.3')
+        self.assertEqual(lease.starts, 1431656221)
+        self.assertEqual(lease.hardware_address, '00:11:22:33:44:57')
+        self.assertIn('10.0.1.3', self.table)
+        self.assertNotIn('10.9.9.9', self.table)
+        self.assertIsNone(self.table.get('10.9.9.9'))
+
+    def test_find_by_mac(self):
+        self.assertEqual(self.table.find_by_mac('0:11:22:33:44:57').ip,
+                         '10.0.1.3')
+        self.assertIsNone(self.table.find_by_mac('0:0:0:0:0:2'))
+        self.assertIsNone(self.table.find_by_mac('not a mac'))
+
+    def test_moving_mac_address(self):
+        table = leases.LeaseTable([
+            leases.Lease('10.0.0.1', hardware_address='0:0:0:0:0:0'),
+            leases.Lease('10.0.0.2', hardware_address='0:0:0:0:0:1'),
+            leases.Lease('2001:db8::1', hardware_address='0:0:0:0:0:1'),
+            leases.Lease('10.0.0.3', binding_state='active',
+                         hardware_address='0:0:0:0:0:0'),
+            leases.Lease('10.0.0.1', binding_state='free')])
+        self.assertEqual(len(table), 3)
+        self.assertEqual(table.find_by_mac('00:00:00:00:00:00').ip,
+                         '10.0.0.3')
+        self.assertEqual(table.find_by_mac('0:0:0:0:0:1').ip, '10.0.0.2')
+        lease = table.get('10.0.0.1')
+        self.assertEqual(lease.binding_state, 'free')
+        self.assertIsNone(lease.hardware_address)
+        self.assertIsNone(lease.starts)
+
+
+    def test_stale_mac_slots(self):
+        table = leases.LeaseTable([
+            leases.Lease('10.0.0.1', hardware_address='0:0:0:0:0:1'),
+            leases.Lease('10.0.0.1', hardware_address='0:0:0:0:0:2'),
+            leases.Lease('10.0.0.1', hardware_address='0:0:0:0:0:2')])
+        self.assertEqual(table.mac_slots_used, 2)
+        self.assertIsNone(table.find_by_mac('0:0:0:0:0:1'))
+        self.assertEqual(table.find_by_mac('0:0:0:0:0:2').ip, '10.0.0.1')
+        table.resize(table.bits)
+        self.assertEqual(table.mac_slots_used, 1)
+        self.assertEqual(table.find_by_mac('0:0:0:0:0:2').ip, '10.0.0.1')
+
+
+class TestLeaseFollower(unittest.TestCase):
+    block = 'lease 10.0.0.{} {{\n  binding state active;\n}}\n'
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'dhcpd.leases')
+        self.write('w', self.block.format(1))
+        self.follower = leases.LeaseFollower(self.path)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, mode, content):
+        with open(self.path, mode) as leases_file:
+            leases_file.write(content)
+
+    def addresses(self, update):
+        return [lease.ip for lease in update.leases]
+
+    def test_appended_leases(self):
+        self.assertEqual(self.follower.poll(), (True, ()))
+        self.assertIn('10.0.0.1', self.follower.table)
+        self.assertEqual(self.follower.poll(), (False, ()))
+        block = self.block.format(2)
+        self.write('a', block[:20])
+        self.assertEqual(self.follower.poll(), (False, ()))
+        self.write('a', block[20:] + self.block.format(3))
+        update = self.follower.poll()
+        self.assertFalse(update.reload)
+        self.assertEqual(self.addresses(update), ['10.0.0.2', '10.0.0.3'])
+        self.assertEqual(len(self.follower.table), 3)
+
+    def test_rewritten_file(self):
+        self.follower.poll()
+        new_path = f'{self.path}.new'
+        with open(new_path, 'w') as leases_file:
+            leases_file.write(self.block.format(4))
+        os.replace(self.path, f'{self.path}~')
+        os.replace(new_path, self.path)
+        self.assertEqual(self.follower.poll(), (True, ()))
+        self.assertIn('10.0.0.4', self.follower.table)
+        self.assertNotIn('10.0.0.1', self.follower.table)
+        self.write('w', '')
+        self.assertEqual(self.follower.poll(), (True, ()))
+        self.assertEqual(len(self.follower.table), 0)
+
+    def test_follow_async(self):
+        async def first_update():
+            async for update in self.follower.follow_async(interval=0):
+                return update
+
+        self.assertEqual(asyncio.run(first_update()), (True, ()))
+        self.assertIn('10.0.0.1', self.follower.table)
+
+
+class TestUtilization(unittest.TestCase):
+    def test_scope_counts(self):
+        tree = dhcpd.loads(
+            'shared-network office {\n'
+            '    subnet 10.0.1.0 netmask 255.255.255.0 {\n'
+            '        range 10.0.1.1 10.0.1.2;\n'
+            '        pool {\n            range 10.0.1.3 10.0.1.10;\n'
+            '        }\n    }\n'
+            '    pool {\n        range 192.168.20.1 192.168.20.10;\n    }\n}\n'
+            'group {\n'
+            '    subnet 110.31.40.0 netmask 255.255.255.0 {\n'
+            '        range 110.31.40.13;\n    }\n}\n'
+            'subnet6 fd00::/64 {\n}\n')
+        with open('data/dhcpd.leases', 'r') as leases_file:
+            report = leases.utilization(tree, leases_file)
+        shared_network = tree.shared_networks[0]
+        subnet = shared_network.subnets[0]
+        self.assertEqual(
+            [(record.scope, record[1:]) for record in report],
+            [(shared_network, (20, 0, 3, 0, 0)),
+             (subnet, (10, 0, 3, 0, 0)),
+             (subnet.pools[0], (8, 0, 1, 0, 0)),
+             (shared_network.pools[0], (10, 0, 0, 0, 0)),
+             (tree.groups[0].subnets[0], (1, 1, 0, 0, 0))])
+
+
+if __name__ == '__main__':
+    unittest.main()
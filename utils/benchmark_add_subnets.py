@@ -0,0 +1,54 @@
+# Measures building a tree with many subnets through add_subnet and
+# add_subnets, compared with the previous append and full re-sort that
+# parsed every network twice per element on each addition.
+import pathlib
+import random
+import sys
+import time
+from ipaddress import ip_network, IPv6Network
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[1]))
+from pyisc.dhcpd.nodes import Global, Subnet4
+
+SUBNETS = 50000
+# The previous implementation is quadratic, so it is measured on fewer
+# subnets.
+LEGACY_SUBNETS = 1000
+
+
+def make_subnets(count):
+    """Return count /24 subnets in random order."""
+    subnets = [Subnet4(f'10.{number // 256}.{number % 256}.0/24')
+               for number in range(count)]
+    random.Random(0).shuffle(subnets)
+    return subnets
+
+
+def legacy_add_subnet(tree, network):
+    """add_subnet as it was before subnets cached their sort key."""
+    tree.subnets.append(network)
+    tree.subnets.sort(
+        key=lambda x: (
+            isinstance(ip_network(x.network), IPv6Network),
+            ip_network(x.network)))
+
+
+def measure(name, build, count):
+    subnets = make_subnets(count)
+    tree = Global()
+    start = time.perf_counter()
+    build(tree, subnets)
+    elapsed = time.perf_counter() - start
+    assert [x.sort_key for x in tree.subnets] == \
+        sorted(x.sort_key for x in subnets)
+    print(f'{name:<12} {count:>7} subnets {elapsed:8.3f} s '
+          f'{count / elapsed:>12,.0f} subnets/s')
+
+
+if __name__ == '__main__':
+    measure('legacy', lambda tree, subnets: [
+        legacy_add_subnet(tree, subnet) for subnet in subnets],
+        LEGACY_SUBNETS)
+    measure('add_subnet', lambda tree, subnets: [
+        tree.add_subnet(subnet) for subnet in subnets], SUBNETS)
+    measure('add_subnets', lambda tree, subnets: tree.add_subnets(subnets),
+            SUBNETS)
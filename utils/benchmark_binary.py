@@ -0,0 +1,38 @@
+# Compares parsing a host heavy config with loading the same tree from the
+# binary format and from a pickle.
+import pathlib
+import pickle
+import sys
+import time
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[1]))
+from pyisc import dhcpd
+from pyisc.dhcpd.binary import decode_tree, encode_tree
+from benchmark_construct_tree import host_config
+
+
+def best_of(function, argument, runs=3):
+    """Return the result and the fastest time of runs calls."""
+    elapsed = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = function(argument)
+        run = time.perf_counter() - start
+        elapsed = run if elapsed is None else min(elapsed, run)
+    return result, elapsed
+
+
+if __name__ == '__main__':
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    content = host_config(count)
+    tree, parse_time = best_of(dhcpd.loads, content)
+    data, encode_time = best_of(encode_tree, tree)
+    _, decode_time = best_of(decode_tree, data)
+    pickled = pickle.dumps(tree, pickle.HIGHEST_PROTOCOL)
+    _, unpickle_time = best_of(pickle.loads, pickled)
+    print(f'{count} hosts, {len(content) / 2 ** 20:.1f} MiB of text')
+    print(f'parse:  {parse_time:.2f} s')
+    print(f'binary: {len(data) / 2 ** 20:.1f} MiB, encode '
+          f'{encode_time:.2f} s, decode {decode_time:.2f} s '
+          f'({parse_time / decode_time:.0f}x faster than parsing)')
+    print(f'pickle: {len(pickled) / 2 ** 20:.1f} MiB, load '
+          f'{unpickle_time:.2f} s')
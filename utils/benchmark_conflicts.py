@@ -0,0 +1,45 @@
+# Measures find_conflicts on a tree of 40k subnets with a range and a pool
+# range each and 250k hosts with hardware and fixed addresses, a few of
+# which conflict.
+import pathlib
+import sys
+import time
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[1]))
+from pyisc.dhcpd.nodes import (Global, Group, Hardware, Host, Pool4, Range4,
+                               Subnet4)
+
+SUBNETS = 40000
+HOSTS = 250000
+
+
+def make_tree(subnets, hosts):
+    """Return a tree of subnets /24 subnets and hosts hosts."""
+    tree = Global()
+    nodes = []
+    for number in range(subnets):
+        prefix = f'10.{number // 256}.{number % 256}'
+        subnet = Subnet4(f'{prefix}.0/24',
+                         ranges=[Range4(f'{prefix}.100', f'{prefix}.199')])
+        subnet.pools.append(
+            Pool4(ranges=[Range4(f'{prefix}.200', f'{prefix}.250')]))
+        nodes.append(subnet)
+    tree.add_subnets(nodes)
+    group = Group()
+    for number in range(hosts):
+        mac = ':'.join(f'{b:02x}' for b in number.to_bytes(6, 'big'))
+        # Every 1000th host has an address inside a dynamic range.
+        octet = 150 if number % 1000 == 0 else 1 + number % 90
+        group.hosts.append(Host(
+            name=f'host{number}', hardware=Hardware('ethernet', mac),
+            fixed_address=f'10.{number // 256 % 156}.{number % 256}.{octet}'))
+    tree.add_group(group)
+    return tree
+
+
+if __name__ == '__main__':
+    tree = make_tree(SUBNETS, HOSTS)
+    start = time.perf_counter()
+    conflicts = tree.find_conflicts()
+    elapsed = time.perf_counter() - start
+    print(f'{SUBNETS} subnets, {HOSTS} hosts: {len(conflicts)} conflicts '
+          f'in {elapsed:.2f} s')
@@ -0,0 +1,39 @@
+# Measures DhcpdParser.construct_tree on a synthetic host heavy config.
+import pathlib
+import sys
+import time
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[1]))
+from pyisc import dhcpd
+
+
+def host_config(count):
+    """Return a config with count host declarations spread over groups."""
+    lines = ['authoritative;', 'default-lease-time 600;']
+    for group in range(0, count, 1000):
+        lines.append('group {')
+        lines.append('    option domain-name "example.org";')
+        for number in range(group, min(group + 1000, count)):
+            mac = ':'.join(f'{b:02x}' for b in number.to_bytes(6, 'big'))
+            address = '.'.join(str(b) for b in (10,) + tuple(
+                (number + 1).to_bytes(3, 'big')))
+            lines.append(f'    host host-{number} {{')
+            lines.append(f'        hardware ethernet {mac};')
+            lines.append(f'        fixed-address {address};')
+            lines.append(f'        ddns-hostname "host-{number}";')
+            lines.append('    }')
+        lines.append('}')
+    return '\n'.join(lines) + '\n'
+
+
+if __name__ == '__main__':
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    content = host_config(count)
+    elapsed = None
+    for _ in range(3):
+        start = time.perf_counter()
+        tree = dhcpd.loads(content)
+        run = time.perf_counter() - start
+        elapsed = run if elapsed is None else min(elapsed, run)
+    hosts = sum(len(group.hosts) for group in tree.groups)
+    print(f'construct_tree: {hosts} hosts in {elapsed:.2f} s '
+          f'({hosts / elapsed:,.0f} hosts/s)')
@@ -0,0 +1,34 @@
+# Measures the memory used per parsed host reservation.
+import gc
+import pathlib
+import sys
+import tracemalloc
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[1]))
+from pyisc import dhcpd
+
+
+def host_config(count):
+    """Return a config with count typical static reservations."""
+    lines = []
+    for number in range(count):
+        mac = ':'.join(f'{b:02x}' for b in number.to_bytes(6, 'big'))
+        address = '.'.join(
+            str(b) for b in (10,) + tuple((number + 1).to_bytes(3, 'big')))
+        lines.append(f'host host-{number} {{')
+        lines.append(f'    hardware ethernet {mac};')
+        lines.append(f'    fixed-address {address};')
+        lines.append('}')
+    return '\n'.join(lines) + '\n'
+
+
+if __name__ == '__main__':
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    content = host_config(count)
+    gc.collect()
+    tracemalloc.start()
+    tree = dhcpd.loads(content)
+    gc.collect()
+    used, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f'{len(tree.hosts)} hosts use {used / 1024 ** 2:.1f} MiB, '
+          f'{used / len(tree.hosts):,.0f} bytes per host')
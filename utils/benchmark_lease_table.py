@@ -0,0 +1,45 @@
+# Measures the memory per address and the lookup rate of LeaseTable. The
+# leases are generated in memory, each address is written twice so that
+# half of the records are stale.
+import gc
+import pathlib
+import sys
+import time
+import tracemalloc
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[1]))
+from pyisc.leases import Lease, LeaseTable
+
+
+def generate_leases(count):
+    """Yield two lease records for each of count addresses."""
+    for generation in range(2):
+        for number in range(count):
+            address = '.'.join(
+                str(b) for b in (10 << 24 | number).to_bytes(4, 'big'))
+            mac = ':'.join(f'{b:02x}' for b in number.to_bytes(6, 'big'))
+            yield Lease(address, starts=1600000000 + generation,
+                        ends=1600000600 + generation,
+                        cltt=1600000000 + generation,
+                        binding_state='active', hardware_address=mac)
+
+
+if __name__ == '__main__':
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    table = LeaseTable(generate_leases(count))
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    used, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f'{len(table)} addresses from {2 * count} records in '
+          f'{elapsed:.1f} s, {used / 1024 ** 2:.1f} MiB, '
+          f'{used / len(table):.0f} bytes per address')
+    probes = [lease.ip for lease, _ in
+              zip(generate_leases(count), range(100000))]
+    start = time.perf_counter()
+    for address in probes:
+        table.get(address)
+    elapsed = time.perf_counter() - start
+    print(f'{len(probes) / elapsed:,.0f} lookups/s by address')
@@ -0,0 +1,46 @@
+# Measures the throughput of iter_leases in leases per second and shows
+# that its peak memory does not grow with the size of the leases file.
+import pathlib
+import sys
+import tempfile
+import time
+import tracemalloc
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[1]))
+from pyisc.leases import iter_leases
+
+REFERENCE_FILE = pathlib.Path(__file__).resolve().parents[1] / \
+    'data/dhcpd.leases'
+
+
+def write_leases(path, count):
+    """Write count lease blocks by repeating the reference file."""
+    content = REFERENCE_FILE.read_text()
+    blocks = sum(1 for line in content.splitlines()
+                 if line.startswith('lease '))
+    with open(path, 'w') as leases_file:
+        for _ in range(count // blocks + 1):
+            leases_file.write(content)
+    return (count // blocks + 1) * blocks
+
+
+def measure(path, expected):
+    with open(path, 'r') as leases_file:
+        start = time.perf_counter()
+        count = sum(1 for _ in iter_leases(leases_file))
+        elapsed = time.perf_counter() - start
+    assert count == expected
+    with open(path, 'r') as leases_file:
+        tracemalloc.start()
+        for _ in iter_leases(leases_file):
+            pass
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    print(f'{count:>9} leases {elapsed:8.3f} s '
+          f'{count / elapsed:>10,.0f} leases/s  peak {peak / 1024:,.0f} KiB')
+
+
+if __name__ == '__main__':
+    with tempfile.TemporaryDirectory() as directory:
+        path = pathlib.Path(directory) / 'dhcpd.leases'
+        for count in (10000, 100000, 300000):
+            measure(path, write_leases(path, count))
@@ -0,0 +1,75 @@
+# Compares the keyword dispatched scanner of tokenize_content against
+# tokenize and against a single alternation of every token pattern, on a
+# parameter heavy and a host heavy config.
+import pathlib
+import re
+import sys
+import time
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[1]))
+from pyisc import dhcpd
+from pyisc.dhcpd.parsing import (DhcpdParser, Token, TOKEN_SPECIFICATION,
+                                 WHITESPACE_REGEX)
+from benchmark_construct_tree import host_config
+
+TRIVIA = ('COMMENT_UNIX', 'NEWLINE', 'WHITESPACE')
+ALTERNATION_REGEX = re.compile(
+    r'[ \t\n]*(?:\#.*[ \t\n]*)*(?:%s|(?P<END>\Z))' % '|'.join(
+        '(?P<%s>%s)' % pair for pair in TOKEN_SPECIFICATION
+        if pair[0] not in TRIVIA))
+
+
+def alternation_tokenize(content, line_num=1):
+    """The trivia-free scanner before the leading word selected patterns."""
+    normalize = WHITESPACE_REGEX.sub
+    line_start = 0
+    previous = 0
+    for mo in ALTERNATION_REGEX.finditer(content):
+        kind = mo.lastgroup
+        start = mo.start(kind)
+        newlines = content.count('\n', previous, start)
+        if newlines:
+            line_num += newlines
+            line_start = content.rfind('\n', previous, start) + 1
+        previous = start
+        if kind == 'END':
+            return
+        yield Token(kind, normalize(' ', mo.group(kind)), line_num,
+                    start - line_start)
+
+
+def parameter_config(count, parameters=30):
+    """Return count subnets with a number of general parameters each."""
+    return ''.join(
+        f'subnet 10.{i // 256 % 256}.{i % 256}.0 netmask 255.255.255.0 {{\n'
+        + ''.join(f'    ddns-parameter-{j} value-{j};\n'
+                  for j in range(parameters)) + '}\n'
+        for i in range(count))
+
+
+def measure(name, tokenize, content, rounds=5):
+    best = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        count = sum(1 for token in tokenize(content)
+                    if token.type not in TRIVIA)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    print(f'  {name:<12} {count:>9} tokens {best:8.3f} s '
+          f'{count / best:>12,.0f} tokens/s')
+    return best
+
+
+if __name__ == '__main__':
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    parser = DhcpdParser()
+    configs = (('parameters', parameter_config(count)),
+               ('hosts', dhcpd.dumps(dhcpd.loads(host_config(count * 10)))))
+    for label, content in configs:
+        print(f'{label}: {len(content):,} characters')
+        assert [token[:2] for token in parser.tokenize_content(content)] == [
+            token[:2] for token in alternation_tokenize(content)]
+        before = measure('tokenize', parser.tokenize, content)
+        alternation = measure('alternation', alternation_tokenize, content)
+        after = measure('dispatched', parser.tokenize_content, content)
+        print(f'  speedup      {before / after:.2f}x over tokenize, '
+              f'{alternation / after:.2f}x over alternation')
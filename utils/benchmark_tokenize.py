@@ -0,0 +1,65 @@
+# Compares tokenizer throughput of the module level compiled token regex
+# against the previous implementation that rebuilt the regex on every call.
+import pathlib
+import re
+import sys
+import time
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[1]))
+from pyisc.dhcpd.parsing import DhcpdParser, Token, TOKEN_SPECIFICATION
+
+REFERENCE_FILE = pathlib.Path(__file__).resolve().parents[1] / \
+    'data/dhcpd_ref-dhcpd.conf'
+TARGET_LINES = 100000
+
+
+def legacy_tokenize(content):
+    """The tokenizer as it was before the regex was compiled once."""
+    token_specification = list(TOKEN_SPECIFICATION)
+    tok_regex = '|'.join(
+        '(?P<%s>%s)' % pair for pair in token_specification)
+    line_num = 1
+    line_start = 0
+    for mo in re.finditer(tok_regex, content):
+        kind = mo.lastgroup
+        value = re.sub(r'\s+', ' ', mo.group())
+        column = mo.start() - line_start
+        if kind == 'NEWLINE':
+            line_start = mo.end()
+            line_num += 1
+        elif kind == 'MISMATCH':
+            raise RuntimeError(f'{value!r} unexpected on line {line_num}')
+        yield Token(kind, value, line_num, column)
+
+
+def build_corpus(parser):
+    """Scale the reference file to TARGET_LINES tokenizable lines."""
+    lines = []
+    for line in REFERENCE_FILE.read_text().splitlines(keepends=True):
+        try:
+            list(parser.tokenize(line))
+        except RuntimeError:
+            continue
+        lines.append(line)
+    repeats = TARGET_LINES // len(lines) + 1
+    return ''.join((lines * repeats)[:TARGET_LINES])
+
+
+def measure(name, tokenize, content, rounds=3):
+    best = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        count = sum(1 for _ in tokenize(content))
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    print(f'{name:<10} {count:>9} tokens {best:8.3f} s '
+          f'{count / best:>12,.0f} tokens/s')
+    return count / best
+
+
+if __name__ == '__main__':
+    parser = DhcpdParser()
+    corpus = build_corpus(parser)
+    assert list(legacy_tokenize(corpus)) == list(parser.tokenize(corpus))
+    before = measure('before', legacy_tokenize, corpus)
+    after = measure('after', parser.tokenize, corpus)
+    print(f'speedup    {after / before:.2f}x')
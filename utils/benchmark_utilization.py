@@ -0,0 +1,51 @@
+# Measures the utilization report on a tree of 40k subnets, each with a
+# range and a pool range, against a lease table with random addresses in
+# those subnets. Only the join is timed, not building the lease table.
+import pathlib
+import random
+import sys
+import time
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[1]))
+from pyisc.dhcpd.nodes import Global, Pool4, Range4, Subnet4
+from pyisc.leases import Lease, LeaseTable
+from pyisc.leases.parsing import BINDING_STATES
+from pyisc.leases.report import table_utilization
+
+SUBNETS = 40000
+
+
+def make_tree(count):
+    """Return a tree of count /24 subnets in 10.0.0.0/8."""
+    subnets = []
+    for number in range(count):
+        prefix = f'10.{number // 256}.{number % 256}'
+        subnet = Subnet4(f'{prefix}.0/24',
+                         ranges=[Range4(f'{prefix}.10', f'{prefix}.99')])
+        subnet.pools.append(
+            Pool4(ranges=[Range4(f'{prefix}.100', f'{prefix}.250')]))
+        subnets.append(subnet)
+    tree = Global()
+    tree.add_subnets(subnets)
+    return tree
+
+
+def generate_leases(count, subnets):
+    """Yield count leases with random addresses and binding states."""
+    generator = random.Random(0)
+    for _ in range(count):
+        number = generator.randrange(subnets)
+        yield Lease(f'10.{number // 256}.{number % 256}.'
+                    f'{generator.randrange(1, 255)}',
+                    binding_state=generator.choice(BINDING_STATES))
+
+
+if __name__ == '__main__':
+    leases = int(sys.argv[1]) if len(sys.argv) > 1 else 500000
+    tree = make_tree(SUBNETS)
+    table = LeaseTable(generate_leases(leases, SUBNETS))
+    start = time.perf_counter()
+    report = table_utilization(tree, table)
+    elapsed = time.perf_counter() - start
+    ranges = 2 * SUBNETS
+    print(f'{ranges} ranges x {len(table)} leases: {len(report)} records '
+          f'in {elapsed:.2f} s')